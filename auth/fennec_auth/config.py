@@ -9,6 +9,10 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_IN_MINUTES: int = 30
     SENTRY_DSN: str | None = None
+    SENTRY_TRACES_SAMPLE_RATE: float = 0.1
+    SENTRY_TAIL_SAMPLE_RATE: float = 0.1
+    SENTRY_SLOW_TRANSACTION_THRESHOLD: float = 1.0
+    SENTRY_PROFILES_SAMPLE_RATE: float = 0.05
     CLIENT_NAME: str = "fennec-auth"
 
 
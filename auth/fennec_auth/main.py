@@ -1,15 +1,10 @@
 from fastapi import FastAPI, APIRouter, Request, HTTPException, status
-import sentry_sdk
 from fennec_auth.config import settings
+from fennec_auth.tracing import init_sentry
 from fennec_auth.routers import auth_router, group_router, user_router
 from fennec_auth.exceptions import GroupNotFound, AlreadyRegisteredGroup
 
-sentry_sdk.init(
-    dsn=settings.SENTRY_DSN,
-    traces_sample_rate=1.0,
-    profiles_sample_rate=1.0,
-    environment=settings.ENVIRONMENT,
-)
+init_sentry()
 
 app = FastAPI()
 
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+import pytest
+from sentry_sdk.types import Event
+from fennec_auth.config import settings
+from fennec_auth.tracing import traces_sampler, before_send_transaction
+
+START = datetime(2025, 3, 1, 12, 0)
+
+
+def make_event(duration: float, status: str | None = "ok") -> Event:
+    return {
+        "type": "transaction",
+        "start_timestamp": START,
+        "timestamp": START + timedelta(seconds=duration),
+        "contexts": {"trace": {"status": status}},
+    }
+
+
+def test_traces_sampler() -> None:
+    assert traces_sampler({"parent_sampled": True}) == 1.0
+    assert traces_sampler({"parent_sampled": False}) == 0.0
+    assert traces_sampler({}) == settings.SENTRY_TRACES_SAMPLE_RATE
+
+
+def test_before_send_transaction(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SENTRY_TAIL_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "SENTRY_SLOW_TRANSACTION_THRESHOLD", 1.0)
+
+    assert before_send_transaction(make_event(0.1), {}) is None
+    assert before_send_transaction(make_event(2.0), {}) is not None
+    assert before_send_transaction(make_event(0.1, "internal_error"), {}) is not None
+
+    monkeypatch.setattr(settings, "SENTRY_TAIL_SAMPLE_RATE", 1.0)
+    assert before_send_transaction(make_event(0.1), {}) is not None
@@ -0,0 +1,59 @@
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+import pytest
+from benchmarks.harness import Benchmark, BenchmarkSession
+
+benchmark_session_key = pytest.StashKey[BenchmarkSession]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark-json", type=Path, default=None)
+    group.addoption("--benchmark-baseline", type=Path, default=None)
+    group.addoption("--benchmark-update-baseline", action="store_true")
+    group.addoption("--benchmark-rounds", type=int, default=5)
+    group.addoption("--benchmark-tolerance", type=float, default=0.5)
+    group.addoption("--benchmark-min-time", type=float, default=0.05)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    baseline_path: Path | None = config.getoption("benchmark_baseline")
+    config.stash[benchmark_session_key] = BenchmarkSession(
+        rounds=config.getoption("benchmark_rounds"),
+        baseline=json.loads(baseline_path.read_text())
+        if baseline_path
+        and baseline_path.exists()
+        and not config.getoption("benchmark_update_baseline")
+        else {},
+        tolerance=config.getoption("benchmark_tolerance"),
+        min_time=config.getoption("benchmark_min_time"),
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    config = session.config
+    results = config.stash[benchmark_session_key].results
+    if not results:
+        return
+
+    output: Path | None = config.getoption("benchmark_json")
+    if output:
+        output.write_text(json.dumps([asdict(r) for r in results.values()], indent=2))
+
+    baseline_path: Path | None = config.getoption("benchmark_baseline")
+    if baseline_path and config.getoption("benchmark_update_baseline"):
+        baseline: dict[str, Any] = (
+            json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        )
+        baseline.update({name: r.min for name, r in results.items()})
+        baseline_path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2))
+
+
+@pytest.fixture()
+def benchmark(request: pytest.FixtureRequest) -> Benchmark:
+    return Benchmark(
+        f"{request.path.stem}::{request.node.name}",
+        request.config.stash[benchmark_session_key],
+    )
@@ -0,0 +1,106 @@
+from typing import Awaitable, Callable, Iterator, TypeVar
+import gc
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import pytest
+
+T = TypeVar("T")
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    max: float
+    items: dict[str, int] = field(default_factory=dict)
+    throughput: dict[str, float] = field(default_factory=dict)
+
+
+class BenchmarkSession:
+    def __init__(
+        self,
+        *,
+        rounds: int,
+        baseline: dict[str, float],
+        tolerance: float,
+        min_time: float,
+    ) -> None:
+        self.rounds = rounds
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.min_time = min_time
+        self.results: dict[str, BenchmarkResult] = {}
+
+    def record(self, result: BenchmarkResult) -> str | None:
+        self.results[result.name] = result
+        reference = self.baseline.get(result.name)
+        if reference is None or reference < self.min_time:
+            return None
+        if result.min > reference * (1 + self.tolerance):
+            return (
+                f"{result.name}: min {result.min:.6f}s > "
+                f"baseline {reference:.6f}s (+{self.tolerance:.0%} allowed)"
+            )
+        return None
+
+
+@contextmanager
+def gc_disabled() -> Iterator[None]:
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+class Benchmark:
+    def __init__(self, name: str, session: BenchmarkSession) -> None:
+        self.name = name
+        self.session = session
+
+    def __call__(self, fn: Callable[[], T], **items: int) -> T:
+        result = fn()
+        timings = []
+        with gc_disabled():
+            for _ in range(self.session.rounds):
+                start = time.perf_counter()
+                result = fn()
+                timings.append(time.perf_counter() - start)
+        self._record(timings, items)
+        return result
+
+    async def run_async(self, fn: Callable[[], Awaitable[T]], **items: int) -> T:
+        result = await fn()
+        timings = []
+        with gc_disabled():
+            for _ in range(self.session.rounds):
+                start = time.perf_counter()
+                result = await fn()
+                timings.append(time.perf_counter() - start)
+        self._record(timings, items)
+        return result
+
+    def _record(self, timings: list[float], items: dict[str, int]) -> None:
+        median = statistics.median(timings)
+        regression = self.session.record(
+            BenchmarkResult(
+                name=self.name,
+                rounds=len(timings),
+                min=min(timings),
+                median=median,
+                mean=statistics.mean(timings),
+                max=max(timings),
+                items=items,
+                throughput={
+                    f"{k}_per_s": v / median if median else 0 for k, v in items.items()
+                },
+            )
+        )
+        if regression:
+            pytest.fail(regression)
@@ -0,0 +1,265 @@
+from typing import Any
+import argparse
+import asyncio
+import dataclasses
+import json
+import multiprocessing
+import resource
+import socket
+import sys
+import tempfile
+import time
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+import httpx
+import uvicorn
+from fennec_api.core.database import Base, engine, SessionLocal
+from fennec_api.core.metrics import Histogram
+from fennec_api.etl.metrics import (
+    FETCHED_BYTES,
+    HTTP_REQUEST_DURATION,
+    MEMORY_RSS,
+    PARSE_DURATION,
+    TRANSFORM_DURATION,
+    UPSERT_DURATION,
+    UPSERTED_ROWS,
+)
+from fennec_api.sdmx_v21.client import WireFormat
+from fennec_api.sdmx_v21.models import Provider
+from fennec_api.sdmx_v21.tasks import collect_provider
+from tools.sdmx_standin import create_app, Cassette
+from tools.sdmx_synth import build_cassette, SCALES
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+
+
+def baseline_path(
+    scale: str, bulk_download: bool, wire_format: WireFormat = WireFormat.XML
+) -> Path:
+    suffix = "" if wire_format == WireFormat.XML else f"-{wire_format.value}"
+    return (
+        BASELINES_DIR
+        / f"harvest-{scale}-{'bulk' if bulk_download else 'refs'}{suffix}.json"
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+def serve_cassette(root: Path, port: int) -> None:
+    uvicorn.run(
+        create_app(Cassette.load(root)),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+    )
+
+
+async def wait_until_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+def _samples(histogram: Histogram, provider: str) -> dict[str, tuple[int, float]]:
+    return {
+        artefact: (counts[-1], histogram.sums[(p, artefact)])
+        for (p, artefact), counts in histogram.counts.items()
+        if p == provider
+    }
+
+
+def build_stages(provider: str) -> dict[str, dict[str, float]]:
+    stages: dict[str, dict[str, float]] = {}
+
+    for artefact, (count, seconds) in _samples(HTTP_REQUEST_DURATION, provider).items():
+        stages[f"fetch.{artefact}"] = {
+            "seconds": seconds,
+            "requests": count,
+            "requests_per_s": count / seconds if seconds else 0,
+            "bytes": FETCHED_BYTES.get(provider=provider, artefact=artefact),
+        }
+    for artefact, (count, seconds) in _samples(PARSE_DURATION, provider).items():
+        stages[f"parse.{artefact}"] = {"seconds": seconds, "messages": count}
+    for table, (_, seconds) in _samples(TRANSFORM_DURATION, provider).items():
+        stages[f"transform.{table}"] = {"seconds": seconds}
+    for table, (_, seconds) in _samples(UPSERT_DURATION, provider).items():
+        rows = UPSERTED_ROWS.get(provider=provider, artefact=table)
+        stages[f"upsert.{table}"] = {
+            "seconds": seconds,
+            "rows": rows,
+            "rows_per_s": rows / seconds if seconds else 0,
+        }
+    for (p, stage), rss in MEMORY_RSS.values.items():
+        if p == provider:
+            stages.setdefault(f"memory.{stage}", {})["rss"] = rss
+
+    return dict(sorted(stages.items()))
+
+
+async def run_harvest(
+    root_url: str,
+    *,
+    agency_id: str,
+    bulk_download: bool,
+    wire_format: WireFormat,
+    profile_memory: bool,
+) -> dict[str, Any]:
+    async with SessionLocal() as session:
+        provider = Provider(
+            agency_id=agency_id,
+            root_url=root_url,
+            bulk_download=bulk_download,
+            skip_categories=False,
+            process_all_agencies=False,
+            wire_format=wire_format.value,
+        )
+        session.add(provider)
+        await session.commit()
+
+        start = time.perf_counter()
+        await collect_provider(
+            {"session": session}, provider.id, profile_memory=profile_memory
+        )
+        wall_time = time.perf_counter() - start
+
+        return {
+            "wall_time": wall_time,
+            "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+            "stages": build_stages(str(provider.id)),
+        }
+
+
+def compare_to_baseline(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    tolerance: float,
+    min_seconds: float,
+) -> list[str]:
+    regressions = []
+
+    def check(name: str, value: float, reference: float) -> None:
+        if value > reference * (1 + tolerance):
+            regressions.append(
+                f"{name}: {value:.3f} > {reference:.3f} (+{tolerance:.0%} allowed)"
+            )
+
+    check("wall_time", report["wall_time"], baseline["wall_time"])
+    check("peak_rss", report["peak_rss"], baseline["peak_rss"])
+    for name, stage in baseline["stages"].items():
+        if stage.get("seconds", 0) < min_seconds or name not in report["stages"]:
+            continue
+        check(f"{name}.seconds", report["stages"][name]["seconds"], stage["seconds"])
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [
+        f"wall time: {report['wall_time']:.3f}s",
+        f"peak rss: {report['peak_rss'] / 2**20:.1f} MiB",
+    ]
+    for name, stage in report["stages"].items():
+        values = ", ".join(f"{k}={v:,.3f}" for k, v in stage.items())
+        lines.append(f"  {name}: {values}")
+    return "\n".join(lines)
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    scale = dataclasses.replace(SCALES[args.scale], seed=args.seed)
+
+    if args.reset_database:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette_root = args.cassette or Path(tmp) / "cassette"
+        if not (cassette_root / "cassette.json").exists():
+            build_cassette(scale, cassette_root, wire_format=args.wire_format)
+
+        port = free_port()
+        server: BaseProcess = multiprocessing.get_context("spawn").Process(
+            target=serve_cassette, args=(cassette_root, port), daemon=True
+        )
+        server.start()
+        try:
+            root_url = f"http://127.0.0.1:{port}"
+            await wait_until_ready(root_url)
+            report = await run_harvest(
+                root_url,
+                agency_id=scale.agency_id,
+                bulk_download=args.bulk,
+                wire_format=args.wire_format,
+                profile_memory=args.profile_memory,
+            )
+        finally:
+            server.terminate()
+            server.join()
+            await engine.dispose()
+
+    return {
+        "scale": args.scale,
+        "bulk_download": args.bulk,
+        "wire_format": args.wire_format.value,
+        **report,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark collect_provider against a synthetic SDMX provider"
+    )
+    parser.add_argument("--scale", choices=SCALES, default="tiny")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bulk", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument(
+        "--wire-format", type=WireFormat, choices=list(WireFormat), default="xml"
+    )
+    parser.add_argument("--cassette", type=Path, default=None)
+    parser.add_argument("--profile-memory", action="store_true")
+    parser.add_argument("--reset-database", action="store_true")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-seconds", type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print(format_report(report))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    baseline = args.baseline or baseline_path(args.scale, args.bulk, args.wire_format)
+    if args.update_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {baseline}")
+    elif baseline.exists():
+        regressions = compare_to_baseline(
+            report,
+            json.loads(baseline.read_text()),
+            tolerance=args.tolerance,
+            min_seconds=args.min_seconds,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from typing import Callable, Iterator
+import pytest
+from benchmarks.harness import Benchmark
+from fennec_api.sdmx_v21.etl import JsonDataDecoder, StructureSpecificDecoder
+from fennec_api.sdmx_v21.models import (
+    Attribute,
+    DataStructure,
+    Dimension,
+    PrimaryMeasure,
+    TimeDimension,
+)
+from fennec_api.sdmx_v21.parser import (
+    parse_data,
+    parse_json_structure,
+    parse_structure,
+    Error,
+)
+from tools.sdmx_synth import (
+    generate_categorisations,
+    generate_category_schemes,
+    generate_codelists,
+    generate_concept_schemes,
+    generate_data,
+    generate_data_structures,
+    generate_dataflows,
+    generate_generic_data,
+    generate_json_categorisations,
+    generate_json_category_schemes,
+    generate_json_codelists,
+    generate_json_concept_schemes,
+    generate_json_data,
+    generate_json_data_structures,
+    generate_json_dataflows,
+    dimension_id,
+    Scale,
+)
+
+SCALE = Scale(
+    dataflows=200,
+    dimensions=8,
+    codelists=50,
+    codes_per_codelist=100,
+    categories=500,
+    series_per_dataflow=200,
+    observations_per_series=50,
+)
+
+STRUCTURE_GENERATORS: dict[str, Callable[[Scale], Iterator[str]]] = {
+    "dataflow": generate_dataflows,
+    "datastructure": generate_data_structures,
+    "codelist": generate_codelists,
+    "conceptscheme": generate_concept_schemes,
+    "categoryscheme": generate_category_schemes,
+    "categorisation": generate_categorisations,
+}
+
+JSON_STRUCTURE_GENERATORS: dict[str, Callable[[Scale], Iterator[str]]] = {
+    "dataflow": generate_json_dataflows,
+    "datastructure": generate_json_data_structures,
+    "codelist": generate_json_codelists,
+    "conceptscheme": generate_json_concept_schemes,
+    "categoryscheme": generate_json_category_schemes,
+    "categorisation": generate_json_categorisations,
+}
+
+
+@pytest.mark.parametrize("artefact", STRUCTURE_GENERATORS)
+def test_parse_structure(benchmark: Benchmark, artefact: str) -> None:
+    content = "".join(STRUCTURE_GENERATORS[artefact](SCALE)).encode()
+
+    message = benchmark(lambda: parse_structure(content), bytes=len(content))
+
+    assert not isinstance(message, Error)
+
+
+@pytest.mark.parametrize("artefact", JSON_STRUCTURE_GENERATORS)
+def test_parse_json_structure(benchmark: Benchmark, artefact: str) -> None:
+    content = "".join(JSON_STRUCTURE_GENERATORS[artefact](SCALE)).encode()
+
+    message = benchmark(lambda: parse_json_structure(content), bytes=len(content))
+
+    assert not isinstance(message, Error)
+
+
+def test_parse_structure_specific_data(benchmark: Benchmark) -> None:
+    content = "".join(generate_data(SCALE, 0)).encode()
+
+    message = benchmark(
+        lambda: parse_data(content),
+        bytes=len(content),
+        observations=SCALE.series_per_dataflow * SCALE.observations_per_series,
+    )
+
+    assert not isinstance(message, Error)
+
+
+def test_parse_generic_data(benchmark: Benchmark) -> None:
+    content = "".join(generate_generic_data(SCALE, 0)).encode()
+
+    message = benchmark(
+        lambda: parse_data(content),
+        bytes=len(content),
+        observations=SCALE.series_per_dataflow * SCALE.observations_per_series,
+    )
+
+    assert not isinstance(message, Error)
+
+
+DATA_STRUCTURE = DataStructure(
+    id="DSD_00000",
+    agency_id=SCALE.agency_id,
+    version="1.0",
+    dimensions=[
+        Dimension(id=dimension_id(k), position=k + 1) for k in range(SCALE.dimensions)
+    ],
+    time_dimensions=[TimeDimension(id="TIME_PERIOD", position=SCALE.dimensions + 1)],
+    attributes=[Attribute(id="OBS_STATUS")],
+    primary_measures=[PrimaryMeasure(id="OBS_VALUE")],
+)
+
+
+@pytest.mark.parametrize(
+    "decoder_class,generator",
+    [
+        (StructureSpecificDecoder, generate_data),
+        (JsonDataDecoder, generate_json_data),
+    ],
+    ids=["xml", "json"],
+)
+def test_decode_data(
+    benchmark: Benchmark,
+    decoder_class: type[StructureSpecificDecoder],
+    generator: Callable[[Scale, int], Iterator[str]],
+) -> None:
+    content = "".join(generator(SCALE, 0)).encode()
+    decoder = decoder_class.compile(DATA_STRUCTURE)
+    observations = SCALE.series_per_dataflow * SCALE.observations_per_series
+
+    batches = benchmark(
+        lambda: list(decoder.decode(content)),
+        bytes=len(content),
+        observations=observations,
+    )
+
+    assert sum(len(b) for b in batches) == observations
@@ -0,0 +1,57 @@
+from typing import Any
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.etl.postgres import upsert
+from fennec_api.sdmx_v21.models import Code, Codelist
+from fennec_api.sdmx_v21.schemas import CodeSearchRead
+from fennec_api.sdmx_v21.service import listing_columns, search_codes
+from benchmarks.harness import Benchmark
+
+CODELISTS = 20
+CODES_PER_CODELIST = 1_000
+
+QUERIES = {
+    "fulltext": '"indicator 513" quarterly',
+    "id": "I00513",
+}
+
+
+def code_record(codelist: int, i: int) -> dict[str, Any]:
+    return {
+        "id": f"I{i:05d}",
+        "urn": None,
+        "name": f"Indicator {i} of {'quarterly' if i % 4 else 'monthly'} accounts",
+        "description": None,
+        "codelist_id": f"CL_{codelist:05d}",
+        "codelist_agency_id": "SYNTH",
+        "codelist_version": "1.0",
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", QUERIES)
+async def test_search_codes(
+    benchmark: Benchmark, session: AsyncSession, query: str
+) -> None:
+    session.add_all(
+        Codelist(id=f"CL_{i:05d}", agency_id="SYNTH", version="1.0")
+        for i in range(CODELISTS)
+    )
+    await session.commit()
+    await upsert(
+        session,
+        model=Code,
+        records=(
+            code_record(codelist, i)
+            for codelist in range(CODELISTS)
+            for i in range(CODES_PER_CODELIST)
+        ),
+    )
+    columns = listing_columns(Code, CodeSearchRead.model_fields)
+
+    rows = await benchmark.run_async(
+        lambda: search_codes(session, columns, q=QUERIES[query], limit=20),
+        rows=CODELISTS * CODES_PER_CODELIST,
+    )
+
+    assert [row.id for row in rows] == ["I00513"] * CODELISTS
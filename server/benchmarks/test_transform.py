@@ -0,0 +1,277 @@
+from typing import Any, AsyncIterator, Callable, Iterable, Sequence, cast
+from collections import namedtuple
+import random
+import numpy as np
+import numpy.typing as npt
+import pytest
+from sqlalchemy import Row
+from fennec_api.core.encoders import encode_json, encode_ndjson
+from fennec_api.etl.periods import PeriodParser, period_bounds
+from fennec_api.sdmx_v21.export import DataFormat, ObservationEncoder
+from fennec_api.sdmx_v21.keys import KeyDictionary
+from fennec_api.sdmx_v21.schemas import CodeRead
+from fennec_api.sdmx_v21.etl.transform import (
+    extract_codelist_ref,
+    extract_codelist_refs,
+    extract_concept_refs,
+    extract_labels,
+    flatten_categories,
+    unique_by_ref,
+)
+from fennec_api.sdmx_v21.parser import (
+    parse_structure,
+    Category2,
+    CodelistType,
+    DataStructureType2,
+    Name,
+    RefBaseType,
+    Structure,
+)
+from tools.sdmx_synth import generate_codelists, generate_data_structures, Scale
+from benchmarks.harness import Benchmark
+
+SCALE = Scale(dataflows=500, dimensions=8, codelists=50, codes_per_codelist=1_000)
+
+
+@pytest.fixture(scope="module")
+def codelists() -> Sequence[CodelistType]:
+    message = parse_structure("".join(generate_codelists(SCALE)).encode())
+    assert isinstance(message, Structure)
+    assert message.structures and message.structures.codelists
+    return message.structures.codelists.codelist
+
+
+@pytest.fixture(scope="module")
+def data_structures() -> Sequence[DataStructureType2]:
+    message = parse_structure("".join(generate_data_structures(SCALE)).encode())
+    assert isinstance(message, Structure)
+    assert message.structures and message.structures.data_structures
+    return message.structures.data_structures.data_structure
+
+
+def build_categories(width: int, depth: int, prefix: str = "C") -> list[Category2]:
+    return [
+        Category2(
+            id=f"{prefix}{i}",
+            name=[Name(value=f"Category {prefix}{i}", lang="en")],
+            category=build_categories(width, depth - 1, f"{prefix}{i}_")
+            if depth > 1
+            else [],
+        )
+        for i in range(width)
+    ]
+
+
+def test_extract_labels(
+    benchmark: Benchmark, codelists: Sequence[CodelistType]
+) -> None:
+    codes = [c for cl in codelists for c in cl.code]
+
+    labels = benchmark(lambda: [extract_labels(c) for c in codes], items=len(codes))
+
+    assert len(labels) == SCALE.codes
+
+
+def test_flatten_categories(benchmark: Benchmark) -> None:
+    categories = build_categories(width=10, depth=4)
+
+    flattened = benchmark(
+        lambda: list(
+            flatten_categories(
+                categories,
+                scheme_id="CAT",
+                scheme_agency_id="SYNTH",
+                scheme_version="1.0",
+            )
+        ),
+        items=11_110,
+    )
+
+    assert len(flattened) == 11_110
+
+
+def test_unique_by_ref(
+    benchmark: Benchmark, data_structures: Sequence[DataStructureType2]
+) -> None:
+    refs = [
+        ref
+        for dsd in data_structures
+        if dsd.data_structure_components
+        and dsd.data_structure_components.dimension_list
+        for d in dsd.data_structure_components.dimension_list.dimension
+        if (ref := extract_codelist_ref(d)) is not None
+    ] * 10
+
+    unique = benchmark(lambda: list(unique_by_ref(refs)), items=len(refs))
+
+    assert len(unique) == SCALE.codelists
+
+
+@pytest.mark.parametrize(
+    "extract",
+    [extract_codelist_refs, extract_concept_refs],
+    ids=["codelist", "concept"],
+)
+def test_extract_component_refs(
+    benchmark: Benchmark,
+    data_structures: Sequence[DataStructureType2],
+    extract: Callable[[Sequence[DataStructureType2]], Iterable[RefBaseType]],
+) -> None:
+    refs = benchmark(lambda: list(extract(data_structures)), items=len(data_structures))
+
+    assert refs
+
+
+@pytest.mark.parametrize("representation", ["text", "tuple", "packed"])
+def test_match_keys(benchmark: Benchmark, representation: str) -> None:
+    rng = random.Random(0)
+    key_dictionary = KeyDictionary(
+        dimensions=tuple(f"DIM_{k}" for k in range(6)),
+        codes=tuple({f"C{i:03d}": i for i in range(100)} for _ in range(6)),
+    )
+    keys = [tuple(rng.randrange(100) for _ in range(6)) for _ in range(20_000)]
+    pattern = "C001..C002+C003..."
+    matcher = key_dictionary.matcher(pattern)
+    allowed = [set(part.split("+")) if part else None for part in pattern.split(".")]
+
+    def match_text(key: str) -> bool:
+        return all(a is None or c in a for a, c in zip(allowed, key.split(".")))
+
+    values: list[Any]
+    match: Callable[[Any], bool]
+    if representation == "text":
+        values, match = [key_dictionary.decode(k) for k in keys], match_text
+    elif representation == "tuple":
+        values, match = list(keys), matcher.matches
+    else:
+        values = [key_dictionary.pack(k) for k in keys]
+        match = matcher.matches_packed
+
+    matched = benchmark(lambda: [v for v in values if match(v)], items=len(values))
+
+    assert len(matched) == sum(1 for k in keys if matcher.matches(k))
+
+
+@pytest.mark.parametrize("parser", ["scalar", "vectorised"])
+def test_parse_periods(benchmark: Benchmark, parser: str) -> None:
+    time_periods = [
+        period
+        for year in range(1950, 2025)
+        for period in (
+            str(year),
+            *(f"{year}-Q{q}" for q in range(1, 5)),
+            *(f"{year}-{m:02d}" for m in range(1, 13)),
+            *(f"{year}-W{w:02d}" for w in range(1, 53)),
+        )
+    ] * 20
+
+    def parse_scalar() -> tuple[npt.NDArray[np.datetime64[Any]], ...]:
+        periods: dict[str, Any] = {}
+        for time_period in time_periods:
+            if time_period not in periods:
+                periods[time_period] = period_bounds(time_period)
+        bounds = [periods[time_period] for time_period in time_periods]
+        return (
+            np.array([b[0] for b in bounds], dtype="datetime64[s]"),
+            np.array([b[1] for b in bounds], dtype="datetime64[s]"),
+        )
+
+    def parse_vectorised() -> tuple[npt.NDArray[np.datetime64[Any]], ...]:
+        periods = PeriodParser().parse(time_periods)
+        return periods.start, periods.end
+
+    start, end = benchmark(
+        parse_scalar if parser == "scalar" else parse_vectorised,
+        items=len(time_periods),
+    )
+
+    expected_start, expected_end = parse_scalar()
+    assert (start == expected_start).all() and (end == expected_end).all()
+
+
+ObservationRow = namedtuple(
+    "ObservationRow",
+    ["key", "series_attributes", "time_period", "obs_value", "attributes"],
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data_format", list(DataFormat))
+async def test_encode_observations(
+    benchmark: Benchmark, data_format: DataFormat
+) -> None:
+    rng = random.Random(0)
+    key_dictionary = KeyDictionary(
+        dimensions=tuple(f"DIM_{k}" for k in range(6)),
+        codes=tuple({f"C{i:03d}": i for i in range(100)} for _ in range(6)),
+    )
+    encoder = ObservationEncoder(
+        key_dictionary,
+        time_dimension="TIME_PERIOD",
+        primary_measure="OBS_VALUE",
+        attributes=("OBS_STATUS", "UNIT_MULT"),
+    )
+    rows = [
+        ObservationRow(
+            [rng.randrange(100) for _ in range(6)],
+            {"UNIT_MULT": "0"},
+            f"{2000 + t // 12}-{t % 12 + 1:02d}",
+            rng.uniform(50, 150),
+            {"OBS_STATUS": "A"},
+        )
+        for _ in range(500)
+        for t in range(40)
+    ]
+    batches = [
+        cast(Sequence[Row[Any]], rows[i : i + 5_000]) for i in range(0, 20_000, 5_000)
+    ]
+
+    async def stream() -> AsyncIterator[Sequence[Row[Any]]]:
+        for batch in batches:
+            yield batch
+
+    async def encode() -> int:
+        return sum([len(c) async for c in encoder.encode(stream(), data_format)])
+
+    size = await benchmark.run_async(encode, rows=len(rows))
+
+    assert size > 0
+
+
+@pytest.mark.parametrize("serializer", ["pydantic", "orjson", "ndjson"])
+def test_serialize_rows(benchmark: Benchmark, serializer: str) -> None:
+    fields = list(CodeRead.model_fields)
+    rows = [
+        (
+            f"C{i:05d}",
+            f"urn:sdmx:org.sdmx.infomodel.codelist.Code=SYNTH:CL_BENCH(1.0).C{i:05d}",
+            f"Code {i}",
+            None,
+            "CL_BENCH",
+            "SYNTH",
+            "1.0",
+        )
+        for i in range(10_000)
+    ]
+
+    def serialize_pydantic() -> bytes:
+        return (
+            b"["
+            + b",".join(
+                CodeRead.model_validate(dict(zip(fields, row)))
+                .model_dump_json()
+                .encode()
+                for row in rows
+            )
+            + b"]"
+        )
+
+    serialize = {
+        "pydantic": serialize_pydantic,
+        "orjson": lambda: encode_json(fields, rows),
+        "ndjson": lambda: encode_ndjson(fields, rows),
+    }[serializer]
+
+    content = benchmark(serialize, items=len(rows))
+
+    assert len(content) > len(rows)
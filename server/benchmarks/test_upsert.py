@@ -0,0 +1,184 @@
+from typing import Any, Callable, Iterator
+from datetime import datetime
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core.database import Base
+from fennec_api.etl.batch import DataBatch
+from fennec_api.etl.postgres import upsert
+from fennec_api.sdmx_v21.etl import (
+    load_codelists,
+    load_data_structures,
+    load_dataflows,
+    load_observations,
+    refresh_rollups,
+    StructureSpecificDecoder,
+)
+from fennec_api.sdmx_v21.etl.observations import get_partition
+from fennec_api.sdmx_v21.models import (
+    Codelist,
+    Dataflow,
+    DataStructure,
+    Dimension,
+    Series,
+)
+from fennec_api.sdmx_v21.parser import parse_structure, Structure
+from tools.sdmx_synth import (
+    dataflow_id,
+    generate_codelists,
+    generate_data,
+    generate_data_structures,
+    generate_dataflows,
+    Scale,
+)
+from benchmarks.harness import Benchmark
+
+ROWS = 2_000
+
+OBSERVATIONS_SCALE = Scale(
+    dataflows=1,
+    dimensions=6,
+    codelists=6,
+    codes_per_codelist=20,
+    series_per_dataflow=400,
+    observations_per_series=50,
+)
+
+
+def codelist_record(i: int) -> dict[str, Any]:
+    return {
+        "id": f"CL_{i:05d}",
+        "agency_id": "SYNTH",
+        "version": "1.0",
+        "urn": None,
+        "name": f"Codelist {i}",
+        "description": None,
+    }
+
+
+def dimension_record(i: int) -> dict[str, Any]:
+    return {
+        "id": f"DIM_{i:05d}",
+        "urn": f"urn:sdmx:org.sdmx.infomodel.datastructure.Dimension=SYNTH:DSD(1.0).DIM_{i:05d}",
+        "data_structure_id": "DSD",
+        "data_structure_agency_id": "SYNTH",
+        "data_structure_version": "1.0",
+        "concept_id": f"DIM_{i:05d}",
+        "concept_maintainable_parent_id": "CS_SYNTH",
+        "concept_maintainable_parent_version": "1.0",
+        "concept_agency_id": "SYNTH",
+        "concept_package": "conceptscheme",
+        "concept_class": "Concept",
+        "format_type": None,
+        "codelist_id": f"CL_{i:05d}",
+        "codelist_agency_id": "SYNTH",
+        "codelist_version": "1.0",
+        "codelist_package": "codelist",
+        "codelist_class": "Codelist",
+        "position": i,
+    }
+
+
+WIDTHS: dict[str, tuple[type[Base], Callable[[int], dict[str, Any]]]] = {
+    "narrow": (Codelist, codelist_record),
+    "wide": (Dimension, dimension_record),
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("width", WIDTHS)
+@pytest.mark.parametrize("chunk_size", [100, 500, 1_000])
+async def test_upsert(
+    benchmark: Benchmark, session: AsyncSession, width: str, chunk_size: int
+) -> None:
+    model, to_record = WIDTHS[width]
+    session.add(DataStructure(id="DSD", agency_id="SYNTH", version="1.0"))
+    await session.commit()
+    # upsert skips unchanged rows, so every round (and the warm-up) writes
+    # fresh records
+    rounds = iter(
+        [
+            [to_record(i) for i in range(r * ROWS, (r + 1) * ROWS)]
+            for r in range(benchmark.session.rounds + 1)
+        ]
+    )
+
+    await benchmark.run_async(
+        lambda: upsert(
+            session, model=model, records=next(rounds), chunk_size=chunk_size
+        ),
+        rows=ROWS,
+    )
+
+
+async def load_structures(session: AsyncSession, scale: Scale) -> Dataflow:
+    generators: list[Callable[[Scale], Iterator[str]]] = [
+        generate_codelists,
+        generate_data_structures,
+        generate_dataflows,
+    ]
+    messages = [parse_structure("".join(g(scale)).encode()) for g in generators]
+    codelists, data_structures, dataflows = [
+        m.structures for m in messages if isinstance(m, Structure)
+    ]
+    assert codelists and codelists.codelists
+    assert data_structures and data_structures.data_structures
+    assert dataflows and dataflows.dataflows
+    await load_codelists(session, codelists.codelists.codelist)
+    await load_data_structures(session, data_structures.data_structures.data_structure)
+    await load_dataflows(session, dataflows.dataflows.dataflow)
+
+    return (
+        await session.scalars(select(Dataflow).filter(Dataflow.id == dataflow_id(0)))
+    ).one()
+
+
+async def decode_data(
+    session: AsyncSession, dataflow: Dataflow, scale: Scale
+) -> list[DataBatch]:
+    data_structure = await session.get(
+        DataStructure,
+        (
+            dataflow.structure_id,
+            dataflow.structure_agency_id,
+            dataflow.structure_version,
+        ),
+    )
+    assert data_structure
+    decoder = StructureSpecificDecoder.compile(data_structure)
+    return list(decoder.decode("".join(generate_data(scale, 0)).encode()))
+
+
+@pytest.mark.asyncio
+async def test_load_observations(benchmark: Benchmark, session: AsyncSession) -> None:
+    scale = OBSERVATIONS_SCALE
+    dataflow = await load_structures(session, scale)
+    batches = await decode_data(session, dataflow, scale)
+
+    await benchmark.run_async(
+        lambda: load_observations(session, dataflow, batches),
+        rows=scale.observations,
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups(benchmark: Benchmark, session: AsyncSession) -> None:
+    scale = OBSERVATIONS_SCALE
+    dataflow = await load_structures(session, scale)
+    await load_observations(
+        session, dataflow, await decode_data(session, dataflow, scale)
+    )
+    partition_id = await get_partition(session, dataflow)
+    assert partition_id is not None
+
+    async def refresh() -> int:
+        await session.execute(
+            update(Series)
+            .where(Series.partition_id == partition_id)
+            .values(rollup_from=datetime(1900, 1, 1))
+        )
+        return await refresh_rollups(session, partition_id)
+
+    refreshed = await benchmark.run_async(refresh, rows=scale.observations)
+
+    assert refreshed == scale.series_per_dataflow
@@ -0,0 +1,150 @@
+from typing import Awaitable, Callable, Generic, Iterable, Sequence, TypeVar, cast
+from collections import OrderedDict
+import gzip
+import hashlib
+import logging
+from urllib.parse import urlencode
+import orjson
+from fastapi import Request, Response, status
+from redis.exceptions import RedisError
+from fennec_api.core import queue
+from fennec_api.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "fennec:cache:"
+
+Renderer = Callable[[], Awaitable[tuple[bytes, dict[str, str]]]]
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+def tag(*parts: str) -> str:
+    return ":".join(parts)
+
+
+def tag_key(tag: str) -> str:
+    return f"{CACHE_PREFIX}tag:{tag}"
+
+
+def generation_key(tag: str) -> str:
+    return f"{CACHE_PREFIX}generation:{tag}"
+
+
+def generation_ttl() -> int:
+    # A generation must outlive every response cached under it, otherwise the
+    # counter could restart and reach a stale entry's generation again
+    return 2 * settings.RESPONSE_CACHE_TTL
+
+
+def response_key(request: Request, generations: Sequence[bytes | None] = ()) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    generation = ",".join(g.decode() if g else "0" for g in generations)
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{query}#{generation}".encode(), digest_size=16
+    ).hexdigest()
+    return f"{CACHE_PREFIX}response:{digest}"
+
+
+def pack_entry(etag: str, headers: dict[str, str], body: bytes) -> bytes:
+    return orjson.dumps({"etag": etag, "headers": headers}) + b"\n" + body
+
+
+def unpack_entry(entry: bytes) -> tuple[str, dict[str, str], bytes]:
+    meta, body = entry.split(b"\n", 1)
+    fields = orjson.loads(meta)
+    return fields["etag"], fields["headers"], body
+
+
+def _respond(
+    request: Request, etag: str, headers: dict[str, str], body: bytes
+) -> Response:
+    headers = {
+        **headers,
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if etag in request.headers.get("if-none-match", "").split(", "):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, "Content-Encoding": "gzip"},
+        )
+    return Response(
+        content=gzip.decompress(body), media_type="application/json", headers=headers
+    )
+
+
+async def cached_response(
+    request: Request, *, tags: Iterable[str], render: Renderer
+) -> Response:
+    redis = queue.pool
+    tags = list(tags)
+    key = response_key(request)
+    if redis:
+        try:
+            key = response_key(
+                request, await redis.mget([generation_key(t) for t in tags])
+            )
+            entry = await redis.get(key)
+        except RedisError as e:
+            logger.warning("Could not read cached response %s: %s", key, e)
+            redis = None
+        else:
+            if entry:
+                return _respond(request, *unpack_entry(entry))
+
+    content, headers = await render()
+    etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    body = gzip.compress(content, compresslevel=6)
+    if redis:
+        try:
+            await redis.set(
+                key, pack_entry(etag, headers, body), ex=settings.RESPONSE_CACHE_TTL
+            )
+            for t in tags:
+                await cast(Awaitable[int], redis.sadd(tag_key(t), key))
+                await redis.expire(tag_key(t), settings.RESPONSE_CACHE_TTL)
+                await redis.expire(generation_key(t), generation_ttl())
+        except RedisError as e:
+            logger.warning("Could not cache response %s: %s", key, e)
+    return _respond(request, etag, headers, body)
+
+
+async def invalidate(tags: Iterable[str]) -> None:
+    redis = queue.pool
+    if not redis:
+        return
+    try:
+        for t in tags:
+            await redis.incr(generation_key(t))
+            await redis.expire(generation_key(t), generation_ttl())
+            keys = await cast(Awaitable[set[bytes]], redis.smembers(tag_key(t)))
+            await redis.delete(*keys, tag_key(t))
+    except RedisError as e:
+        logger.warning("Could not invalidate cached responses: %s", e)
@@ -1,18 +1,53 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     ENVIRONMENT: str
     DB_URI: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
     API_V1_PREFIX: str = "/api/v1"
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_IN_MINUTES: int = 30
     SENTRY_DSN: str | None = None
+    SENTRY_TRACES_SAMPLE_RATE: float = 0.1
+    SENTRY_TAIL_SAMPLE_RATE: float = 0.1
+    SENTRY_SLOW_TRANSACTION_THRESHOLD: float = 1.0
+    SENTRY_PROFILES_SAMPLE_RATE: float = 0.05
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_USERNAME: str | None = None
     REDIS_PASSWORD: str | None = None
+    RESPONSE_CACHE_TTL: int = 86400
+    WORKER_PROCESSES: int | None = None
+    WORKER_MAX_JOBS: int = 10
+    WORKER_JOB_TIMEOUT: int = 300
+    WORKER_SHUTDOWN_TIMEOUT: int = 30
+    WORKER_METRICS_HOST: str = "0.0.0.0"
+    WORKER_METRICS_PORT: int | None = None
+    HARVEST_SCHEDULE_INTERVAL: int = 5
+    HARVEST_RETRY_DELAY: int = 15
+    HARVEST_MAX_CONCURRENCY: int = 8
+    HARVEST_MAX_PER_HOST: int = 2
+    HARVEST_JITTER: int = 60
+    HARVEST_NIGHT_START_HOUR: int = 0
+    HARVEST_NIGHT_END_HOUR: int = 6
+    HARVEST_MEMORY_PROFILING: bool = False
+    OBSERVATION_PARTITION_YEARS: int = 10
+    AVAILABILITY_CACHE_CHUNKS: int = 64
+    DECODER_CACHE_SIZE: int = 128
+
+    @field_validator("HARVEST_SCHEDULE_INTERVAL")
+    @classmethod
+    def divides_hour(cls, value: int) -> int:
+        if value < 1 or 60 % value:
+            raise ValueError("HARVEST_SCHEDULE_INTERVAL must divide 60 minutes")
+        return value
 
 
 settings = Settings()  # pyright: ignore
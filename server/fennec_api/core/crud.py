@@ -1,6 +1,10 @@
-from typing import TypeVar, Type, Generic, Any, Sequence
-from sqlalchemy import select, inspect
+from typing import TypeVar, Type, Generic, Any, AsyncIterator, Sequence
+import base64
+import binascii
+import orjson
+from sqlalchemy import Row, Select, select, inspect, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
 from fastapi.encoders import jsonable_encoder
 from fennec_api.core.schemas import FennecBaseModel
 from fennec_api.core.database import Base
@@ -10,9 +14,72 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=FennecBaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=FennecBaseModel)
 
 
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(list(values))).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except (binascii.Error, orjson.JSONDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor {cursor}")
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor {cursor}")
+    return values
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]) -> None:
         self._model = model
+        self._primary_key = inspect(model).primary_key
+
+    @property
+    def model(self) -> Type[ModelType]:
+        return self._model
+
+    def cursor(self, db_obj: ModelType) -> str:
+        return encode_cursor(inspect(self._model).primary_key_from_instance(db_obj))
+
+    def seek_values(self, cursor: str) -> list[Any]:
+        values = decode_cursor(cursor)
+        if len(values) != len(self._primary_key) or not all(
+            isinstance(value, column.type.python_type)
+            for column, value in zip(self._primary_key, values)
+        ):
+            raise ValueError(f"Invalid cursor {cursor}")
+        return values
+
+    def row_cursor(self, row: Row[Any]) -> str:
+        return encode_cursor([row._mapping[c.key] for c in self._primary_key])
+
+    def _select(
+        self,
+        *args: Any,
+        cursor: str | None = None,
+        options: Sequence[ExecutableOption] = (),
+        columns: Sequence[Any] = (),
+        **kwargs: Any,
+    ) -> Select[Any]:
+        keys = {c.key for c in columns}
+        entities = (
+            [*columns, *(c for c in self._primary_key if c.key not in keys)]
+            if columns
+            else [self._model]
+        )
+        stmt = (
+            select(*entities)
+            .options(*options)
+            .filter(*args)
+            .filter_by(**kwargs)
+            .order_by(*self._primary_key)
+        )
+        if cursor is not None:
+            stmt = stmt.filter(
+                tuple_(*self._primary_key) > tuple_(*self.seek_values(cursor))
+            )
+        return stmt
 
     async def create(
         self, session: AsyncSession, *, obj_in: CreateSchemaType
@@ -24,10 +91,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db_obj
 
     async def get(
-        self, session: AsyncSession, *args: Any, **kwargs: Any
+        self,
+        session: AsyncSession,
+        *args: Any,
+        options: Sequence[ExecutableOption] = (),
+        **kwargs: Any,
     ) -> ModelType | None:
         result = await session.execute(
-            select(self._model).filter(*args).filter_by(**kwargs)
+            select(self._model).options(*options).filter(*args).filter_by(**kwargs)
         )
         return result.scalars().first()
 
@@ -37,23 +108,69 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *args: Any,
         offset: int = 0,
         limit: int = -1,
+        cursor: str | None = None,
+        options: Sequence[ExecutableOption] = (),
         **kwargs: Any,
     ) -> Sequence[ModelType]:
-        stmt = (
-            (
-                select(self._model)
-                .filter(*args)
-                .filter_by(**kwargs)
-                .offset(offset)
-                .limit(limit)
-            )
-            if limit >= 0
-            else (select(self._model).filter(*args).filter_by(**kwargs).offset(offset))
+        stmt = self._select(*args, cursor=cursor, options=options, **kwargs).offset(
+            offset
         )
+        if limit >= 0:
+            stmt = stmt.limit(limit)
 
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def stream_multi(
+        self,
+        session: AsyncSession,
+        *args: Any,
+        cursor: str | None = None,
+        options: Sequence[ExecutableOption] = (),
+        batch_size: int = 1000,
+        **kwargs: Any,
+    ) -> AsyncIterator[ModelType]:
+        result = await session.stream_scalars(
+            self._select(
+                *args, cursor=cursor, options=options, **kwargs
+            ).execution_options(yield_per=batch_size)
+        )
+        async for db_obj in result:
+            yield db_obj
+
+    async def get_rows(
+        self,
+        session: AsyncSession,
+        *args: Any,
+        columns: Sequence[Any],
+        limit: int = -1,
+        cursor: str | None = None,
+        **kwargs: Any,
+    ) -> Sequence[Row[Any]]:
+        stmt = self._select(*args, cursor=cursor, columns=columns, **kwargs)
+        if limit >= 0:
+            stmt = stmt.limit(limit)
+
+        result = await session.execute(stmt)
+        return result.all()
+
+    async def stream_rows(
+        self,
+        session: AsyncSession,
+        *args: Any,
+        columns: Sequence[Any],
+        cursor: str | None = None,
+        batch_size: int = 1000,
+        **kwargs: Any,
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        result = await session.stream(
+            self._select(
+                *args, cursor=cursor, columns=columns, **kwargs
+            ).execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            yield rows
+
     async def update(
         self,
         session: AsyncSession,
@@ -1,9 +1,25 @@
+from typing import Any
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
-from fennec_api.core.config import settings
+from sqlalchemy import MetaData, make_url
+from fennec_api.core.config import Settings, settings
 
-engine = create_async_engine(settings.DB_URI)
+
+def build_engine_options(settings: Settings) -> dict[str, Any]:
+    options: dict[str, Any] = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if make_url(settings.DB_URI).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        }
+    return options
+
+
+engine = create_async_engine(settings.DB_URI, **build_engine_options(settings))
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
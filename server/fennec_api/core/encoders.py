@@ -0,0 +1,20 @@
+from typing import Any, AsyncIterator, Iterable, Sequence
+import orjson
+
+
+def encode_json(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> bytes:
+    return orjson.dumps([dict(zip(fields, row)) for row in rows])
+
+
+def encode_ndjson(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> bytes:
+    return b"".join(
+        orjson.dumps(dict(zip(fields, row)), option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+async def stream_ndjson(
+    fields: Sequence[str], batches: AsyncIterator[Sequence[Sequence[Any]]]
+) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield encode_ndjson(fields, rows)
@@ -0,0 +1,218 @@
+from typing import Iterator, Sequence, TypeVar
+import asyncio
+import math
+import time
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    type_name = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def _label_values(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"{self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        yield from ()
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(
+            f"{name}{labels} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+MetricType = TypeVar("MetricType", bound=Metric)
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._label_values(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, value in self.values.items():
+            yield self.name, _format_labels(self.label_names, key), value
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[self._label_values(labels)] = value
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._label_values(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, value in self.values.items():
+            yield self.name, _format_labels(self.label_names, key), value
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.counts: dict[LabelValues, list[int]] = {}
+        self.sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        counts = self.counts.setdefault(key, [0] * len(self.buckets))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self.sums[key] = self.sums.get(key, 0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        counts = self.counts.get(self._label_values(labels))
+        return counts[-1] if counts else 0
+
+    def sum(self, **labels: str) -> float:
+        return self.sums.get(self._label_values(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        names = self.label_names + ("le",)
+        for key, counts in self.counts.items():
+            for bound, count in zip(self.buckets, counts):
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(names, key + (_format_value(bound),)),
+                    count,
+                )
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum", labels, self.sums[key]
+            yield f"{self.name}_count", labels, counts[-1]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: MetricType) -> MetricType:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "".join(f"{m.render()}\n" for m in self.metrics.values())
+
+
+registry = Registry()
+
+
+async def _handle_metrics_request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    request_line = await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+        pass
+
+    if request_line.split(b" ")[:2] == [b"GET", b"/metrics"]:
+        status, content_type, body = "200 OK", CONTENT_TYPE, registry.render()
+    else:
+        status, content_type, body = "404 Not Found", "text/plain", "Not Found"
+
+    payload = body.encode()
+    writer.write(
+        (
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        + payload
+    )
+    await writer.drain()
+    writer.close()
+
+
+async def start_metrics_server(host: str, port: int) -> asyncio.Server:
+    return await asyncio.start_server(_handle_metrics_request, host, port)
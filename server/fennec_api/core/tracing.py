@@ -0,0 +1,50 @@
+from typing import Any, TYPE_CHECKING
+from datetime import datetime
+import random
+import sentry_sdk
+from fennec_api.core.config import settings
+
+if TYPE_CHECKING:
+    from sentry_sdk._types import Event, Hint
+
+UNSAMPLED_PATHS = {"/metrics", f"{settings.API_V1_PREFIX}/health"}
+
+
+def traces_sampler(sampling_context: dict[str, Any]) -> float:
+    if sampling_context.get("parent_sampled") is not None:
+        return float(sampling_context["parent_sampled"])
+    if sampling_context.get("asgi_scope", {}).get("path") in UNSAMPLED_PATHS:
+        return 0
+    return settings.SENTRY_TRACES_SAMPLE_RATE
+
+
+def _duration(event: "Event") -> float:
+    start, end = event.get("start_timestamp"), event.get("timestamp")
+    if isinstance(start, str):
+        start = datetime.fromisoformat(start)
+    if isinstance(end, str):
+        end = datetime.fromisoformat(end)
+    if not isinstance(start, datetime) or not isinstance(end, datetime):
+        return 0
+    return (end - start).total_seconds()
+
+
+def before_send_transaction(event: "Event", hint: "Hint") -> "Event | None":
+    status = event.get("contexts", {}).get("trace", {}).get("status")
+    if status not in (None, "ok"):
+        return event
+    if _duration(event) >= settings.SENTRY_SLOW_TRANSACTION_THRESHOLD:
+        return event
+    if random.random() < settings.SENTRY_TAIL_SAMPLE_RATE:
+        return event
+    return None
+
+
+def init_sentry() -> None:
+    sentry_sdk.init(
+        dsn=settings.SENTRY_DSN,
+        traces_sampler=traces_sampler,
+        profiles_sample_rate=settings.SENTRY_PROFILES_SAMPLE_RATE,
+        before_send_transaction=before_send_transaction,
+        environment=settings.ENVIRONMENT,
+    )
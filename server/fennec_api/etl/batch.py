@@ -0,0 +1,65 @@
+from typing import Any, Iterable, Iterator
+import math
+from array import array
+from dataclasses import dataclass, field
+
+MISSING = -1
+
+
+class Dictionary:
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: list[str] = []
+        self.index: dict[str, int] = {}
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str | None) -> int:
+        if value is None:
+            return MISSING
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+    def decode(self, i: int) -> str | None:
+        return None if i == MISSING else self.values[i]
+
+    def copy(self) -> "Dictionary":
+        dictionary = Dictionary()
+        dictionary.values = self.values.copy()
+        dictionary.index = self.index.copy()
+        return dictionary
+
+
+@dataclass
+class DataBatch:
+    dimensions: tuple[str, ...]
+    attributes: tuple[str, ...]
+    dictionaries: dict[str, Dictionary]
+    columns: dict[str, "array[int]"] = field(default_factory=dict)
+    time_period: list[str] = field(default_factory=list)
+    obs_value: "array[float]" = field(default_factory=lambda: array("d"))
+
+    def __post_init__(self) -> None:
+        for name in self.dimensions + self.attributes:
+            self.columns.setdefault(name, array("l"))
+
+    def __len__(self) -> int:
+        return len(self.time_period)
+
+    def decode(self, column: str) -> list[str | None]:
+        dictionary = self.dictionaries[column]
+        return [dictionary.decode(i) for i in self.columns[column]]
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        names = self.dimensions + self.attributes
+        decoded = [self.decode(name) for name in names]
+        for i, (time_period, value) in enumerate(zip(self.time_period, self.obs_value)):
+            row: dict[str, Any] = {name: col[i] for name, col in zip(names, decoded)}
+            row["time_period"] = time_period
+            row["obs_value"] = None if math.isnan(value) else value
+            yield row
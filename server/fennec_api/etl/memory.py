@@ -0,0 +1,152 @@
+from typing import AsyncIterator
+import asyncio
+import logging
+import os
+import tracemalloc
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fennec_api.etl.metrics import current_provider, MEMORY_RSS, MEMORY_TRACED_PEAK
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def current_rss() -> int | None:
+    # getrusage only reports the peak RSS, which would hide per-stage changes
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class HarvestLock:
+    def __init__(self) -> None:
+        self._condition = asyncio.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._waiting = 0
+
+    @asynccontextmanager
+    async def shared(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._exclusive and not self._waiting
+            )
+            self._shared += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._shared -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        async with self._condition:
+            self._waiting += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._exclusive and not self._shared
+                )
+            finally:
+                self._waiting -= 1
+                self._condition.notify_all()
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._exclusive = False
+                self._condition.notify_all()
+
+
+class MemoryProfiler:
+    tracers = 0
+
+    def __init__(self, enabled: bool = False, *, top: int = 10) -> None:
+        self.enabled = enabled
+        self.top = top
+        self._started = False
+        self._previous: tracemalloc.Snapshot | None = None
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        if MemoryProfiler.tracers or not tracemalloc.is_tracing():
+            if not MemoryProfiler.tracers:
+                tracemalloc.start()
+            MemoryProfiler.tracers += 1
+            self._started = True
+        tracemalloc.reset_peak()
+        self._previous = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def stop(self) -> None:
+        if self._started:
+            MemoryProfiler.tracers -= 1
+            if not MemoryProfiler.tracers:
+                tracemalloc.stop()
+            self._started = False
+        self._previous = None
+
+    def checkpoint(self, stage: str) -> None:
+        if not self.enabled or not tracemalloc.is_tracing():
+            return
+
+        provider = current_provider.get()
+        _, peak = tracemalloc.get_traced_memory()
+        rss = current_rss()
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        stats: list[tracemalloc.StatisticDiff] | list[tracemalloc.Statistic] = (
+            snapshot.compare_to(self._previous, "lineno")
+            if self._previous
+            else snapshot.statistics("lineno")
+        )
+
+        if rss is not None:
+            MEMORY_RSS.set(rss, provider=provider, stage=stage)
+        MEMORY_TRACED_PEAK.set(peak, provider=provider, stage=stage)
+        logger.info(
+            "Provider %s stage %s: rss=%s bytes, traced peak=%d bytes",
+            provider,
+            stage,
+            "unknown" if rss is None else rss,
+            peak,
+        )
+        for stat in stats[: self.top]:
+            logger.info("Provider %s stage %s: %s", provider, stage, stat)
+
+        tracemalloc.reset_peak()
+        self._previous = snapshot
+
+
+memory_profiler: ContextVar[MemoryProfiler] = ContextVar(
+    "memory_profiler", default=MemoryProfiler()
+)
+
+
+def checkpoint(stage: str) -> None:
+    memory_profiler.get().checkpoint(stage)
+
+
+# tracemalloc sees every allocation of the process, so a profiled harvest holds
+# the lock exclusively: other harvests of this worker wait until it finishes.
+harvest_lock = HarvestLock()
+
+
+@asynccontextmanager
+async def profile_memory(enabled: bool) -> AsyncIterator[MemoryProfiler]:
+    profiler = MemoryProfiler(enabled)
+    async with harvest_lock.exclusive() if enabled else harvest_lock.shared():
+        token = memory_profiler.set(profiler)
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            memory_profiler.reset(token)
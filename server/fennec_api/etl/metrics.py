@@ -0,0 +1,95 @@
+from typing import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import sentry_sdk
+from fennec_api.core.metrics import registry, Counter, Gauge, Histogram
+
+current_provider: ContextVar[str] = ContextVar("current_provider", default="")
+
+FETCHED_BYTES = registry.register(
+    Counter(
+        "etl_fetched_bytes_total",
+        "Bytes fetched from providers",
+        ["provider", "artefact"],
+    )
+)
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram(
+        "etl_http_request_duration_seconds",
+        "Latency of provider HTTP requests",
+        ["provider", "artefact"],
+    )
+)
+PARSE_DURATION = registry.register(
+    Histogram(
+        "etl_parse_duration_seconds",
+        "Time spent parsing provider messages",
+        ["provider", "artefact"],
+    )
+)
+TRANSFORM_DURATION = registry.register(
+    Histogram(
+        "etl_transform_duration_seconds",
+        "Time spent building records from parsed messages",
+        ["provider", "artefact"],
+    )
+)
+TRANSFORMED_RECORDS = registry.register(
+    Counter(
+        "etl_transformed_records_total",
+        "Records built from parsed messages",
+        ["provider", "artefact"],
+    )
+)
+SKIPPED_RECORDS = registry.register(
+    Counter(
+        "etl_skipped_records_total",
+        "Parsed records dropped before loading",
+        ["provider", "artefact"],
+    )
+)
+UPSERT_DURATION = registry.register(
+    Histogram(
+        "etl_upsert_duration_seconds",
+        "Time spent upserting records",
+        ["provider", "artefact"],
+    )
+)
+UPSERTED_ROWS = registry.register(
+    Counter(
+        "etl_upserted_rows_total",
+        "Rows upserted into the database",
+        ["provider", "artefact"],
+    )
+)
+QUEUE_WAIT = registry.register(
+    Histogram(
+        "etl_queue_wait_seconds",
+        "Time harvest jobs spent waiting in the queue",
+        ["provider"],
+    )
+)
+
+MEMORY_RSS = registry.register(
+    Gauge(
+        "etl_memory_rss_bytes",
+        "Resident set size at harvest stage boundaries",
+        ["provider", "stage"],
+    )
+)
+MEMORY_TRACED_PEAK = registry.register(
+    Gauge(
+        "etl_memory_traced_peak_bytes",
+        "Peak traced Python allocations during a harvest stage",
+        ["provider", "stage"],
+    )
+)
+
+
+@contextmanager
+def stage(op: str, histogram: Histogram, **labels: str) -> Iterator[None]:
+    with sentry_sdk.start_span(op=op, description=labels.get("artefact")) as span:
+        for key, value in labels.items():
+            span.set_tag(key, value)
+        with histogram.time(**labels):
+            yield
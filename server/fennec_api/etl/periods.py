@@ -0,0 +1,209 @@
+from typing import Any, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import re
+import numpy as np
+import numpy.typing as npt
+import pyarrow as pa
+
+REPORTING_PERIOD_PATTERN = re.compile(r"^(\d{4})-?([ASTQMWD])(\d{1,3})$")
+CALENDAR_PERIOD_PATTERN = re.compile(r"^\d{4}(-\d{2}(-\d{2})?)?$")
+
+MONTHS_PER_PERIOD = {"A": 12, "S": 6, "T": 4, "Q": 3, "M": 1}
+CALENDAR_FREQUENCIES = {4: "A", 7: "M", 10: "D"}
+CALENDAR_UNITS = {4: "Y", 7: "M", 10: "D"}
+INSTANT = "I"
+
+NAT = np.datetime64("NaT", "s")
+
+Datetimes = npt.NDArray[np.datetime64[Any]]
+
+
+def _add_months(start: datetime, months: int) -> datetime:
+    year, month = divmod(start.month - 1 + months, 12)
+    return start.replace(year=start.year + year, month=month + 1)
+
+
+def _reporting_period_bounds(
+    year: int, period: str, index: int
+) -> tuple[datetime, datetime] | None:
+    if index < 1:
+        return None
+    if period == "W":
+        day = date.fromisocalendar(year, index, 1)
+        start = datetime(day.year, day.month, day.day)
+        return start, start + timedelta(days=7)
+    if period == "D":
+        start = datetime(year, 1, 1) + timedelta(days=index - 1)
+        return (start, start + timedelta(days=1)) if start.year == year else None
+    months = MONTHS_PER_PERIOD[period]
+    month = (index - 1) * months + 1
+    if month > 12:
+        return None
+    start = datetime(year, month, 1)
+    return start, _add_months(start, months)
+
+
+def _parse_period(time_period: str) -> tuple[datetime, datetime, str] | None:
+    value = time_period.strip().split("/", 1)[0]
+    try:
+        match = REPORTING_PERIOD_PATTERN.match(value)
+        if match:
+            bounds = _reporting_period_bounds(int(match[1]), match[2], int(match[3]))
+            return (*bounds, match[2]) if bounds else None
+        if len(value) == 4:
+            start = datetime(int(value), 1, 1)
+            return start, _add_months(start, 12), "A"
+        if len(value) == 7:
+            start = datetime(int(value[:4]), int(value[5:7]), 1)
+            return start, _add_months(start, 1), "M"
+        start = datetime.fromisoformat(value).replace(tzinfo=None)
+        if len(value) == 10:
+            return start, start + timedelta(days=1), "D"
+        return start, start + timedelta(seconds=1), INSTANT
+    except ValueError:
+        return None
+
+
+def period_bounds(time_period: str) -> tuple[datetime, datetime] | None:
+    parsed = _parse_period(time_period)
+    return (parsed[0], parsed[1]) if parsed else None
+
+
+def period_start(time_period: str) -> datetime | None:
+    bounds = period_bounds(time_period)
+    return bounds[0] if bounds else None
+
+
+@dataclass
+class Periods:
+    start: Datetimes
+    end: Datetimes
+    frequency: npt.NDArray[np.str_]
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def valid(self) -> npt.NDArray[np.bool[Any]]:
+        return np.logical_not(np.isnat(self.start))
+
+
+def _calendar_bounds(values: list[str], length: int) -> tuple[Datetimes, Datetimes]:
+    unit = CALENDAR_UNITS[length]
+    start = np.array(values).astype(f"datetime64[{unit}]")
+    end = start + np.timedelta64(1, unit)
+    return start.astype("datetime64[s]"), end.astype("datetime64[s]")
+
+
+def _year_start(years: npt.NDArray[np.int64]) -> Datetimes:
+    return (years - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+
+
+def _iso_week_1(years: npt.NDArray[np.int64]) -> Datetimes:
+    january_4 = _year_start(years) + np.timedelta64(3, "D")
+    weekday = (january_4.astype(np.int64) + 3) % 7
+    week_1: Datetimes = january_4 - weekday.astype("timedelta64[D]")
+    return week_1
+
+
+def _reporting_bounds(
+    years: npt.NDArray[np.int64], period: str, indexes: npt.NDArray[np.int64]
+) -> tuple[Datetimes, Datetimes]:
+    offsets = indexes - 1
+    if period in MONTHS_PER_PERIOD:
+        months = MONTHS_PER_PERIOD[period]
+        start = _year_start(years).astype("datetime64[M]") + (offsets * months).astype(
+            "timedelta64[M]"
+        )
+        end = start + np.timedelta64(months, "M")
+        valid = (offsets >= 0) & (offsets * months < 12)
+    elif period == "W":
+        week_1 = _iso_week_1(years)
+        weeks = (_iso_week_1(years + 1) - week_1).astype(np.int64) // 7
+        start = week_1 + (offsets * 7).astype("timedelta64[D]")
+        end = start + np.timedelta64(7, "D")
+        valid = (offsets >= 0) & (offsets < weeks)
+    else:
+        start = _year_start(years) + offsets.astype("timedelta64[D]")
+        end = start + np.timedelta64(1, "D")
+        valid = (offsets >= 0) & (start < _year_start(years + 1))
+    return (
+        np.where(valid, start.astype("datetime64[s]"), NAT),
+        np.where(valid, end.astype("datetime64[s]"), NAT),
+    )
+
+
+class PeriodParser:
+    def __init__(self, max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self.cache: dict[str, tuple[np.datetime64[Any], np.datetime64[Any], str]] = {}
+
+    def _parse_missing(self, values: list[str]) -> None:
+        calendar: dict[int, list[str]] = {}
+        reporting: dict[str, list[tuple[str, int, int]]] = {}
+        fallback: list[str] = []
+        for value in values:
+            stripped = value.strip()
+            if CALENDAR_PERIOD_PATTERN.match(stripped):
+                calendar.setdefault(len(stripped), []).append(value)
+                continue
+            match = REPORTING_PERIOD_PATTERN.match(stripped)
+            if match:
+                reporting.setdefault(match[2], []).append(
+                    (value, int(match[1]), int(match[3]))
+                )
+                continue
+            fallback.append(value)
+
+        for length, group in calendar.items():
+            try:
+                start, end = _calendar_bounds([v.strip() for v in group], length)
+            except ValueError:
+                fallback.extend(group)
+                continue
+            frequency = CALENDAR_FREQUENCIES[length]
+            for value, s, e in zip(group, start, end):
+                self.cache[value] = (s, e, frequency)
+
+        for period, items in reporting.items():
+            start, end = _reporting_bounds(
+                np.array([year for _, year, _ in items], dtype=np.int64),
+                period,
+                np.array([index for _, _, index in items], dtype=np.int64),
+            )
+            for (value, _, _), s, e in zip(items, start, end):
+                self.cache[value] = (s, e, period if not np.isnat(s) else "")
+
+        for value in fallback:
+            parsed = _parse_period(value)
+            self.cache[value] = (
+                (
+                    np.datetime64(parsed[0], "s"),
+                    np.datetime64(parsed[1], "s"),
+                    parsed[2],
+                )
+                if parsed
+                else (NAT, NAT, "")
+            )
+
+    def parse(self, periods: Sequence[str]) -> Periods:
+        encoded = pa.array(periods, pa.string()).dictionary_encode()
+        values: list[str] = encoded.dictionary.to_pylist()
+        indices = encoded.indices.to_numpy(zero_copy_only=False)
+
+        cache = self.cache
+        missing = [value for value in values if value not in cache]
+        if missing:
+            if len(cache) + len(missing) > self.max_size:
+                cache.clear()
+                missing = values
+            self._parse_missing(missing)
+
+        parsed = [cache[value] for value in values]
+        start = np.array([p[0] for p in parsed], dtype="datetime64[s]")
+        end = np.array([p[1] for p in parsed], dtype="datetime64[s]")
+        frequency = np.array([p[2] for p in parsed], dtype="U1")
+        return Periods(
+            start=start[indices], end=end[indices], frequency=frequency[indices]
+        )
@@ -1,9 +1,19 @@
-from typing import TypeVar, Any, Type, Iterable
+from typing import TypeVar, Any, Type, Iterable, AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 from itertools import batched
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import inspect
+import sentry_sdk
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection
+from sqlalchemy import inspect, select, func, tuple_
 from sqlalchemy.dialects.postgresql import insert
 from fennec_api.core.database import Base
+from fennec_api.etl.metrics import (
+    current_provider,
+    stage,
+    TRANSFORM_DURATION,
+    TRANSFORMED_RECORDS,
+    UPSERT_DURATION,
+    UPSERTED_ROWS,
+)
 
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -17,16 +27,57 @@ async def upsert(
     chunk_size: int = 1000,
 ) -> None:
     mapper = inspect(model)
+    columns = [c for c in mapper.columns if not c.primary_key and c.computed is None]
+    labels = dict(provider=current_provider.get(), artefact=model.__tablename__)
+    batches = batched(records, n=chunk_size)
 
-    for batch in batched(records, n=chunk_size):
-        insert_statement = insert(model).values(list(batch))
-        do_update_statement = insert_statement.on_conflict_do_update(
-            index_elements=[c.description for c in mapper.primary_key],
-            set_={
-                c.description: insert_statement.excluded[c.description]
-                for c in mapper.columns
-                if not c.primary_key
-            },
-        )
-        await session.execute(do_update_statement)
-        await session.commit()
+    with sentry_sdk.start_span(op="etl.upsert", description=model.__tablename__):
+        while True:
+            with stage("etl.transform", TRANSFORM_DURATION, **labels):
+                batch = next(batches, None)
+            if batch is None:
+                break
+            TRANSFORMED_RECORDS.inc(len(batch), **labels)
+
+            insert_statement = insert(model).values(list(batch))
+            excluded = [insert_statement.excluded[c.description] for c in columns]
+            do_update_statement = insert_statement.on_conflict_do_update(
+                index_elements=[c.description for c in mapper.primary_key],
+                set_={c.description: e for c, e in zip(columns, excluded)},
+                where=tuple_(*columns).is_distinct_from(tuple_(*excluded)),
+            )
+            with stage("db.upsert", UPSERT_DURATION, **labels):
+                result = await session.execute(do_update_statement)
+                await session.commit()
+            UPSERTED_ROWS.inc(result.rowcount, **labels)
+
+
+async def copy_records(
+    session: AsyncSession,
+    table_name: str,
+    records: Iterable[tuple[Any, ...]],
+    columns: Sequence[str],
+) -> None:
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    assert driver_connection is not None
+    await driver_connection.copy_records_to_table(
+        table_name, records=records, columns=columns
+    )
+
+
+@asynccontextmanager
+async def try_advisory_lock(
+    connection: AsyncConnection, namespace: int, key: int
+) -> AsyncIterator[bool]:
+    acquired = bool(
+        (
+            await connection.execute(select(func.pg_try_advisory_lock(namespace, key)))
+        ).scalar_one()
+    )
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            await connection.execute(select(func.pg_advisory_unlock(namespace, key)))
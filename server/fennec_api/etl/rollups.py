@@ -0,0 +1,64 @@
+from typing import Any
+from dataclasses import dataclass
+import numpy as np
+import numpy.typing as npt
+from fennec_api.etl.periods import Datetimes, MONTHS_PER_PERIOD
+
+
+@dataclass
+class Aggregates:
+    series: npt.NDArray[np.int64]
+    start: Datetimes
+    observations: npt.NDArray[np.int64]
+    sum: npt.NDArray[np.float64]
+    first: npt.NDArray[np.float64]
+    last: npt.NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+
+def period_months(start: Datetimes, frequency: str) -> npt.NDArray[np.int64]:
+    months = MONTHS_PER_PERIOD[frequency]
+    month: npt.NDArray[np.int64] = start.astype("datetime64[M]").astype(np.int64)
+    return month - month % months
+
+
+def aggregate(
+    series: npt.NDArray[np.int64],
+    start: Datetimes,
+    end: Datetimes,
+    values: npt.NDArray[np.float64],
+    frequency: str,
+) -> Aggregates:
+    order = np.lexsort((start, series))
+    series, start, end, values = series[order], start[order], end[order], values[order]
+
+    bucket = period_months(start, frequency)
+    bucket_end = (bucket + MONTHS_PER_PERIOD[frequency]).astype("datetime64[M]")
+    keep = (end <= bucket_end.astype("datetime64[s]")) & ~np.isnan(values)
+    series, bucket, values = series[keep], bucket[keep], values[keep]
+
+    changed = np.ones(len(values), dtype=bool)
+    changed[1:] = (series[1:] != series[:-1]) | (bucket[1:] != bucket[:-1])
+    boundary = np.flatnonzero(changed)
+    last = np.append(boundary[1:], len(values))[: len(boundary)] - 1
+    return Aggregates(
+        series=series[boundary],
+        start=bucket[boundary].astype("datetime64[M]").astype("datetime64[s]"),
+        observations=last - boundary + 1,
+        sum=np.add.reduceat(values, boundary) if len(values) else values,
+        first=values[boundary],
+        last=values[last],
+    )
+
+
+def period_labels(start: Datetimes, frequency: str) -> list[str]:
+    month: Any = start.astype("datetime64[M]").astype(np.int64)
+    years, months = (month // 12 + 1970).tolist(), (month % 12).tolist()
+    if frequency == "A":
+        return [str(year) for year in years]
+    if frequency == "M":
+        return [f"{year}-{m + 1:02d}" for year, m in zip(years, months)]
+    span = MONTHS_PER_PERIOD[frequency]
+    return [f"{year}-{frequency}{m // span + 1}" for year, m in zip(years, months)]
@@ -2,22 +2,18 @@ from typing import AsyncGenerator
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
 from arq import create_pool
-import sentry_sdk
 from fennec_api.core.config import settings
 from fennec_api.core.arq import redis_settings
 from fennec_api.core import queue
+from fennec_api.core.tracing import init_sentry
 from fennec_api.health.router import router as health_router
+from fennec_api.metrics.router import router as metrics_router
 from fennec_api.auth.router import router as auth_router
 from fennec_api.users.router import router as users_router
 from fennec_api.sdmx_v21.router import router as sdmx_v21_router
 
 
-sentry_sdk.init(
-    dsn=settings.SENTRY_DSN,
-    traces_sample_rate=1.0,
-    profiles_sample_rate=1.0,
-    environment=settings.ENVIRONMENT,
-)
+init_sentry()
 
 
 @asynccontextmanager
@@ -36,3 +32,4 @@ router.include_router(users_router)
 router.include_router(sdmx_v21_router)
 
 app.include_router(router)
+app.include_router(metrics_router)
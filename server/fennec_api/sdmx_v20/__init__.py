@@ -0,0 +1,22 @@
+from .decode import CompactDataDecoder, GenericDataDecoder
+from .structure import (
+    Code,
+    CodeList,
+    CodelistRef,
+    Component,
+    KeyFamily,
+    read_code_lists,
+    read_key_families,
+)
+
+__all__ = [
+    "CompactDataDecoder",
+    "GenericDataDecoder",
+    "Code",
+    "CodeList",
+    "CodelistRef",
+    "Component",
+    "KeyFamily",
+    "read_code_lists",
+    "read_key_families",
+]
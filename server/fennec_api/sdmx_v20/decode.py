@@ -0,0 +1,103 @@
+from typing import Iterator, Self
+import io
+from lxml import etree
+from fennec_api.etl.batch import DataBatch, Dictionary
+from fennec_api.sdmx_v20.structure import KeyFamily
+from fennec_api.sdmx_v21.etl.decode import StructureSpecificDecoder, to_float
+
+GENERIC_NS = "http://www.SDMX.org/resources/SDMXML/schemas/v2_0/generic"
+
+
+class CompactDataDecoder(StructureSpecificDecoder):
+    tags: tuple[str, ...] = ("{*}DataSet", "{*}Series", "{*}Obs")
+
+    @classmethod
+    def from_key_family(cls, key_family: KeyFamily) -> Self:
+        return cls(
+            dimensions=tuple(d.id for d in key_family.dimensions),
+            attributes=tuple(a.id for a in key_family.attributes),
+            time_dimension=key_family.time_dimension.id,
+            primary_measure=key_family.primary_measure.id,
+        )
+
+
+def _values(elem: etree._Element | None) -> dict[str, str]:
+    if elem is None:
+        return {}
+    return {
+        v.get("concept", ""): v.get("value", "")
+        for v in elem.iterchildren(f"{{{GENERIC_NS}}}Value")
+    }
+
+
+class GenericDataDecoder(CompactDataDecoder):
+    tags: tuple[str, ...] = tuple(
+        f"{{{GENERIC_NS}}}{name}" for name in ("SeriesKey", "Attributes", "Obs")
+    )
+
+    def _decode(
+        self, content: bytes, dictionaries: dict[str, Dictionary], batch_size: int
+    ) -> Iterator[DataBatch]:
+        dimension_slots = self._slots(dictionaries, self.dimensions)
+        attribute_slots = self._slots(dictionaries, self.attributes)
+        time_tag = f"{{{GENERIC_NS}}}Time"
+        obs_value_tag = f"{{{GENERIC_NS}}}ObsValue"
+        attributes_tag = f"{{{GENERIC_NS}}}Attributes"
+
+        batch = self._new_batch(dictionaries)
+        dataset_attributes: dict[str, str] = {}
+        series_codes: list[int] = [encode(None) for _, encode in dimension_slots]
+        series_attributes: dict[str, str] = {}
+
+        for _, elem in etree.iterparse(io.BytesIO(content), tag=self.tags):
+            tag = elem.tag
+            tag = tag[tag.rfind("}") + 1 :]
+            if tag == "SeriesKey":
+                key = _values(elem)
+                series_codes = [
+                    encode(key.get(name)) for name, encode in dimension_slots
+                ]
+                series_attributes = {}
+                continue
+            if tag == "Attributes":
+                parent = elem.getparent()
+                if parent is None:
+                    continue
+                parent_tag = parent.tag[parent.tag.rfind("}") + 1 :]
+                if parent_tag == "Series":
+                    series_attributes = _values(elem)
+                elif parent_tag == "DataSet":
+                    dataset_attributes = _values(elem)
+                continue
+
+            obs_attributes = _values(elem.find(attributes_tag))
+            for (name, _), code in zip(dimension_slots, series_codes):
+                batch.columns[name].append(code)
+            for name, encode in attribute_slots:
+                value = obs_attributes.get(name)
+                if value is None:
+                    value = series_attributes.get(name)
+                    if value is None:
+                        value = dataset_attributes.get(name)
+                batch.columns[name].append(encode(value))
+            time = elem.find(time_tag)
+            obs_value = elem.find(obs_value_tag)
+            batch.time_period.append(
+                (time.text or "").strip() if time is not None else ""
+            )
+            batch.obs_value.append(
+                to_float(obs_value.get("value") if obs_value is not None else None)
+            )
+
+            parent = elem.getparent()
+            elem.clear()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = self._new_batch(dictionaries)
+
+        if batch.time_period:
+            yield batch
@@ -0,0 +1,137 @@
+from typing import Iterator
+import io
+from dataclasses import dataclass, field
+from lxml import etree
+
+STRUCTURE_NS = "http://www.SDMX.org/resources/SDMXML/schemas/v2_0/structure"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+
+def _tag(name: str) -> str:
+    return f"{{{STRUCTURE_NS}}}{name}"
+
+
+@dataclass(frozen=True)
+class CodelistRef:
+    agency_id: str
+    id: str
+    version: str
+
+
+@dataclass
+class Component:
+    id: str
+    codelist: CodelistRef | None = None
+    attachment_level: str | None = None
+
+
+@dataclass
+class KeyFamily:
+    agency_id: str
+    id: str
+    version: str
+    name: str | None
+    dimensions: list[Component]
+    time_dimension: Component
+    primary_measure: Component
+    attributes: list[Component] = field(default_factory=list)
+
+
+@dataclass
+class Code:
+    id: str
+    description: str | None
+    parent_id: str | None = None
+
+
+@dataclass
+class CodeList:
+    agency_id: str
+    id: str
+    version: str
+    name: str | None
+    codes: list[Code] = field(default_factory=list)
+
+
+def _label(elem: etree._Element, name: str) -> str | None:
+    return next(
+        (e.text for e in elem.iterchildren(_tag(name)) if e.get(XML_LANG) == "en"),
+        None,
+    )
+
+
+def _component(elem: etree._Element, agency_id: str) -> Component:
+    codelist = elem.get("codelist")
+    return Component(
+        id=elem.get("conceptRef", ""),
+        codelist=CodelistRef(
+            agency_id=elem.get("codelistAgency", agency_id),
+            id=codelist,
+            version=elem.get("codelistVersion", "1.0"),
+        )
+        if codelist
+        else None,
+        attachment_level=elem.get("attachmentLevel"),
+    )
+
+
+def _key_family(elem: etree._Element) -> KeyFamily:
+    agency_id = elem.get("agencyID", "")
+    components = elem.find(_tag("Components"))
+    if components is None:
+        raise ValueError(f"Key family {elem.get('id')} has no components")
+
+    time_dimension = components.find(_tag("TimeDimension"))
+    primary_measure = components.find(_tag("PrimaryMeasure"))
+    if time_dimension is None or primary_measure is None:
+        raise ValueError(
+            f"Key family {elem.get('id')} has no time dimension or primary measure"
+        )
+
+    return KeyFamily(
+        agency_id=agency_id,
+        id=elem.get("id", ""),
+        version=elem.get("version", "1.0"),
+        name=_label(elem, "Name"),
+        dimensions=[
+            _component(e, agency_id) for e in components.iterchildren(_tag("Dimension"))
+        ],
+        time_dimension=_component(time_dimension, agency_id),
+        primary_measure=_component(primary_measure, agency_id),
+        attributes=[
+            _component(e, agency_id) for e in components.iterchildren(_tag("Attribute"))
+        ],
+    )
+
+
+def _code_list(elem: etree._Element) -> CodeList:
+    return CodeList(
+        agency_id=elem.get("agencyID", ""),
+        id=elem.get("id", ""),
+        version=elem.get("version", "1.0"),
+        name=_label(elem, "Name"),
+        codes=[
+            Code(
+                id=e.get("value", ""),
+                description=_label(e, "Description"),
+                parent_id=e.get("parentCode"),
+            )
+            for e in elem.iterchildren(_tag("Code"))
+        ],
+    )
+
+
+def _read(content: bytes, name: str) -> Iterator[etree._Element]:
+    for _, elem in etree.iterparse(io.BytesIO(content), tag=_tag(name)):
+        yield elem
+        elem.clear()
+
+
+def read_key_families(content: bytes) -> Iterator[KeyFamily]:
+    for elem in _read(content, "KeyFamily"):
+        yield _key_family(elem)
+
+
+def read_code_lists(content: bytes) -> Iterator[CodeList]:
+    for elem in _read(content, "CodeList"):
+        yield _code_list(elem)
@@ -0,0 +1,345 @@
+from typing import Iterable, Sequence
+from dataclasses import dataclass, replace
+from enum import Enum
+from itertools import batched
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core.cache import LRUCache
+from fennec_api.core.config import settings
+from fennec_api.sdmx_v21.constraints import pack_bitmap, prune, Region, unpack_bitmap
+from fennec_api.sdmx_v21.keys import KeyDictionary, KeyMatcher
+from fennec_api.sdmx_v21.models import (
+    ObservationPartition,
+    Series,
+    SeriesAvailability,
+)
+
+
+class AvailabilityMode(str, Enum):
+    EXACT = "exact"
+    AVAILABLE = "available"
+
+
+# Series slots are split in chunks of 2**CHUNK_BITS. Each (position, ordinal)
+# keeps one row per chunk it occurs in, stored as sorted uint16 offsets when
+# sparse and as a bitmap otherwise, so storage follows the number of series
+# holding a code rather than the highest slot.
+CHUNK_BITS = 16
+
+Bitmap = dict[int, int]
+
+availability_cache: LRUCache[tuple[int, int, int], list[tuple[int, int, int]]] = (
+    LRUCache(settings.AVAILABILITY_CACHE_CHUNKS)
+)
+
+
+def _union(bitmaps: Iterable[Bitmap]) -> Bitmap:
+    union: Bitmap = {}
+    for bitmap in bitmaps:
+        for chunk, bits in bitmap.items():
+            union[chunk] = union.get(chunk, 0) | bits
+    return union
+
+
+def _intersection(a: Bitmap, b: Bitmap) -> Bitmap:
+    return {chunk: m for chunk, bits in a.items() if (m := bits & b.get(chunk, 0))}
+
+
+def _intersects(a: Bitmap, b: Bitmap) -> bool:
+    return any(bits & b.get(chunk, 0) for chunk, bits in a.items())
+
+
+def _array_limit() -> int:
+    return (1 << CHUNK_BITS) // 16
+
+
+def pack_container(bits: int) -> bytes:
+    if bits.bit_count() < _array_limit():
+        data = np.frombuffer(pack_bitmap(bits), dtype=np.uint8)
+        offsets = np.flatnonzero(np.unpackbits(data, bitorder="little"))
+        return offsets.astype("<u2").tobytes()
+    return pack_bitmap(bits)
+
+
+def unpack_container(data: bytes, series: int) -> int:
+    if series < _array_limit():
+        return _bitmap(np.frombuffer(data, dtype="<u2").astype(np.int64))
+    return unpack_bitmap(data)
+
+
+@dataclass
+class AvailabilityIndex:
+    series: int
+    bitmaps: tuple[dict[int, Bitmap], ...]
+
+    def add(self, position: int, ordinal: int, chunk: int, bits: int) -> None:
+        self.bitmaps[position].setdefault(ordinal, {})[chunk] = bits
+
+    def full(self) -> Bitmap:
+        size = 1 << CHUNK_BITS
+        return {
+            chunk: (1 << min(size, self.series - chunk * size)) - 1
+            for chunk in range((self.series + size - 1) >> CHUNK_BITS)
+        }
+
+    def mask(self, matcher: KeyMatcher, *, skip: int | None = None) -> Bitmap:
+        mask: Bitmap | None = None
+        for position, allowed in matcher.positions:
+            if position == skip:
+                continue
+            bitmaps = self.bitmaps[position]
+            selected = _union(bitmaps[o] for o in allowed if o in bitmaps)
+            mask = selected if mask is None else _intersection(mask, selected)
+        return self.full() if mask is None else mask
+
+    def masks(
+        self, matcher: KeyMatcher, mode: AvailabilityMode = AvailabilityMode.EXACT
+    ) -> list[Bitmap]:
+        if mode == AvailabilityMode.EXACT:
+            return [self.mask(matcher)] * len(self.bitmaps)
+        return [self.mask(matcher, skip=p) for p in range(len(self.bitmaps))]
+
+    def count(self, matcher: KeyMatcher) -> int:
+        return sum(bits.bit_count() for bits in self.mask(matcher).values())
+
+    def codes(
+        self, matcher: KeyMatcher, mode: AvailabilityMode = AvailabilityMode.EXACT
+    ) -> tuple[frozenset[int], ...]:
+        return tuple(
+            frozenset(
+                ordinal
+                for ordinal, bitmap in bitmaps.items()
+                if _intersects(bitmap, mask)
+            )
+            for bitmaps, mask in zip(self.bitmaps, self.masks(matcher, mode))
+        )
+
+
+def constrained_codes(
+    key_dictionary: KeyDictionary,
+    matcher: KeyMatcher,
+    constraints: Sequence[Sequence[Region]],
+    mode: AvailabilityMode = AvailabilityMode.EXACT,
+) -> tuple[frozenset[int], ...]:
+    codes = []
+    for position, dimension_codes in enumerate(key_dictionary.codes):
+        query = (
+            matcher
+            if mode == AvailabilityMode.EXACT
+            else replace(
+                matcher,
+                positions=tuple((p, a) for p, a in matcher.positions if p != position),
+            )
+        )
+        pruned = prune(key_dictionary, query, constraints)
+        codes.append(
+            frozenset()
+            if pruned.empty
+            else dict(pruned.positions).get(
+                position, frozenset(dimension_codes.values())
+            )
+        )
+    return tuple(codes)
+
+
+def _bitmap(slots: npt.NDArray[np.int64]) -> int:
+    data = np.zeros(int(slots[-1]) // 8 + 1, dtype=np.uint8)
+    np.bitwise_or.at(data, slots >> 3, np.left_shift(1, slots & 7).astype(np.uint8))
+    return int.from_bytes(data.tobytes(), "little")
+
+
+def _bitmaps(
+    keys: Sequence[Sequence[int]], first_slot: int
+) -> dict[tuple[int, int, int], int]:
+    columns = np.array(keys, dtype=np.int64)
+    slots = np.arange(first_slot, first_slot + len(keys), dtype=np.int64)
+    chunks = slots >> CHUNK_BITS
+    offsets = slots & ((1 << CHUNK_BITS) - 1)
+    bitmaps: dict[tuple[int, int, int], int] = {}
+    for position in range(columns.shape[1]):
+        order = np.lexsort((chunks, columns[:, position]))
+        groups = np.stack([columns[order, position], chunks[order]], axis=1)
+        boundaries = np.flatnonzero(np.any(np.diff(groups, axis=0), axis=1)) + 1
+        for group in np.split(order, boundaries):
+            bitmaps[
+                position, int(columns[group[0], position]), int(chunks[group[0]])
+            ] = _bitmap(offsets[group])
+    return bitmaps
+
+
+async def _read_chunks(
+    session: AsyncSession, partition_id: int, series: int, chunks: Iterable[int]
+) -> dict[int, list[tuple[int, int, int]]]:
+    rows: dict[int, list[tuple[int, int, int]]] = {}
+    missing = []
+    for chunk in chunks:
+        cached = availability_cache.get((partition_id, series, chunk))
+        if cached is None:
+            missing.append(chunk)
+            rows[chunk] = []
+        else:
+            rows[chunk] = cached
+    if missing:
+        for position, ordinal, chunk, count, bitmap in await session.execute(
+            select(
+                SeriesAvailability.position,
+                SeriesAvailability.ordinal,
+                SeriesAvailability.chunk,
+                SeriesAvailability.series,
+                SeriesAvailability.bitmap,
+            ).where(
+                SeriesAvailability.partition_id == partition_id,
+                SeriesAvailability.chunk.in_(missing),
+            )
+        ):
+            rows[chunk].append((position, ordinal, unpack_container(bitmap, count)))
+        for chunk in missing:
+            availability_cache.set((partition_id, series, chunk), rows[chunk])
+    return rows
+
+
+async def read_availability(
+    session: AsyncSession,
+    partition_id: int,
+    dimensions: int,
+    matcher: KeyMatcher,
+    mode: AvailabilityMode = AvailabilityMode.EXACT,
+) -> AvailabilityIndex | None:
+    series = (
+        await session.execute(
+            select(ObservationPartition.series_count).where(
+                ObservationPartition.id == partition_id
+            )
+        )
+    ).scalar_one_or_none()
+    if series is None:
+        return None
+    index = AvailabilityIndex(
+        series=series, bitmaps=tuple({} for _ in range(dimensions))
+    )
+
+    selected = [(p, o) for p, allowed in matcher.positions for o in allowed]
+    if selected:
+        for position, ordinal, chunk, count, bitmap in await session.execute(
+            select(
+                SeriesAvailability.position,
+                SeriesAvailability.ordinal,
+                SeriesAvailability.chunk,
+                SeriesAvailability.series,
+                SeriesAvailability.bitmap,
+            ).where(
+                SeriesAvailability.partition_id == partition_id,
+                tuple_(SeriesAvailability.position, SeriesAvailability.ordinal).in_(
+                    selected
+                ),
+            )
+        ):
+            index.add(position, ordinal, chunk, unpack_container(bitmap, count))
+
+    chunks = sorted({chunk for mask in index.masks(matcher, mode) for chunk in mask})
+    for chunk, rows in (
+        await _read_chunks(session, partition_id, series, chunks)
+    ).items():
+        for position, ordinal, bits in rows:
+            index.add(position, ordinal, chunk, bits)
+    return index
+
+
+async def extend_availability(
+    session: AsyncSession,
+    partition_id: int,
+    keys: Sequence[Sequence[int]],
+    *,
+    chunk_size: int = 1000,
+) -> int:
+    series_count = (
+        await session.execute(
+            select(ObservationPartition.series_count)
+            .where(ObservationPartition.id == partition_id)
+            .with_for_update()
+        )
+    ).scalar_one()
+    if series_count is None:
+        keys = (
+            await session.scalars(
+                select(Series.key)
+                .where(Series.partition_id == partition_id)
+                .order_by(Series.id)
+            )
+        ).all()
+        series_count = 0
+        await session.execute(
+            delete(SeriesAvailability).where(
+                SeriesAvailability.partition_id == partition_id
+            )
+        )
+
+    bitmaps = _bitmaps(keys, series_count) if keys else {}
+    boundary = series_count >> CHUNK_BITS if series_count % (1 << CHUNK_BITS) else None
+    for batch in batched(bitmaps, n=chunk_size):
+        shared = [k for k in batch if k[2] == boundary]
+        existing = (
+            {
+                (position, ordinal, chunk): unpack_container(bitmap, count)
+                for position, ordinal, chunk, count, bitmap in await session.execute(
+                    select(
+                        SeriesAvailability.position,
+                        SeriesAvailability.ordinal,
+                        SeriesAvailability.chunk,
+                        SeriesAvailability.series,
+                        SeriesAvailability.bitmap,
+                    ).where(
+                        SeriesAvailability.partition_id == partition_id,
+                        tuple_(
+                            SeriesAvailability.position,
+                            SeriesAvailability.ordinal,
+                            SeriesAvailability.chunk,
+                        ).in_(shared),
+                    )
+                )
+            }
+            if shared
+            else {}
+        )
+        records = []
+        for position, ordinal, chunk in batch:
+            bits = (
+                existing.get((position, ordinal, chunk), 0)
+                | bitmaps[position, ordinal, chunk]
+            )
+            records.append(
+                dict(
+                    partition_id=partition_id,
+                    position=position,
+                    ordinal=ordinal,
+                    chunk=chunk,
+                    series=bits.bit_count(),
+                    bitmap=pack_container(bits),
+                )
+            )
+        insert_statement = insert(SeriesAvailability).values(records)
+        await session.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=[
+                    SeriesAvailability.partition_id,
+                    SeriesAvailability.position,
+                    SeriesAvailability.ordinal,
+                    SeriesAvailability.chunk,
+                ],
+                set_={
+                    "series": insert_statement.excluded.series,
+                    "bitmap": insert_statement.excluded.bitmap,
+                },
+            )
+        )
+
+    series_count += len(keys)
+    await session.execute(
+        update(ObservationPartition)
+        .where(ObservationPartition.id == partition_id)
+        .values(series_count=series_count)
+    )
+    return series_count
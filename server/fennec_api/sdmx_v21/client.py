@@ -3,6 +3,11 @@ from dataclasses import dataclass
 from enum import Enum
 from urllib.parse import urljoin
 from httpx import AsyncClient
+from fennec_api.etl.metrics import (
+    current_provider,
+    FETCHED_BYTES,
+    HTTP_REQUEST_DURATION,
+)
 
 
 class StructureType(str, Enum):
@@ -34,10 +39,21 @@ class ReferencesType(str, Enum):
     ALL = "all"
 
 
+class WireFormat(str, Enum):
+    XML = "xml"
+    JSON = "json"
+
+
 STRUCTURE_CONTENT_TYPE = "application/vnd.sdmx.structure+xml;version=2.1"
+JSON_STRUCTURE_CONTENT_TYPE = "application/vnd.sdmx.structure+json;version=1.0"
 
+STRUCTURE_CONTENT_TYPES = {
+    WireFormat.XML: STRUCTURE_CONTENT_TYPE,
+    WireFormat.JSON: JSON_STRUCTURE_CONTENT_TYPE,
+}
 
-@dataclass
+
+@dataclass(frozen=True)
 class SDMX21StructureRequest:
     resource: StructureType
     agency_id: str | None = None
@@ -70,8 +86,10 @@ def build_default_structure_params(
     return params
 
 
-def build_default_structure_headers() -> dict[str, str]:
-    return {"Accept": STRUCTURE_CONTENT_TYPE}
+def build_default_structure_headers(
+    wire_format: WireFormat = WireFormat.XML,
+) -> dict[str, str]:
+    return {"Accept": STRUCTURE_CONTENT_TYPES[wire_format]}
 
 
 def build_root_url(*, root_url: str, path: str) -> str:
@@ -91,13 +109,17 @@ class SDMX21RestClient:
         params_builder: Callable[
             [DetailType | None, ReferencesType | None], dict[str, str]
         ] = build_default_structure_params,
-        headers_builder: Callable[[], dict[str, str]] = build_default_structure_headers,
+        headers_builder: Callable[
+            [WireFormat], dict[str, str]
+        ] = build_default_structure_headers,
+        wire_format: WireFormat = WireFormat.XML,
     ) -> None:
         self.http_client = http_client
         self.root_url = root_url
         self.path_builder = path_builder
         self.params_builder = params_builder
         self.headers_builder = headers_builder
+        self.wire_format = wire_format
 
     async def __do_request(
         self,
@@ -118,8 +140,12 @@ class SDMX21RestClient:
         detail: DetailType | None = None,
         references: ReferencesType | None = None,
     ) -> bytes:
-        return await self.__do_request(
-            path=self.path_builder(req),
-            params=self.params_builder(detail, references),
-            headers=self.headers_builder(),
-        )
+        labels = dict(provider=current_provider.get(), artefact=req.resource.value)
+        with HTTP_REQUEST_DURATION.time(**labels):
+            content = await self.__do_request(
+                path=self.path_builder(req),
+                params=self.params_builder(detail, references),
+                headers=self.headers_builder(self.wire_format),
+            )
+        FETCHED_BYTES.inc(len(content), **labels)
+        return content
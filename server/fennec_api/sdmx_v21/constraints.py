@@ -0,0 +1,160 @@
+from typing import Iterable, Sequence
+from dataclasses import dataclass, replace
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.sdmx_v21.keys import KeyDictionary, KeyMatcher
+from fennec_api.sdmx_v21.models import ContentConstraint, CubeRegion, Dataflow
+
+
+def to_bitmap(ordinals: Iterable[int]) -> int:
+    bitmap = 0
+    for ordinal in ordinals:
+        bitmap |= 1 << ordinal
+    return bitmap
+
+
+def from_bitmap(bitmap: int) -> frozenset[int]:
+    ordinals = []
+    while bitmap:
+        lowest = bitmap & -bitmap
+        ordinals.append(lowest.bit_length() - 1)
+        bitmap ^= lowest
+    return frozenset(ordinals)
+
+
+def pack_bitmap(bitmap: int) -> bytes:
+    return bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+
+
+def unpack_bitmap(data: bytes) -> int:
+    return int.from_bytes(data, "little")
+
+
+@dataclass
+class Region:
+    include: bool
+    bitmaps: dict[int, int]
+
+    def intersects(self, allowed: dict[int, int]) -> bool:
+        return all(
+            bitmap & allowed.get(position, bitmap)
+            for position, bitmap in self.bitmaps.items()
+        )
+
+    def covers(self, allowed: dict[int, int], full: Sequence[int]) -> bool:
+        return all(
+            not allowed.get(position, full[position]) & ~bitmap
+            for position, bitmap in self.bitmaps.items()
+        )
+
+
+def _empty(matcher: KeyMatcher) -> KeyMatcher:
+    return replace(matcher, positions=((0, frozenset()),))
+
+
+def prune(
+    key_dictionary: KeyDictionary,
+    matcher: KeyMatcher,
+    constraints: Sequence[Sequence[Region]],
+) -> KeyMatcher:
+    if matcher.empty:
+        return matcher
+    full = [to_bitmap(codes.values()) for codes in key_dictionary.codes]
+    allowed = {position: to_bitmap(codes) for position, codes in matcher.positions}
+    for regions in constraints:
+        if any(region.include for region in regions):
+            included = [r for r in regions if r.include and r.intersects(allowed)]
+            if not included:
+                return _empty(matcher)
+            for position in set.intersection(*(set(r.bitmaps) for r in included)):
+                union = 0
+                for region in included:
+                    union |= region.bitmaps[position]
+                if position in allowed:
+                    allowed[position] &= union
+                elif union != full[position]:
+                    allowed[position] = union
+        if any(not r.include and r.covers(allowed, full) for r in regions):
+            return _empty(matcher)
+    return replace(
+        matcher,
+        positions=tuple(
+            (position, from_bitmap(bitmap))
+            for position, bitmap in sorted(allowed.items())
+        ),
+    )
+
+
+def plan_data_keys(
+    key_dictionary: KeyDictionary,
+    constraints: Sequence[Sequence[Region]],
+    *,
+    pattern: str = "all",
+    max_keys: int = 50,
+) -> list[str]:
+    matcher = prune(key_dictionary, key_dictionary.matcher(pattern), constraints)
+    if matcher.empty:
+        return []
+    regions = max(constraints, key=lambda rs: sum(r.include for r in rs), default=())
+    keys: dict[str, None] = {}
+    for region in regions:
+        if region.include:
+            pruned = prune(key_dictionary, matcher, [*constraints, [region]])
+            if not pruned.empty:
+                keys[key_dictionary.pattern(pruned)] = None
+    if not keys or len(keys) > max_keys:
+        return [key_dictionary.pattern(matcher)]
+    return list(keys)
+
+
+async def read_constraints(
+    session: AsyncSession,
+    dataflow: Dataflow,
+    key_dictionary: KeyDictionary,
+    *,
+    type: str | None = None,
+) -> list[list[Region]]:
+    positions = {d: position for position, d in enumerate(key_dictionary.dimensions)}
+    constraints: dict[tuple[str, str, str], dict[int, Region]] = {}
+    stale: set[tuple[tuple[str, str, str], int]] = set()
+    statement = select(
+        CubeRegion.constraint_id,
+        CubeRegion.constraint_agency_id,
+        CubeRegion.constraint_version,
+        CubeRegion.region,
+        CubeRegion.include,
+        CubeRegion.dimension_id,
+        CubeRegion.bitmap,
+    ).where(
+        CubeRegion.dataflow_id == dataflow.id,
+        CubeRegion.dataflow_agency_id == dataflow.agency_id,
+        CubeRegion.dataflow_version == dataflow.version,
+    )
+    if type:
+        statement = statement.join(
+            ContentConstraint,
+            (ContentConstraint.id == CubeRegion.constraint_id)
+            & (ContentConstraint.agency_id == CubeRegion.constraint_agency_id)
+            & (ContentConstraint.version == CubeRegion.constraint_version),
+        ).where(ContentConstraint.type == type)
+    for row in await session.execute(statement):
+        constraint = (
+            row.constraint_id,
+            row.constraint_agency_id,
+            row.constraint_version,
+        )
+        region = constraints.setdefault(constraint, {}).setdefault(
+            row.region, Region(include=row.include, bitmaps={})
+        )
+        if row.dimension_id in positions:
+            region.bitmaps[positions[row.dimension_id]] = unpack_bitmap(row.bitmap)
+        elif not row.include:
+            stale.add((constraint, row.region))
+    return [
+        [
+            region
+            for index, region in regions.items()
+            if (constraint, index) not in stale
+        ]
+        for constraint, regions in constraints.items()
+    ]
@@ -6,9 +6,12 @@ from .extract import (
     fetch_all_codelists,
     fetch_concept_schemes,
     fetch_all_concept_schemes,
+    fetch_all_content_constraints,
     fetch_data_structure,
     fetch_all_data_structures,
 )
+from .constraints import extract_regions, load_content_constraints
+from .decode import get_decoder, JsonDataDecoder, StructureSpecificDecoder
 from .load import (
     load_categorisations,
     load_category_schemes,
@@ -17,6 +20,8 @@ from .load import (
     load_data_structures,
     load_dataflows,
 )
+from .observations import create_partition, drop_partition, load_observations
+from .rollups import refresh_rollups
 from .transform import (
     extract_data_structure_refs,
     extract_codelist_refs,
@@ -31,14 +36,24 @@ __all__ = [
     "fetch_all_codelists",
     "fetch_concept_schemes",
     "fetch_all_concept_schemes",
+    "fetch_all_content_constraints",
     "fetch_data_structure",
     "fetch_all_data_structures",
+    "extract_regions",
+    "load_content_constraints",
+    "get_decoder",
+    "JsonDataDecoder",
+    "StructureSpecificDecoder",
     "load_categorisations",
     "load_category_schemes",
     "load_codelists",
     "load_concept_schemes",
     "load_data_structures",
     "load_dataflows",
+    "create_partition",
+    "drop_partition",
+    "load_observations",
+    "refresh_rollups",
     "extract_data_structure_refs",
     "extract_codelist_refs",
     "extract_concept_refs",
@@ -0,0 +1,152 @@
+from typing import Any, Iterable, Iterator, Sequence
+from sqlalchemy import delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.etl.postgres import upsert
+from fennec_api.sdmx_v21.constraints import Region, pack_bitmap, to_bitmap
+from fennec_api.sdmx_v21.etl.transform import extract_labels
+from fennec_api.sdmx_v21.keys import KeyDictionary, load_key_dictionary
+from fennec_api.sdmx_v21.models import (
+    ContentConstraint,
+    CubeRegion,
+    Dataflow,
+    DataStructure,
+)
+from fennec_api.sdmx_v21.parser import ContentConstraintType
+
+
+def _region(
+    key_dictionary: KeyDictionary,
+    include: bool,
+    key_values: Iterable[tuple[str | None, list[str], bool]],
+) -> Region | None:
+    bitmaps: dict[int, int] = {}
+    for dimension_id, values, values_included in key_values:
+        if dimension_id not in key_dictionary.dimensions:
+            if include:
+                continue
+            return None
+        position = key_dictionary.dimensions.index(dimension_id)
+        codes = key_dictionary.codes[position]
+        bitmap = to_bitmap(codes[value] for value in values if value in codes)
+        if not values_included:
+            bitmap = to_bitmap(codes.values()) & ~bitmap
+        bitmaps[position] = bitmaps.get(position, bitmap) & bitmap
+    if not include and not bitmaps:
+        return None
+    return Region(include=include, bitmaps=bitmaps)
+
+
+def _regions(
+    constraint: ContentConstraintType, key_dictionary: KeyDictionary
+) -> Iterator[Region | None]:
+    for cube_region in constraint.cube_region:
+        if not cube_region.include and cube_region.attribute:
+            continue
+        yield _region(
+            key_dictionary,
+            cube_region.include,
+            (
+                (kv.id, [v.value for v in kv.value], kv.include)
+                for kv in cube_region.key_value
+            ),
+        )
+    for key_set in constraint.data_key_set:
+        for key in key_set.key:
+            include = key_set.is_included is not False and key.include
+            if not include and key.attribute:
+                continue
+            yield _region(
+                key_dictionary,
+                include,
+                (
+                    (kv.id, [kv.value.value] if kv.value else [], kv.include)
+                    for kv in key.key_value
+                ),
+            )
+
+
+def extract_regions(
+    constraint: ContentConstraintType, key_dictionary: KeyDictionary
+) -> list[Region]:
+    regions = [r for r in _regions(constraint, key_dictionary) if r]
+    if any(r.include and not r.bitmaps for r in regions):
+        return [r for r in regions if not r.include]
+    return regions
+
+
+async def load_content_constraints(
+    session: AsyncSession, constraints: Sequence[ContentConstraintType]
+) -> None:
+    constraints = [c for c in constraints if c.id and c.agency_id]
+    await upsert(
+        session,
+        model=ContentConstraint,
+        records=(
+            {
+                "id": c.id,
+                "agency_id": c.agency_id,
+                "version": c.version,
+                "urn": c.urn,
+                **extract_labels(c),
+                "type": c.type_value.value,
+            }
+            for c in constraints
+        ),
+    )
+
+    key_dictionaries: dict[tuple[Any, ...], KeyDictionary | None] = {}
+    region_records: list[dict[str, Any]] = []
+    for c in constraints:
+        attachment = c.constraint_attachment
+        for dataflow_ref in attachment.dataflow if attachment else []:
+            ref = dataflow_ref.ref
+            dataflow = (
+                await session.get(Dataflow, (ref.id, ref.agency_id, ref.version))
+                if ref
+                else None
+            )
+            if not dataflow:
+                continue
+            structure = (
+                dataflow.structure_id,
+                dataflow.structure_agency_id,
+                dataflow.structure_version,
+            )
+            if structure not in key_dictionaries:
+                data_structure = await session.get(DataStructure, structure)
+                key_dictionaries[structure] = (
+                    await load_key_dictionary(session, data_structure)
+                    if data_structure
+                    else None
+                )
+            key_dictionary = key_dictionaries[structure]
+            if not key_dictionary:
+                continue
+            region_records.extend(
+                {
+                    "constraint_id": c.id,
+                    "constraint_agency_id": c.agency_id,
+                    "constraint_version": c.version,
+                    "dataflow_id": dataflow.id,
+                    "dataflow_agency_id": dataflow.agency_id,
+                    "dataflow_version": dataflow.version,
+                    "region": index,
+                    "dimension_id": key_dictionary.dimensions[position],
+                    "include": region.include,
+                    "bitmap": pack_bitmap(bitmap),
+                }
+                for index, region in enumerate(extract_regions(c, key_dictionary))
+                for position, bitmap in region.bitmaps.items()
+            )
+
+    await session.execute(
+        delete(CubeRegion).where(
+            tuple_(
+                CubeRegion.constraint_id,
+                CubeRegion.constraint_agency_id,
+                CubeRegion.constraint_version,
+            ).in_([(c.id, c.agency_id, c.version) for c in constraints])
+        )
+    )
+    await upsert(session, model=CubeRegion, records=region_records)
+    await session.commit()
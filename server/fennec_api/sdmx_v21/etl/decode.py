@@ -0,0 +1,340 @@
+from typing import Any, Callable, Iterator, Sequence
+import hashlib
+import io
+import logging
+import math
+import orjson
+from lxml import etree
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core.cache import LRUCache
+from fennec_api.core.config import settings
+from fennec_api.etl.batch import DataBatch, Dictionary, MISSING
+from fennec_api.sdmx_v21.keys import read_key_dictionary
+from fennec_api.sdmx_v21.models import DataStructure
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_NS = "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/message"
+DATASET_TAG = f"{{{MESSAGE_NS}}}DataSet"
+
+
+def to_float(value: str | float | None) -> float:
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+Slots = tuple[tuple[str, Callable[[str | None], int]], ...]
+
+
+class StructureSpecificDecoder:
+    tags: tuple[str, ...] = (DATASET_TAG, "Series", "Obs")
+
+    def __init__(
+        self,
+        *,
+        dimensions: tuple[str, ...],
+        attributes: tuple[str, ...],
+        time_dimension: str,
+        primary_measure: str,
+        mandatory_attributes: tuple[str, ...] = (),
+        seeds: dict[str, Sequence[str]] | None = None,
+    ) -> None:
+        self.dimensions = dimensions
+        self.attributes = attributes
+        self.time_dimension = time_dimension
+        self.primary_measure = primary_measure
+        self.mandatory_attributes = mandatory_attributes
+        self._seeds = {
+            name: Dictionary((seeds or {}).get(name, ()))
+            for name in self.dimensions + self.attributes
+        }
+
+    @classmethod
+    def compile(
+        cls,
+        data_structure: DataStructure,
+        seeds: dict[str, Sequence[str]] | None = None,
+    ) -> "StructureSpecificDecoder":
+        if not data_structure.time_dimensions or not data_structure.primary_measures:
+            raise ValueError(
+                f"Data structure {data_structure.id} has no time dimension "
+                "or primary measure"
+            )
+        return cls(
+            dimensions=tuple(
+                d.id
+                for d in sorted(data_structure.dimensions, key=lambda d: d.position)
+            ),
+            attributes=tuple(a.id for a in data_structure.attributes),
+            time_dimension=data_structure.time_dimensions[0].id,
+            primary_measure=data_structure.primary_measures[0].id,
+            mandatory_attributes=tuple(
+                a.id
+                for a in data_structure.attributes
+                if a.assignment_status == "Mandatory"
+            ),
+            seeds=seeds,
+        )
+
+    def new_dictionaries(self) -> dict[str, Dictionary]:
+        return {name: dictionary.copy() for name, dictionary in self._seeds.items()}
+
+    @staticmethod
+    def _slots(dictionaries: dict[str, Dictionary], names: tuple[str, ...]) -> Slots:
+        return tuple((name, dictionaries[name].encode) for name in names)
+
+    def _new_batch(self, dictionaries: dict[str, Dictionary]) -> DataBatch:
+        return DataBatch(
+            dimensions=self.dimensions,
+            attributes=self.attributes,
+            dictionaries=dictionaries,
+        )
+
+    def decode(
+        self, content: bytes, *, batch_size: int = 10_000
+    ) -> Iterator[DataBatch]:
+        missing = dict.fromkeys(self.mandatory_attributes, 0)
+        for batch in self._decode(content, self.new_dictionaries(), batch_size):
+            for name in missing:
+                missing[name] += batch.columns[name].count(MISSING)
+            yield batch
+        for name, count in missing.items():
+            if count:
+                logger.warning(
+                    "Mandatory attribute %s is missing on %d observations",
+                    name,
+                    count,
+                )
+
+    def _decode(
+        self, content: bytes, dictionaries: dict[str, Dictionary], batch_size: int
+    ) -> Iterator[DataBatch]:
+        dimension_slots = self._slots(dictionaries, self.dimensions)
+        attribute_slots = self._slots(dictionaries, self.attributes)
+        time_dimension = self.time_dimension
+        primary_measure = self.primary_measure
+
+        batch = self._new_batch(dictionaries)
+        dimension_columns = [batch.columns[name] for name, _ in dimension_slots]
+        attribute_columns = [batch.columns[name] for name, _ in attribute_slots]
+
+        dataset_attributes: dict[str, str] = {}
+        series_codes: list[int] = [encode(None) for _, encode in dimension_slots]
+        series_attributes: dict[str, str] = {}
+        in_series = False
+
+        for event, elem in etree.iterparse(
+            io.BytesIO(content),
+            events=("start", "end"),
+            tag=self.tags,
+        ):
+            tag = elem.tag
+            tag = tag[tag.rfind("}") + 1 :]
+            if event == "start":
+                if tag == "Series":
+                    in_series = True
+                    attrib = elem.attrib
+                    series_codes = [
+                        encode(attrib.get(name)) for name, encode in dimension_slots
+                    ]
+                    series_attributes = dict(attrib)
+                elif tag == "DataSet":
+                    dataset_attributes = {
+                        k: v for k, v in elem.attrib.items() if not k.startswith("{")
+                    }
+                continue
+
+            if tag == "Obs":
+                attrib = elem.attrib
+                if in_series:
+                    for column, code in zip(dimension_columns, series_codes):
+                        column.append(code)
+                else:
+                    for column, (name, encode) in zip(
+                        dimension_columns, dimension_slots
+                    ):
+                        column.append(encode(attrib.get(name)))
+                for column, (name, encode) in zip(attribute_columns, attribute_slots):
+                    value = attrib.get(name)
+                    if value is None:
+                        value = series_attributes.get(name)
+                        if value is None:
+                            value = dataset_attributes.get(name)
+                    column.append(encode(value))
+                batch.time_period.append(attrib.get(time_dimension, ""))
+                batch.obs_value.append(to_float(attrib.get(primary_measure)))
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+                if len(batch.time_period) >= batch_size:
+                    yield batch
+                    batch = self._new_batch(dictionaries)
+                    dimension_columns = [
+                        batch.columns[name] for name, _ in dimension_slots
+                    ]
+                    attribute_columns = [
+                        batch.columns[name] for name, _ in attribute_slots
+                    ]
+            elif tag == "Series":
+                in_series = False
+                series_attributes = {}
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+        if batch.time_period:
+            yield batch
+
+
+class JsonDataDecoder(StructureSpecificDecoder):
+    @staticmethod
+    def _encoders(
+        dictionaries: dict[str, Dictionary], components: list[dict[str, Any]]
+    ) -> list[tuple[str | None, list[int]]]:
+        encoders: list[tuple[str | None, list[int]]] = []
+        for component in components:
+            dictionary = dictionaries.get(component["id"])
+            encoders.append(
+                (None, [])
+                if dictionary is None
+                else (
+                    component["id"],
+                    [dictionary.encode(v["id"]) for v in component["values"]],
+                )
+            )
+        return encoders
+
+    @staticmethod
+    def _resolve(
+        encoders: list[tuple[str | None, list[int]]],
+        indices: Sequence[int | None],
+        codes: dict[str, int],
+    ) -> None:
+        for (name, values), i in zip(encoders, indices):
+            if name is not None and i is not None:
+                codes[name] = values[i]
+
+    def _decode(
+        self, content: bytes, dictionaries: dict[str, Dictionary], batch_size: int
+    ) -> Iterator[DataBatch]:
+        msg = orjson.loads(content)
+        msg = msg.get("data", msg)
+        structure = msg["structure"] if "structure" in msg else msg["structures"][0]
+        dimensions = structure["dimensions"]
+        attributes = structure.get("attributes", {})
+
+        series_dimensions = self._encoders(dictionaries, dimensions.get("series", []))
+        observation_dimensions = self._encoders(
+            dictionaries,
+            [
+                d
+                for d in dimensions.get("observation", [])
+                if d["id"] != self.time_dimension
+            ],
+        )
+        time_position, time_values = next(
+            (
+                (position, [v["id"] for v in d["values"]])
+                for position, d in enumerate(dimensions.get("observation", []))
+                if d["id"] == self.time_dimension
+            ),
+            (None, []),
+        )
+        dataset_attributes = self._encoders(dictionaries, attributes.get("dataSet", []))
+        series_attributes = self._encoders(dictionaries, attributes.get("series", []))
+        observation_attributes = self._encoders(
+            dictionaries, attributes.get("observation", [])
+        )
+
+        batch = self._new_batch(dictionaries)
+        for dataset in msg["dataSets"]:
+            dataset_codes: dict[str, int] = {}
+            self._resolve(
+                dataset_attributes, dataset.get("attributes", []), dataset_codes
+            )
+            all_series = dataset.get("series") or {
+                "": {"observations": dataset.get("observations", {})}
+            }
+            for key, series in all_series.items():
+                series_codes = dict(dataset_codes)
+                self._resolve(
+                    series_dimensions,
+                    [int(i) for i in key.split(":")] if key else [],
+                    series_codes,
+                )
+                self._resolve(
+                    series_attributes, series.get("attributes", []), series_codes
+                )
+                for obs_key, obs in series.get("observations", {}).items():
+                    indices = [int(i) for i in obs_key.split(":")]
+                    codes = dict(series_codes)
+                    if time_position is not None:
+                        batch.time_period.append(
+                            time_values[indices.pop(time_position)]
+                        )
+                    else:
+                        batch.time_period.append("")
+                    self._resolve(observation_dimensions, indices, codes)
+                    self._resolve(observation_attributes, obs[1:], codes)
+                    for name, column in batch.columns.items():
+                        column.append(codes.get(name, MISSING))
+                    batch.obs_value.append(to_float(obs[0] if obs else None))
+
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = self._new_batch(dictionaries)
+
+        if batch.time_period:
+            yield batch
+
+
+decoders: LRUCache[tuple[str, str, str, str], StructureSpecificDecoder] = LRUCache(
+    settings.DECODER_CACHE_SIZE
+)
+
+
+def structure_hash(data_structure: DataStructure) -> str:
+    components = [
+        [d.id, d.position, d.codelist_id, d.codelist_agency_id, d.codelist_version]
+        for d in data_structure.dimensions
+    ]
+    components += [[a.id, a.assignment_status] for a in data_structure.attributes]
+    components += [[t.id] for t in data_structure.time_dimensions]
+    components += [[m.id] for m in data_structure.primary_measures]
+    return hashlib.blake2b(
+        orjson.dumps(sorted(components, key=str)), digest_size=16
+    ).hexdigest()
+
+
+async def get_decoder(
+    session: AsyncSession, data_structure: DataStructure
+) -> StructureSpecificDecoder:
+    key = (
+        data_structure.agency_id,
+        data_structure.id,
+        data_structure.version,
+        structure_hash(data_structure),
+    )
+    decoder = decoders.get(key)
+    if decoder is None:
+        key_dictionary = await read_key_dictionary(session, data_structure)
+        decoder = StructureSpecificDecoder.compile(
+            data_structure,
+            seeds={
+                dimension: sorted(codes, key=codes.__getitem__)
+                for dimension, codes in zip(
+                    key_dictionary.dimensions, key_dictionary.codes
+                )
+            },
+        )
+        decoders.set(key, decoder)
+    return decoder
@@ -1,11 +1,14 @@
 from typing import Iterable, Sequence
 import asyncio
+import sentry_sdk
 from fennec_api.sdmx_v21.client import (
     SDMX21RestClient,
     SDMX21StructureRequest,
     StructureType,
 )
 from fennec_api.sdmx_v21.parser import (
+    is_json,
+    parse_json_structure,
     parse_structure,
     Structure,
     Error,
@@ -18,8 +21,11 @@ from fennec_api.sdmx_v21.parser import (
     ObjectTypeCodelistType,
     CodelistType,
     ConceptSchemeType,
+    ContentConstraintType,
 )
 from fennec_api.sdmx_v21.exceptions import SDMXRestProviderError
+from fennec_api.etl.metrics import current_provider, stage, PARSE_DURATION
+from fennec_api.etl.memory import checkpoint
 
 
 def _to_structure_req(ref: RefBaseType) -> SDMX21StructureRequest:
@@ -83,8 +89,21 @@ def _to_structure_req(ref: RefBaseType) -> SDMX21StructureRequest:
 async def fetch_structure(
     client: SDMX21RestClient, req: SDMX21StructureRequest
 ) -> Structure:
-    msg = await client.get_structure(req=req)
-    structure = parse_structure(msg)
+    with sentry_sdk.start_span(
+        op="sdmx.fetch_structure", description=req.resource.value
+    ):
+        msg = await client.get_structure(req=req)
+        checkpoint(f"fetch_{req.resource.value}")
+        with stage(
+            "sdmx.parse_structure",
+            PARSE_DURATION,
+            provider=current_provider.get(),
+            artefact=req.resource.value,
+        ):
+            structure = (
+                parse_json_structure(msg) if is_json(msg) else parse_structure(msg)
+            )
+        checkpoint(f"parse_{req.resource.value}")
 
     if isinstance(structure, Error):
         raise SDMXRestProviderError(msg.decode())
@@ -176,6 +195,20 @@ async def fetch_all_data_structures(
     return msg.structures.data_structures.data_structure
 
 
+async def fetch_all_content_constraints(
+    client: SDMX21RestClient, agency_id: str | None = None
+) -> Sequence[ContentConstraintType]:
+    msg = await fetch_structure(
+        client=client,
+        req=SDMX21StructureRequest(
+            resource=StructureType.CONTENTCONSTRAINT, agency_id=agency_id
+        ),
+    )
+    if not msg.structures or not msg.structures.constraints:
+        raise SDMXRestProviderError("No content constraint found")
+    return msg.structures.constraints.content_constraint
+
+
 async def fetch_data_structure(
     client: SDMX21RestClient, ref: RefBaseType
 ) -> DataStructureType2:
@@ -193,7 +226,7 @@ async def fetch_data_structure(
 async def _fetch_from_refs(
     client: SDMX21RestClient, refs: Iterable[RefBaseType]
 ) -> Sequence[Structure]:
-    reqs = [_to_structure_req(ref) for ref in refs]
+    reqs = dict.fromkeys(_to_structure_req(ref) for ref in refs)
     return await asyncio.gather(
         *(fetch_structure(client=client, req=req) for req in reqs)
     )
@@ -1,6 +1,7 @@
 from typing import Any, Sequence
 from collections import defaultdict
 from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core.cache import invalidate, tag
 from fennec_api.etl.postgres import upsert
 from fennec_api.sdmx_v21.parser import (
     DataflowType,
@@ -33,6 +34,15 @@ from fennec_api.sdmx_v21.models import (
 from fennec_api.sdmx_v21.etl.transform import flatten_categories, extract_labels
 
 
+async def _invalidate_artefacts(resource: str, artefacts: Sequence[Any]) -> None:
+    await invalidate(
+        [
+            resource,
+            *(tag(resource, a.agency_id, a.id, a.version) for a in artefacts),
+        ]
+    )
+
+
 async def load_dataflows(
     session: AsyncSession, dataflows: Sequence[DataflowType]
 ) -> None:
@@ -58,6 +68,7 @@ async def load_dataflows(
     )
 
     await upsert(session, model=Dataflow, records=records)
+    await _invalidate_artefacts("dataflow", dataflows)
 
 
 async def load_data_structures(
@@ -186,6 +197,7 @@ async def load_data_structures(
         and data_structure.data_structure_components.measure_list.primary_measure
     )
     await upsert(session, model=PrimaryMeasure, records=measure_records)
+    await _invalidate_artefacts("datastructure", data_structures)
 
 
 async def load_category_schemes(
@@ -256,6 +268,7 @@ async def load_codelists(
         for c in cl.code
     )
     await upsert(session, model=Code, records=code_records)
+    await _invalidate_artefacts("codelist", codelists)
 
 
 async def load_concept_schemes(
@@ -286,6 +299,7 @@ async def load_concept_schemes(
         for c in cs.concept
     )
     await upsert(session, model=Concept, records=concept_records)
+    await _invalidate_artefacts("conceptscheme", concept_schemes)
 
 
 async def load_categorisations(
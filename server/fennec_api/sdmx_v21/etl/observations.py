@@ -0,0 +1,370 @@
+from typing import Any, Collection, Iterable
+from datetime import datetime
+from itertools import batched
+import logging
+import math
+import orjson
+import sentry_sdk
+from sqlalchemy import (
+    column,
+    delete,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+    update,
+    Boolean,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core.config import settings
+from fennec_api.etl.batch import DataBatch, MISSING
+from fennec_api.etl.metrics import (
+    current_provider,
+    SKIPPED_RECORDS,
+    stage,
+    TRANSFORM_DURATION,
+    TRANSFORMED_RECORDS,
+    UPSERT_DURATION,
+    UPSERTED_ROWS,
+)
+from fennec_api.etl.periods import PeriodParser
+from fennec_api.etl.postgres import copy_records
+from fennec_api.sdmx_v21.availability import extend_availability
+from fennec_api.sdmx_v21.etl.rollups import refresh_rollups
+from fennec_api.sdmx_v21.keys import (
+    extend_key_dictionary,
+    KeyDictionary,
+    load_key_dictionary,
+)
+from fennec_api.sdmx_v21.models import (
+    Dataflow,
+    DataStructure,
+    Observation,
+    ObservationPartition,
+    Rollup,
+    Series,
+)
+
+OBSERVATION_COLUMNS = (
+    "partition_id",
+    "series_id",
+    "period_start",
+    "time_period",
+    "obs_value",
+    "attributes",
+)
+STAGING_TABLE = f"{Observation.__tablename__}_staging"
+
+logger = logging.getLogger(__name__)
+
+
+def partition_table(partition_id: int) -> str:
+    return f"{Observation.__tablename__}_p{partition_id}"
+
+
+def period_table(partition_id: int, start_year: int) -> str:
+    return f"{partition_table(partition_id)}_{start_year}"
+
+
+def _dataflow_clause(dataflow: Dataflow) -> Any:
+    return (
+        (ObservationPartition.dataflow_id == dataflow.id)
+        & (ObservationPartition.dataflow_agency_id == dataflow.agency_id)
+        & (ObservationPartition.dataflow_version == dataflow.version)
+    )
+
+
+async def get_partition(session: AsyncSession, dataflow: Dataflow) -> int | None:
+    return (
+        await session.execute(
+            select(ObservationPartition.id).where(_dataflow_clause(dataflow))
+        )
+    ).scalar_one_or_none()
+
+
+async def create_partition(session: AsyncSession, dataflow: Dataflow) -> int:
+    await session.execute(
+        insert(ObservationPartition)
+        .values(
+            dataflow_id=dataflow.id,
+            dataflow_agency_id=dataflow.agency_id,
+            dataflow_version=dataflow.version,
+            series_count=0,
+        )
+        .on_conflict_do_nothing()
+    )
+    partition_id = await get_partition(session, dataflow)
+    assert partition_id is not None
+    await session.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {partition_table(partition_id)} "
+            f"PARTITION OF {Observation.__tablename__} "
+            f"FOR VALUES IN ({partition_id}) PARTITION BY RANGE (period_start)"
+        )
+    )
+    await session.commit()
+    return partition_id
+
+
+async def create_period_partition(
+    session: AsyncSession, partition_id: int, year: int
+) -> int:
+    span = settings.OBSERVATION_PARTITION_YEARS
+    start = year - year % span
+    await session.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {period_table(partition_id, start)} "
+            f"PARTITION OF {partition_table(partition_id)} "
+            f"FOR VALUES FROM ('{start:04d}-01-01') TO ('{start + span:04d}-01-01')"
+        )
+    )
+    return start
+
+
+async def drop_partition(session: AsyncSession, dataflow: Dataflow) -> bool:
+    partition_id = await get_partition(session, dataflow)
+    if partition_id is None:
+        return False
+    await session.execute(text(f"DROP TABLE IF EXISTS {partition_table(partition_id)}"))
+    await session.execute(delete(Rollup).where(Rollup.partition_id == partition_id))
+    await session.execute(
+        delete(ObservationPartition).where(ObservationPartition.id == partition_id)
+    )
+    await session.commit()
+    return True
+
+
+async def _upsert_series(
+    session: AsyncSession,
+    records: list[dict[str, Any]],
+    inserted: list[tuple[int, ...]],
+    chunk_size: int = 1000,
+) -> dict[tuple[int, ...], int]:
+    ids: dict[tuple[int, ...], int] = {}
+    for chunk in batched(records, n=chunk_size):
+        insert_statement = insert(Series).values(list(chunk))
+        statement = insert_statement.on_conflict_do_update(
+            index_elements=[Series.partition_id, Series.key],
+            set_={
+                "packed_key": insert_statement.excluded.packed_key,
+                "attributes": insert_statement.excluded.attributes,
+                "rollup_from": func.least(
+                    Series.rollup_from, insert_statement.excluded.rollup_from
+                ),
+            },
+        ).returning(Series.key, Series.id, literal_column("xmax = 0", Boolean))
+        for key, series_id, is_new in await session.execute(statement):
+            ids[tuple(key)] = series_id
+            if is_new:
+                inserted.append(tuple(key))
+    return ids
+
+
+async def _repack_series(
+    session: AsyncSession, partition_id: int, key_dictionary: KeyDictionary
+) -> None:
+    widths = list(key_dictionary.widths)
+    stored = (
+        await session.execute(
+            select(ObservationPartition.key_widths).where(
+                ObservationPartition.id == partition_id
+            )
+        )
+    ).scalar_one()
+    if stored == widths:
+        return
+
+    series = await session.execute(
+        select(Series.id, Series.key).where(Series.partition_id == partition_id)
+    )
+    records = [
+        {
+            "id": series_id,
+            "packed_key": key_dictionary.pack(key) if key_dictionary.packable else None,
+        }
+        for series_id, key in series
+    ]
+    for chunk in batched(records, n=1000):
+        await session.execute(update(Series), list(chunk))
+    await session.execute(
+        update(ObservationPartition)
+        .where(ObservationPartition.id == partition_id)
+        .values(key_widths=widths)
+    )
+    await session.commit()
+
+
+async def _copy_observations(
+    session: AsyncSession, records: list[tuple[Any, ...]]
+) -> None:
+    await session.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} "
+            f"(LIKE {Observation.__tablename__})"
+        )
+    )
+    await copy_records(session, STAGING_TABLE, records, OBSERVATION_COLUMNS)
+
+    staging = table(STAGING_TABLE, *(column(c) for c in OBSERVATION_COLUMNS))
+    insert_statement = insert(Observation).from_select(
+        OBSERVATION_COLUMNS, select(staging).order_by(staging.c.period_start)
+    )
+    await session.execute(
+        insert_statement.on_conflict_do_update(
+            index_elements=[
+                Observation.partition_id,
+                Observation.series_id,
+                Observation.period_start,
+            ],
+            set_={
+                c: insert_statement.excluded[c]
+                for c in ("time_period", "obs_value", "attributes")
+            },
+        )
+    )
+    await session.execute(text(f"DROP TABLE {STAGING_TABLE}"))
+
+
+def _encode_keys(
+    batch: DataBatch, key_dictionary: KeyDictionary
+) -> list[tuple[int, ...]]:
+    columns = []
+    for position, name in enumerate(key_dictionary.dimensions):
+        translation = [
+            *key_dictionary.translate(position, batch.dictionaries[name]),
+            MISSING,
+        ]
+        columns.append([translation[code] for code in batch.columns[name]])
+    return list(zip(*columns))
+
+
+def _attributes(
+    names: Collection[str], decoded: dict[str, list[str | None]], i: int
+) -> dict[str, str] | None:
+    values = {name: decoded[name][i] for name in names}
+    return {k: v for k, v in values.items() if v is not None} or None
+
+
+async def load_observations(
+    session: AsyncSession,
+    dataflow: Dataflow,
+    batches: Iterable[DataBatch],
+    *,
+    series_attributes: Collection[str] = (),
+) -> int:
+    data_structure = await session.get(
+        DataStructure,
+        (
+            dataflow.structure_id,
+            dataflow.structure_agency_id,
+            dataflow.structure_version,
+        ),
+    )
+    if data_structure is None:
+        raise ValueError(f"Dataflow {dataflow.id} has no data structure")
+    key_dictionary = await load_key_dictionary(session, data_structure)
+    partition_id = await create_partition(session, dataflow)
+    await _repack_series(session, partition_id, key_dictionary)
+
+    labels = dict(provider=current_provider.get(), artefact=Observation.__tablename__)
+    span = settings.OBSERVATION_PARTITION_YEARS
+    period_partitions: set[int] = set()
+    parser = PeriodParser()
+    loaded = skipped = 0
+
+    with sentry_sdk.start_span(op="etl.copy", description=Observation.__tablename__):
+        for batch in batches:
+            extended = await extend_key_dictionary(
+                session,
+                data_structure,
+                key_dictionary,
+                [batch.dictionaries[name].values for name in key_dictionary.dimensions],
+            )
+            if extended is not key_dictionary:
+                key_dictionary = extended
+                await _repack_series(session, partition_id, key_dictionary)
+
+            with stage("etl.transform", TRANSFORM_DURATION, **labels):
+                keys = _encode_keys(batch, key_dictionary)
+                observation_attributes = [
+                    name for name in batch.attributes if name not in series_attributes
+                ]
+                decoded = {name: batch.decode(name) for name in batch.attributes}
+                starts = (
+                    parser.parse(batch.time_period)
+                    .start.astype("datetime64[us]")
+                    .tolist()
+                )
+
+                series: dict[tuple[int, ...], dict[str, Any]] = {}
+                rows: dict[tuple[tuple[int, ...], datetime], int] = {}
+                for i, (key, start) in enumerate(zip(keys, starts)):
+                    if start is None or MISSING in key:
+                        skipped += 1
+                        continue
+                    if key not in series:
+                        series[key] = dict(
+                            partition_id=partition_id,
+                            key=list(key),
+                            packed_key=key_dictionary.pack(key)
+                            if key_dictionary.packable
+                            else None,
+                            attributes=_attributes(series_attributes, decoded, i),
+                            rollup_from=start,
+                        )
+                    elif start < series[key]["rollup_from"]:
+                        series[key]["rollup_from"] = start
+                    rows[key, start] = i
+            TRANSFORMED_RECORDS.inc(len(rows), **labels)
+            if not rows:
+                continue
+
+            with stage("db.upsert", UPSERT_DURATION, **labels):
+                inserted: list[tuple[int, ...]] = []
+                series_ids = await _upsert_series(
+                    session, list(series.values()), inserted
+                )
+                for year in {start.year // span * span for _, start in rows}:
+                    if year not in period_partitions:
+                        period_partitions.add(
+                            await create_period_partition(session, partition_id, year)
+                        )
+
+                records = []
+                for (key, start), i in sorted(rows.items(), key=lambda r: r[0][1]):
+                    value = batch.obs_value[i]
+                    attributes = _attributes(observation_attributes, decoded, i)
+                    records.append(
+                        (
+                            partition_id,
+                            series_ids[key],
+                            start,
+                            batch.time_period[i],
+                            None if math.isnan(value) else value,
+                            orjson.dumps(attributes).decode() if attributes else None,
+                        )
+                    )
+                await _copy_observations(session, records)
+                # New series only show up once, so their availability is
+                # committed together with them
+                await extend_availability(session, partition_id, inserted)
+                await session.commit()
+            UPSERTED_ROWS.inc(len(records), **labels)
+            loaded += len(records)
+
+    if skipped:
+        SKIPPED_RECORDS.inc(skipped, **labels)
+        logger.warning(
+            "Skipped %d observations of dataflow %s with an invalid key or period",
+            skipped,
+            dataflow.id,
+        )
+        if not loaded:
+            raise ValueError(
+                f"All {skipped} observations of dataflow {dataflow.id} were skipped"
+            )
+
+    await refresh_rollups(session, partition_id)
+    return loaded
@@ -0,0 +1,173 @@
+from typing import Any, Sequence
+from enum import Enum
+from itertools import batched, repeat
+import numpy as np
+import sentry_sdk
+from sqlalchemy import delete, func, Row, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.etl.metrics import (
+    current_provider,
+    stage,
+    TRANSFORM_DURATION,
+    TRANSFORMED_RECORDS,
+    UPSERT_DURATION,
+    UPSERTED_ROWS,
+)
+from fennec_api.etl.periods import PeriodParser
+from fennec_api.etl.postgres import copy_records
+from fennec_api.etl.rollups import aggregate, period_labels
+from fennec_api.sdmx_v21.models import Observation, Rollup, Series
+
+
+class RollupFrequency(str, Enum):
+    ANNUAL = "A"
+    HALF_YEARLY = "S"
+    QUARTERLY = "Q"
+    MONTHLY = "M"
+
+
+class Aggregation(str, Enum):
+    SUM = "sum"
+    MEAN = "mean"
+    FIRST = "first"
+    LAST = "last"
+
+
+ROLLUP_COLUMNS = (
+    "partition_id",
+    "series_id",
+    "frequency",
+    "period_start",
+    "time_period",
+    "observations",
+    "obs_sum",
+    "obs_first",
+    "obs_last",
+)
+
+
+def _rollup_records(
+    partition_id: int, parser: PeriodParser, rows: Sequence[Row[Any]]
+) -> list[tuple[Any, ...]]:
+    series = np.fromiter(
+        (row.series_id for row in rows), dtype=np.int64, count=len(rows)
+    )
+    values = np.fromiter(
+        (row.obs_value for row in rows), dtype=np.float64, count=len(rows)
+    )
+    periods = parser.parse([row.time_period for row in rows])
+    records: list[tuple[Any, ...]] = []
+    for frequency in RollupFrequency:
+        aggregates = aggregate(
+            series, periods.start, periods.end, values, frequency.value
+        )
+        records.extend(
+            zip(
+                repeat(partition_id),
+                aggregates.series.tolist(),
+                repeat(frequency.value),
+                aggregates.start.astype("datetime64[us]").tolist(),
+                period_labels(aggregates.start, frequency.value),
+                aggregates.observations.tolist(),
+                aggregates.sum.tolist(),
+                aggregates.first.tolist(),
+                aggregates.last.tolist(),
+            )
+        )
+    return records
+
+
+async def refresh_rollups(
+    session: AsyncSession,
+    partition_id: int,
+    *,
+    chunk_size: int = 1000,
+    batch_size: int = 100_000,
+) -> int:
+    series_ids = (
+        await session.scalars(
+            select(Series.id)
+            .where(Series.partition_id == partition_id, Series.rollup_from.is_not(None))
+            .order_by(Series.id)
+        )
+    ).all()
+
+    labels = dict(provider=current_provider.get(), artefact=Rollup.__tablename__)
+    parser = PeriodParser()
+    refreshed = 0
+
+    async def write(rows: Sequence[Row[Any]]) -> None:
+        with stage("etl.transform", TRANSFORM_DURATION, **labels):
+            records = _rollup_records(partition_id, parser, rows)
+        TRANSFORMED_RECORDS.inc(len(records), **labels)
+        with stage("db.upsert", UPSERT_DURATION, **labels):
+            await copy_records(session, Rollup.__tablename__, records, ROLLUP_COLUMNS)
+        UPSERTED_ROWS.inc(len(records), **labels)
+
+    with sentry_sdk.start_span(op="etl.rollup", description=Rollup.__tablename__):
+        for chunk in batched(series_ids, n=chunk_size):
+            dirty = Series.id.in_(chunk) & Series.rollup_from.is_not(None)
+            since = func.date_trunc("year", Series.rollup_from)
+            await session.execute(select(Series.id).where(dirty).with_for_update())
+            await session.execute(
+                delete(Rollup)
+                .where(
+                    Rollup.partition_id == partition_id,
+                    Rollup.series_id == Series.id,
+                    dirty,
+                    Rollup.period_start >= since,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+            # Observations are paged in series order with a keyset and
+            # aggregated once a series is complete, so memory is bounded by
+            # batch_size rows plus the series still being read.
+            query = (
+                select(
+                    Observation.series_id,
+                    Observation.period_start,
+                    Observation.time_period,
+                    Observation.obs_value,
+                )
+                .join(Series, Series.id == Observation.series_id)
+                .where(
+                    Observation.partition_id == partition_id,
+                    dirty,
+                    Observation.period_start >= since,
+                )
+                .order_by(Observation.series_id, Observation.period_start)
+                .limit(batch_size)
+            )
+            pending: list[Row[Any]] = []
+            rows = (await session.execute(query)).all()
+            while rows:
+                pending.extend(rows)
+                split = len(pending)
+                while split and pending[split - 1].series_id == pending[-1].series_id:
+                    split -= 1
+                if split:
+                    await write(pending[:split])
+                    pending = pending[split:]
+                last = rows[-1]
+                rows = (
+                    await session.execute(
+                        query.where(
+                            tuple_(Observation.series_id, Observation.period_start)
+                            > tuple_(last.series_id, last.period_start)
+                        )
+                    )
+                ).all()
+            if pending:
+                await write(pending)
+
+            await session.execute(
+                update(Series)
+                .where(dirty)
+                .values(rollup_from=None)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            refreshed += len(chunk)
+
+    return refreshed
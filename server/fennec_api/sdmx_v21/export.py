@@ -0,0 +1,141 @@
+from typing import Any, AsyncIterator, Iterator, Sequence
+from enum import Enum
+import pyarrow as pa
+import pyarrow.parquet as pq
+import orjson
+from sqlalchemy import Row
+from fennec_api.sdmx_v21.keys import KeyDictionary
+
+
+class DataFormat(str, Enum):
+    ARROW = "arrow"
+    PARQUET = "parquet"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    DataFormat.ARROW: "application/vnd.apache.arrow.stream",
+    DataFormat.PARQUET: "application/vnd.apache.parquet",
+    DataFormat.NDJSON: "application/x-ndjson",
+}
+
+
+class ChunkSink:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ObservationEncoder:
+    def __init__(
+        self,
+        key_dictionary: KeyDictionary,
+        *,
+        time_dimension: str,
+        primary_measure: str,
+        attributes: tuple[str, ...],
+    ) -> None:
+        self.key_dictionary = key_dictionary
+        self.time_dimension = time_dimension
+        self.primary_measure = primary_measure
+        self.attributes = attributes
+        self.dictionaries = [
+            pa.array(
+                [values.get(i) for i in range(max(values, default=-1) + 1)],
+                pa.string(),
+            )
+            for values in key_dictionary.values
+        ]
+        self.schema = pa.schema(
+            [
+                *(
+                    pa.field(name, pa.dictionary(pa.int32(), pa.string()))
+                    for name in key_dictionary.dimensions
+                ),
+                pa.field(time_dimension, pa.string()),
+                pa.field(primary_measure, pa.float64()),
+                *(pa.field(name, pa.string()) for name in attributes),
+            ]
+        )
+
+    def _attributes(self, row: Row[Any]) -> dict[str, str]:
+        return {**(row.series_attributes or {}), **(row.attributes or {})}
+
+    def record_batch(self, rows: Sequence[Row[Any]]) -> pa.RecordBatch:
+        keys = [row.key for row in rows]
+        attributes = [self._attributes(row) for row in rows]
+        return pa.RecordBatch.from_arrays(
+            [
+                *(
+                    pa.DictionaryArray.from_arrays(
+                        pa.array([key[position] for key in keys], pa.int32()),
+                        dictionary,
+                    )
+                    for position, dictionary in enumerate(self.dictionaries)
+                ),
+                pa.array([row.time_period for row in rows], pa.string()),
+                pa.array([row.obs_value for row in rows], pa.float64()),
+                *(
+                    pa.array([a.get(name) for a in attributes], pa.string())
+                    for name in self.attributes
+                ),
+            ],
+            schema=self.schema,
+        )
+
+    def records(self, rows: Sequence[Row[Any]]) -> Iterator[dict[str, Any]]:
+        values = self.key_dictionary.values
+        dimensions = self.key_dictionary.dimensions
+        for row in rows:
+            record: dict[str, Any] = {
+                name: codes[i] for name, codes, i in zip(dimensions, values, row.key)
+            }
+            record[self.time_dimension] = row.time_period
+            record[self.primary_measure] = row.obs_value
+            attributes = self._attributes(row)
+            for name in self.attributes:
+                record[name] = attributes.get(name)
+            yield record
+
+    async def encode(
+        self, batches: AsyncIterator[Sequence[Row[Any]]], data_format: DataFormat
+    ) -> AsyncIterator[bytes]:
+        if data_format == DataFormat.NDJSON:
+            async for rows in batches:
+                yield b"".join(
+                    orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+                    for record in self.records(rows)
+                )
+            return
+
+        sink = ChunkSink()
+        writer: pa.ipc.RecordBatchStreamWriter | pq.ParquetWriter = (
+            pa.ipc.new_stream(sink, self.schema)
+            if data_format == DataFormat.ARROW
+            else pq.ParquetWriter(sink, self.schema)
+        )
+        async for rows in batches:
+            writer.write_batch(self.record_batch(rows))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
@@ -0,0 +1,277 @@
+from typing import Any, Iterable, Sequence
+from dataclasses import dataclass, field
+from itertools import batched
+from sqlalchemy import and_, false, literal, select, true, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from fennec_api.etl.batch import Dictionary, MISSING
+from fennec_api.sdmx_v21.models import Code, DataStructure, DimensionCode, Series
+
+PACKED_KEY_BITS = 63
+
+
+@dataclass(frozen=True)
+class KeyMatcher:
+    positions: tuple[tuple[int, frozenset[int]], ...]
+    shifts: tuple[int, ...]
+    widths: tuple[int, ...]
+    packable: bool
+    mask: int = field(init=False)
+    value: int = field(init=False)
+    empty: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        mask = value = 0
+        for position, allowed in self.positions:
+            if len(allowed) == 1:
+                shift = self.shifts[position]
+                mask |= ((1 << self.widths[position]) - 1) << shift
+                value |= next(iter(allowed)) << shift
+        object.__setattr__(self, "mask", mask)
+        object.__setattr__(self, "value", value)
+        object.__setattr__(
+            self, "empty", any(not allowed for _, allowed in self.positions)
+        )
+
+    @property
+    def _sets(self) -> list[tuple[int, frozenset[int]]]:
+        return [(p, allowed) for p, allowed in self.positions if len(allowed) > 1]
+
+    def matches(self, key: Sequence[int]) -> bool:
+        return all(key[position] in allowed for position, allowed in self.positions)
+
+    def matches_packed(self, packed_key: int) -> bool:
+        if self.empty or packed_key & self.mask != self.value:
+            return False
+        return all(
+            (packed_key >> self.shifts[p]) & ((1 << self.widths[p]) - 1) in allowed
+            for p, allowed in self._sets
+        )
+
+    def clause(self) -> ColumnElement[bool]:
+        if self.empty:
+            return false()
+        if not self.positions:
+            return true()
+        if not self.packable:
+            return and_(
+                *(
+                    Series.key[position + 1].in_(sorted(allowed))
+                    for position, allowed in self.positions
+                )
+            )
+        packed_key: Any = Series.packed_key
+        clauses = [packed_key.op("&")(self.mask) == self.value] if self.mask else []
+        clauses.extend(
+            packed_key.op(">>")(literal(self.shifts[p], Integer))
+            .op("&")((1 << self.widths[p]) - 1)
+            .in_(sorted(allowed))
+            for p, allowed in self._sets
+        )
+        return and_(*clauses)
+
+
+@dataclass
+class KeyDictionary:
+    dimensions: tuple[str, ...]
+    codes: tuple[dict[str, int], ...]
+    widths: tuple[int, ...] = field(init=False)
+    shifts: tuple[int, ...] = field(init=False)
+    values: tuple[dict[int, str], ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.widths = tuple(
+            max(1, max(codes.values(), default=0).bit_length()) for codes in self.codes
+        )
+        shifts = []
+        shift = sum(self.widths)
+        for width in self.widths:
+            shift -= width
+            shifts.append(shift)
+        self.shifts = tuple(shifts)
+        self.values = tuple(
+            {i: code for code, i in codes.items()} for codes in self.codes
+        )
+
+    @property
+    def packable(self) -> bool:
+        return sum(self.widths) <= PACKED_KEY_BITS
+
+    def translate(self, position: int, dictionary: Dictionary) -> list[int]:
+        codes = self.codes[position]
+        return [codes.get(value, MISSING) for value in dictionary.values]
+
+    def encode(self, key: str) -> tuple[int, ...] | None:
+        parts = key.split(".")
+        if len(parts) != len(self.dimensions):
+            raise ValueError(
+                f"Key {key} has {len(parts)} dimensions, "
+                f"expected {len(self.dimensions)}"
+            )
+        encoded = tuple(
+            codes.get(part, MISSING) for codes, part in zip(self.codes, parts)
+        )
+        return None if MISSING in encoded else encoded
+
+    def decode(self, key: Sequence[int]) -> str:
+        return ".".join(values[i] for values, i in zip(self.values, key))
+
+    def pack(self, key: Sequence[int]) -> int:
+        if not self.packable:
+            raise ValueError(
+                f"Keys of {sum(self.widths)} bits do not fit in a packed key"
+            )
+        packed = 0
+        for width, i in zip(self.widths, key):
+            packed = (packed << width) | i
+        return packed
+
+    def unpack(self, packed_key: int) -> tuple[int, ...]:
+        return tuple(
+            (packed_key >> shift) & ((1 << width) - 1)
+            for shift, width in zip(self.shifts, self.widths)
+        )
+
+    def matcher(self, pattern: str) -> KeyMatcher:
+        positions: list[tuple[int, frozenset[int]]] = []
+        if pattern not in ("", "all"):
+            parts = pattern.split(".")
+            if len(parts) != len(self.dimensions):
+                raise ValueError(
+                    f"Key {pattern} has {len(parts)} dimensions, "
+                    f"expected {len(self.dimensions)}"
+                )
+            for position, (codes, part) in enumerate(zip(self.codes, parts)):
+                if part:
+                    positions.append(
+                        (
+                            position,
+                            frozenset(
+                                codes[code] for code in part.split("+") if code in codes
+                            ),
+                        )
+                    )
+        return KeyMatcher(
+            positions=tuple(positions),
+            shifts=self.shifts,
+            widths=self.widths,
+            packable=self.packable,
+        )
+
+    def pattern(self, matcher: KeyMatcher) -> str:
+        if matcher.empty:
+            raise ValueError("An empty key matcher has no key pattern")
+        if not matcher.positions:
+            return "all"
+        parts = [""] * len(self.dimensions)
+        for position, allowed in matcher.positions:
+            values = self.values[position]
+            parts[position] = "+".join(sorted(values[i] for i in allowed))
+        return ".".join(parts)
+
+
+async def read_key_dictionary(
+    session: AsyncSession, data_structure: DataStructure
+) -> KeyDictionary:
+    dimensions = sorted(data_structure.dimensions, key=lambda d: d.position)
+    codes: dict[str, dict[str, int]] = {d.id: {} for d in dimensions}
+    for dimension_id, code_id, ordinal in await session.execute(
+        select(
+            DimensionCode.dimension_id, DimensionCode.code_id, DimensionCode.ordinal
+        ).where(
+            DimensionCode.data_structure_id == data_structure.id,
+            DimensionCode.data_structure_agency_id == data_structure.agency_id,
+            DimensionCode.data_structure_version == data_structure.version,
+        )
+    ):
+        codes[dimension_id][code_id] = ordinal
+    return KeyDictionary(
+        dimensions=tuple(d.id for d in dimensions),
+        codes=tuple(codes[d.id] for d in dimensions),
+    )
+
+
+def _dimension_code(
+    data_structure: DataStructure, dimension_id: str, code_id: str, ordinal: int
+) -> dict[str, Any]:
+    return dict(
+        dimension_id=dimension_id,
+        data_structure_id=data_structure.id,
+        data_structure_agency_id=data_structure.agency_id,
+        data_structure_version=data_structure.version,
+        code_id=code_id,
+        ordinal=ordinal,
+    )
+
+
+async def _insert_dimension_codes(
+    session: AsyncSession, records: list[dict[str, Any]]
+) -> None:
+    for chunk in batched(records, n=1000):
+        await session.execute(
+            insert(DimensionCode).values(list(chunk)).on_conflict_do_nothing()
+        )
+    await session.commit()
+
+
+async def load_key_dictionary(
+    session: AsyncSession, data_structure: DataStructure
+) -> KeyDictionary:
+    key_dictionary = await read_key_dictionary(session, data_structure)
+    dimensions = sorted(data_structure.dimensions, key=lambda d: d.position)
+
+    records = []
+    for dimension, known in zip(dimensions, key_dictionary.codes):
+        if dimension.codelist_id is None:
+            continue
+        ordinal = max(known.values(), default=-1)
+        for code_id in await session.scalars(
+            select(Code.id)
+            .where(
+                Code.codelist_id == dimension.codelist_id,
+                Code.codelist_agency_id == dimension.codelist_agency_id,
+                Code.codelist_version == dimension.codelist_version,
+            )
+            .order_by(Code.id)
+        ):
+            if code_id not in known:
+                ordinal += 1
+                known[code_id] = ordinal
+                records.append(
+                    _dimension_code(data_structure, dimension.id, code_id, ordinal)
+                )
+    if not records:
+        return key_dictionary
+
+    await _insert_dimension_codes(session, records)
+    return await read_key_dictionary(session, data_structure)
+
+
+async def extend_key_dictionary(
+    session: AsyncSession,
+    data_structure: DataStructure,
+    key_dictionary: KeyDictionary,
+    values: Sequence[Iterable[str]],
+    *,
+    attempts: int = 3,
+) -> KeyDictionary:
+    for _ in range(attempts):
+        records = []
+        for dimension_id, known, dimension_values in zip(
+            key_dictionary.dimensions, key_dictionary.codes, values
+        ):
+            ordinal = max(known.values(), default=-1)
+            for code_id in dict.fromkeys(dimension_values):
+                if code_id not in known:
+                    ordinal += 1
+                    records.append(
+                        _dimension_code(data_structure, dimension_id, code_id, ordinal)
+                    )
+        if not records:
+            return key_dictionary
+        await _insert_dimension_codes(session, records)
+        key_dictionary = await read_key_dictionary(session, data_structure)
+    raise RuntimeError(
+        f"Could not assign key ordinals for data structure {data_structure.id}"
+    )
@@ -1,5 +1,20 @@
 from datetime import datetime
-from sqlalchemy import String, DateTime, Integer, func, Boolean, ForeignKeyConstraint
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    BigInteger,
+    SmallInteger,
+    Float,
+    func,
+    Boolean,
+    LargeBinary,
+    ForeignKeyConstraint,
+    UniqueConstraint,
+    Index,
+    Computed,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from fennec_api.core.database import Base
 
@@ -18,6 +33,18 @@ class Provider(Base):
     bulk_download: Mapped[bool] = mapped_column(Boolean, nullable=False)
     skip_categories: Mapped[bool] = mapped_column(Boolean, nullable=False)
     process_all_agencies: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    harvest_interval: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="24"
+    )
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_collected_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_attempted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    failure_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    wire_format: Mapped[str] = mapped_column(
+        String, nullable=False, server_default="xml"
+    )
 
 
 class IdentifiableMixin:
@@ -32,6 +59,39 @@ class LabelizableMixin:
     description: Mapped[str] = mapped_column(String, nullable=True)
 
 
+SEARCH_CONFIGS = ("simple", "english")
+
+
+class SearchableMixin:
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            " || ".join(
+                [
+                    "setweight(to_tsvector('simple', id), 'A')",
+                    *(
+                        f"setweight(to_tsvector('{c}', coalesce({column}, '')), '{w}')"
+                        for column, w in (("name", "B"), ("description", "C"))
+                        for c in SEARCH_CONFIGS
+                    ),
+                ]
+            ),
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+
+# The trigram indexes backing the id/name ILIKE search need pg_trgm and are
+# managed by the migrations only (see migrations/env.py).
+def _search_indexes(table_name: str) -> tuple[Index, ...]:
+    return (
+        Index(
+            f"ix_{table_name}_search_vector", "search_vector", postgresql_using="gin"
+        ),
+    )
+
+
 class DataStructure(Base, IdentifiableMixin, LabelizableMixin):
     __tablename__ = "sdmxv21_datastructure"
     time_dimensions: Mapped[list["TimeDimension"]] = relationship(
@@ -140,7 +200,7 @@ class PrimaryMeasure(Base, DataStructureComponent):
     )
 
 
-class Dataflow(Base, IdentifiableMixin, LabelizableMixin):
+class Dataflow(Base, IdentifiableMixin, LabelizableMixin, SearchableMixin):
     __tablename__ = "sdmxv21_dataflow"
     structure_id: Mapped[str | None] = mapped_column(String, nullable=True)
     structure_agency_id: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -148,13 +208,15 @@ class Dataflow(Base, IdentifiableMixin, LabelizableMixin):
     structure_package: Mapped[str | None] = mapped_column(String, nullable=True)
     structure_class: Mapped[str | None] = mapped_column(String, nullable=True)
 
+    __table_args__ = _search_indexes("sdmxv21_dataflow")
+
 
 class CategoryScheme(Base, IdentifiableMixin, LabelizableMixin):
     __tablename__ = "sdmxv21_categoryscheme"
 
     categories: Mapped[list["Category"]] = relationship(
         back_populates="category_scheme",
-        lazy="selectin",
+        lazy="raise",
         primaryjoin="""and_(
             CategoryScheme.id == Category.category_scheme_id,
             CategoryScheme.agency_id == Category.category_scheme_agency_id,
@@ -211,12 +273,10 @@ class Category(Base, LabelizableMixin):
 class Codelist(Base, IdentifiableMixin, LabelizableMixin):
     __tablename__ = "sdmxv21_codelist"
 
-    codes: Mapped[list["Code"]] = relationship(
-        back_populates="codelist", lazy="selectin"
-    )
+    codes: Mapped[list["Code"]] = relationship(back_populates="codelist", lazy="raise")
 
 
-class Code(Base, LabelizableMixin):
+class Code(Base, LabelizableMixin, SearchableMixin):
     __tablename__ = "sdmxv21_code"
     id: Mapped[str] = mapped_column(String, nullable=False, primary_key=True)
     urn: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -234,6 +294,7 @@ class Code(Base, LabelizableMixin):
             [codelist_id, codelist_agency_id, codelist_version],
             [Codelist.id, Codelist.agency_id, Codelist.version],
         ),
+        *_search_indexes("sdmxv21_code"),
     )
 
 
@@ -241,11 +302,11 @@ class ConceptScheme(Base, IdentifiableMixin, LabelizableMixin):
     __tablename__ = "sdmxv21_conceptscheme"
 
     concepts: Mapped[list["Concept"]] = relationship(
-        back_populates="concept_scheme", lazy="selectin"
+        back_populates="concept_scheme", lazy="raise"
     )
 
 
-class Concept(Base, LabelizableMixin):
+class Concept(Base, LabelizableMixin, SearchableMixin):
     __tablename__ = "sdmxv21_concept"
     id: Mapped[str] = mapped_column(String, nullable=False, primary_key=True)
     urn: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -265,6 +326,7 @@ class Concept(Base, LabelizableMixin):
             [concept_scheme_id, concept_scheme_agency_id, concept_scheme_version],
             [ConceptScheme.id, ConceptScheme.agency_id, ConceptScheme.version],
         ),
+        *_search_indexes("sdmxv21_concept"),
     )
 
 
@@ -281,3 +343,178 @@ class Categorisation(Base, IdentifiableMixin, LabelizableMixin):
     target_agency_id: Mapped[str] = mapped_column(String, nullable=False)
     target_package: Mapped[str] = mapped_column(String, nullable=False)
     target_class: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class DimensionCode(Base):
+    __tablename__ = "sdmxv21_dimension_code"
+    dimension_id: Mapped[str] = mapped_column(String, nullable=False, primary_key=True)
+    data_structure_id: Mapped[str] = mapped_column(
+        String, nullable=False, primary_key=True
+    )
+    data_structure_agency_id: Mapped[str] = mapped_column(
+        String, nullable=False, primary_key=True
+    )
+    data_structure_version: Mapped[str] = mapped_column(
+        String, nullable=False, primary_key=True
+    )
+    code_id: Mapped[str] = mapped_column(String, nullable=False, primary_key=True)
+    ordinal: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [
+                dimension_id,
+                data_structure_id,
+                data_structure_agency_id,
+                data_structure_version,
+            ],
+            [
+                Dimension.id,
+                Dimension.data_structure_id,
+                Dimension.data_structure_agency_id,
+                Dimension.data_structure_version,
+            ],
+        ),
+        UniqueConstraint(
+            dimension_id,
+            data_structure_id,
+            data_structure_agency_id,
+            data_structure_version,
+            ordinal,
+        ),
+    )
+
+
+class ContentConstraint(Base, IdentifiableMixin, LabelizableMixin):
+    __tablename__ = "sdmxv21_contentconstraint"
+    type: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class CubeRegion(Base):
+    __tablename__ = "sdmxv21_cube_region"
+    constraint_id: Mapped[str] = mapped_column(String, primary_key=True)
+    constraint_agency_id: Mapped[str] = mapped_column(String, primary_key=True)
+    constraint_version: Mapped[str] = mapped_column(String, primary_key=True)
+    dataflow_id: Mapped[str] = mapped_column(String, primary_key=True)
+    dataflow_agency_id: Mapped[str] = mapped_column(String, primary_key=True)
+    dataflow_version: Mapped[str] = mapped_column(String, primary_key=True)
+    region: Mapped[int] = mapped_column(Integer, primary_key=True)
+    dimension_id: Mapped[str] = mapped_column(String, primary_key=True)
+    include: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    bitmap: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [constraint_id, constraint_agency_id, constraint_version],
+            [
+                ContentConstraint.id,
+                ContentConstraint.agency_id,
+                ContentConstraint.version,
+            ],
+            ondelete="CASCADE",
+        ),
+        ForeignKeyConstraint(
+            [dataflow_id, dataflow_agency_id, dataflow_version],
+            [Dataflow.id, Dataflow.agency_id, Dataflow.version],
+        ),
+        Index(
+            "ix_sdmxv21_cube_region_dataflow",
+            dataflow_id,
+            dataflow_agency_id,
+            dataflow_version,
+        ),
+    )
+
+
+class ObservationPartition(Base):
+    __tablename__ = "sdmxv21_observation_partition"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    dataflow_id: Mapped[str] = mapped_column(String, nullable=False)
+    dataflow_agency_id: Mapped[str] = mapped_column(String, nullable=False)
+    dataflow_version: Mapped[str] = mapped_column(String, nullable=False)
+    key_widths: Mapped[list[int] | None] = mapped_column(
+        ARRAY(SmallInteger), nullable=True
+    )
+    series_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [dataflow_id, dataflow_agency_id, dataflow_version],
+            [Dataflow.id, Dataflow.agency_id, Dataflow.version],
+        ),
+        UniqueConstraint(dataflow_id, dataflow_agency_id, dataflow_version),
+    )
+
+
+class SeriesAvailability(Base):
+    __tablename__ = "sdmxv21_series_availability"
+    partition_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    position: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    ordinal: Mapped[int] = mapped_column(Integer, primary_key=True)
+    chunk: Mapped[int] = mapped_column(Integer, primary_key=True)
+    series: Mapped[int] = mapped_column(Integer, nullable=False)
+    bitmap: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [partition_id], [ObservationPartition.id], ondelete="CASCADE"
+        ),
+    )
+
+
+class Series(Base):
+    __tablename__ = "sdmxv21_series"
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    partition_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    key: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    packed_key: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    attributes: Mapped[dict[str, str] | None] = mapped_column(JSONB, nullable=True)
+    rollup_from: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [partition_id], [ObservationPartition.id], ondelete="CASCADE"
+        ),
+        UniqueConstraint(partition_id, key),
+        Index("ix_sdmxv21_series_packed_key", partition_id, packed_key),
+        Index(
+            "ix_sdmxv21_series_rollup_from",
+            partition_id,
+            postgresql_where=rollup_from.is_not(None),
+        ),
+    )
+
+
+class Observation(Base):
+    __tablename__ = "sdmxv21_observation"
+    partition_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    series_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    period_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    time_period: Mapped[str] = mapped_column(String, nullable=False)
+    obs_value: Mapped[float | None] = mapped_column(Float, nullable=True)
+    attributes: Mapped[dict[str, str] | None] = mapped_column(JSONB, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_sdmxv21_observation_period_start",
+            period_start,
+            postgresql_using="brin",
+        ),
+        {"postgresql_partition_by": "LIST (partition_id)"},
+    )
+
+
+class Rollup(Base):
+    __tablename__ = "sdmxv21_rollup"
+    partition_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    series_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    frequency: Mapped[str] = mapped_column(String, primary_key=True)
+    period_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    time_period: Mapped[str] = mapped_column(String, nullable=False)
+    observations: Mapped[int] = mapped_column(Integer, nullable=False)
+    obs_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    obs_first: Mapped[float] = mapped_column(Float, nullable=False)
+    obs_last: Mapped[float] = mapped_column(Float, nullable=False)
@@ -937,6 +937,7 @@ from fennec_api.sdmx_v21.parser.models import (
 )
 
 from fennec_api.sdmx_v21.parser.helpers import parse_structure, parse_data
+from fennec_api.sdmx_v21.parser.sdmxjson import is_json, parse_json_structure
 
 __all__ = [
     "ActionType",
@@ -1874,6 +1875,8 @@ __all__ = [
     "VersionableWhereType",
     "WildCardValueType",
     "Xhtmltype",
+    "is_json",
     "parse_data",
+    "parse_json_structure",
     "parse_structure",
 ]
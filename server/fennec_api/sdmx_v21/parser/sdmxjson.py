@@ -0,0 +1,277 @@
+from typing import Any, TypeVar
+import re
+import orjson
+import fennec_api.sdmx_v21.parser.models as models
+
+R = TypeVar("R", bound=models.RepresentationType)
+
+URN_PATTERN = re.compile(
+    r"^urn:sdmx:org\.sdmx\.infomodel\.(?P<package>\w+)\.(?P<class_value>\w+)="
+    r"(?P<agency_id>[^:]+):(?P<id>[^(]+)\((?P<version>[^)]+)\)(?:\.(?P<item>.+))?$"
+)
+
+
+def is_json(content: bytes) -> bool:
+    return content[:64].lstrip()[:1] in (b"{", b"[")
+
+
+def parse_urn(urn: str) -> models.RefBaseType:
+    match = URN_PATTERN.match(urn)
+    if not match:
+        raise ValueError(f"Invalid SDMX URN {urn}")
+    package = models.PackageTypeCodelistType(match["package"])
+    class_value = models.ObjectTypeCodelistType(match["class_value"])
+    if match["item"]:
+        return models.RefBaseType(
+            id=match["item"],
+            agency_id=match["agency_id"],
+            maintainable_parent_id=match["id"],
+            maintainable_parent_version=match["version"],
+            package=package,
+            class_value=class_value,
+        )
+    return models.RefBaseType(
+        id=match["id"],
+        agency_id=match["agency_id"],
+        version=match["version"],
+        package=package,
+        class_value=class_value,
+    )
+
+
+def _names(obj: dict[str, Any]) -> list[models.Name]:
+    names: dict[str, str] = obj.get("names") or (
+        {"en": obj["name"]} if "name" in obj else {}
+    )
+    return [models.Name(value=v, lang=k) for k, v in names.items()]
+
+
+def _descriptions(obj: dict[str, Any]) -> list[models.Description]:
+    descriptions: dict[str, str] = obj.get("descriptions") or (
+        {"en": obj["description"]} if "description" in obj else {}
+    )
+    return [models.Description(value=v, lang=k) for k, v in descriptions.items()]
+
+
+def _maintainable(obj: dict[str, Any]) -> dict[str, Any]:
+    return dict(
+        id=obj["id"],
+        agency_id=obj["agencyID"],
+        version=obj.get("version", "1.0"),
+        urn=obj.get("urn"),
+        name=_names(obj),
+        description=_descriptions(obj),
+    )
+
+
+def _item(obj: dict[str, Any]) -> dict[str, Any]:
+    return dict(
+        id=obj["id"],
+        urn=obj.get("urn"),
+        name=_names(obj),
+        description=_descriptions(obj),
+    )
+
+
+def _concept_identity(obj: dict[str, Any]) -> models.ConceptReferenceType | None:
+    urn = obj.get("conceptIdentity")
+    return models.ConceptReferenceType(ref=parse_urn(urn)) if urn else None
+
+
+def _representation(obj: dict[str, Any], cls: type[R]) -> R | None:
+    representation = obj.get("localRepresentation")
+    if not representation:
+        return None
+    if "enumeration" in representation:
+        return cls(
+            enumeration=models.ItemSchemeReferenceBaseType(
+                ref=parse_urn(representation["enumeration"])
+            )
+        )
+    text_format = representation.get("textFormat") or {}
+    return cls(
+        text_format=models.TextFormatType(
+            text_type=models.DataType(text_format.get("textType", "String"))
+        )
+    )
+
+
+def _component(obj: dict[str, Any]) -> dict[str, Any]:
+    return dict(
+        urn=obj.get("urn"),
+        concept_identity=_concept_identity(obj),
+    )
+
+
+def _dimension(obj: dict[str, Any]) -> models.Dimension2:
+    return models.Dimension2(
+        id=obj["id"],
+        **_component(obj),
+        local_representation=_representation(obj, models.RepresentationType),
+        position=obj.get("position"),
+    )
+
+
+def _time_dimension(obj: dict[str, Any]) -> models.TimeDimension2:
+    return models.TimeDimension2(
+        **_component(obj),
+        local_representation=_representation(
+            obj, models.TimeDimensionRepresentationType
+        ),
+        position=obj.get("position"),
+    )
+
+
+def _attribute(obj: dict[str, Any]) -> models.Attribute2:
+    status = obj.get("assignmentStatus")
+    return models.Attribute2(
+        id=obj["id"],
+        **_component(obj),
+        local_representation=_representation(obj, models.RepresentationType),
+        assignment_status=models.UsageStatusType(status) if status else None,
+    )
+
+
+def _primary_measure(obj: dict[str, Any]) -> models.PrimaryMeasure2:
+    return models.PrimaryMeasure2(
+        **_component(obj),
+        local_representation=_representation(obj, models.RepresentationType),
+    )
+
+
+def _dataflow(obj: dict[str, Any]) -> models.DataflowType:
+    structure = obj.get("structure")
+    return models.DataflowType(
+        **_maintainable(obj),
+        structure=models.StructureReferenceBaseType(ref=parse_urn(structure))
+        if structure
+        else None,
+    )
+
+
+def _data_structure(obj: dict[str, Any]) -> models.DataStructureType2:
+    components = obj.get("dataStructureComponents") or {}
+    dimension_list = components.get("dimensionList")
+    attribute_list = components.get("attributeList")
+    measure_list = components.get("measureList")
+    primary_measure = measure_list.get("primaryMeasure") if measure_list else None
+    return models.DataStructureType2(
+        **_maintainable(obj),
+        data_structure_components=models.DataStructureComponents(
+            dimension_list=models.DimensionList(
+                dimension=[_dimension(d) for d in dimension_list.get("dimensions", [])],
+                time_dimension=[
+                    _time_dimension(d) for d in dimension_list.get("timeDimensions", [])
+                ],
+            )
+            if dimension_list
+            else None,
+            attribute_list=models.AttributeList(
+                attribute=[_attribute(a) for a in attribute_list.get("attributes", [])],
+            )
+            if attribute_list
+            else None,
+            measure_list=models.MeasureList(
+                primary_measure=_primary_measure(primary_measure)
+                if primary_measure
+                else None,
+            )
+            if measure_list
+            else None,
+        ),
+    )
+
+
+def _codelist(obj: dict[str, Any]) -> models.CodelistType:
+    return models.CodelistType(
+        **_maintainable(obj),
+        code=[models.Code2(**_item(c)) for c in obj.get("codes", [])],
+    )
+
+
+def _concept_scheme(obj: dict[str, Any]) -> models.ConceptSchemeType:
+    return models.ConceptSchemeType(
+        **_maintainable(obj),
+        concept=[models.Concept2(**_item(c)) for c in obj.get("concepts", [])],
+    )
+
+
+def _category(obj: dict[str, Any]) -> models.Category2:
+    return models.Category2(
+        **_item(obj),
+        category=[_category(c) for c in obj.get("categories", [])],
+    )
+
+
+def _category_scheme(obj: dict[str, Any]) -> models.CategorySchemeType:
+    return models.CategorySchemeType(
+        **_maintainable(obj),
+        category=[_category(c) for c in obj.get("categories", [])],
+    )
+
+
+def _categorisation(obj: dict[str, Any]) -> models.CategorisationType:
+    return models.CategorisationType(
+        **_maintainable(obj),
+        source=models.ObjectReferenceType(ref=parse_urn(obj["source"])),
+        target=models.CategoryReferenceType(ref=parse_urn(obj["target"])),
+    )
+
+
+def _error(errors: list[dict[str, Any]]) -> models.Error:
+    return models.Error(
+        error_message=[
+            models.CodedStatusMessageType(
+                code=str(e["code"]) if "code" in e else None,
+                text=[
+                    models.TextType(value=str(e.get("title") or e.get("detail", "")))
+                ],
+            )
+            for e in errors
+        ]
+    )
+
+
+def parse_json_structure(content: bytes) -> models.Structure | models.Error:
+    msg = orjson.loads(content)
+    if msg.get("errors"):
+        return _error(msg["errors"])
+
+    data = msg.get("data", {})
+    dataflows = data.get("dataflows")
+    data_structures = data.get("dataStructures")
+    codelists = data.get("codelists")
+    concept_schemes = data.get("conceptSchemes")
+    category_schemes = data.get("categorySchemes")
+    categorisations = data.get("categorisations")
+
+    return models.Structure(
+        structures=models.StructuresType(
+            dataflows=models.DataflowsType(dataflow=[_dataflow(df) for df in dataflows])
+            if dataflows
+            else None,
+            data_structures=models.DataStructuresType(
+                data_structure=[_data_structure(ds) for ds in data_structures]
+            )
+            if data_structures
+            else None,
+            codelists=models.CodelistsType(codelist=[_codelist(cl) for cl in codelists])
+            if codelists
+            else None,
+            concepts=models.ConceptsType(
+                concept_scheme=[_concept_scheme(cs) for cs in concept_schemes]
+            )
+            if concept_schemes
+            else None,
+            category_schemes=models.CategorySchemesType(
+                category_scheme=[_category_scheme(cs) for cs in category_schemes]
+            )
+            if category_schemes
+            else None,
+            categorisations=models.CategorisationsType(
+                categorisation=[_categorisation(c) for c in categorisations]
+            )
+            if categorisations
+            else None,
+        )
+    )
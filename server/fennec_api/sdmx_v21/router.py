@@ -1,16 +1,250 @@
-from typing import Annotated, Any
-from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, Body, Query, status, HTTPException
-from fennec_api.auth.dependencies import get_current_admin
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable, Sequence
+from enum import Enum
+from functools import partial
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from fastapi import (
+    APIRouter,
+    Depends,
+    Body,
+    Query,
+    Request,
+    Response,
+    status,
+    HTTPException,
+)
+from fastapi.responses import StreamingResponse
+from fennec_api.auth.dependencies import get_current_admin, get_current_active_user
 from fennec_api.users.models import User
-from fennec_api.core.dependencies import get_session
-from fennec_api.sdmx_v21.schemas import ProviderCreate, ProviderRead, ProviderUpdate
+from fennec_api.core.cache import cached_response, tag
+from fennec_api.core.crud import CRUDBase
+from fennec_api.core.encoders import encode_json, stream_ndjson
+from fennec_api.core.dependencies import get_session, get_session_factory
+from fennec_api.core import queue
+from fennec_api.etl.periods import period_bounds
+from fennec_api.sdmx_v21.availability import (
+    AvailabilityMode,
+    constrained_codes,
+    read_availability,
+)
+from fennec_api.sdmx_v21.constraints import prune, read_constraints
+from fennec_api.sdmx_v21.etl.observations import get_partition
+from fennec_api.sdmx_v21.etl.rollups import Aggregation, RollupFrequency
+from fennec_api.sdmx_v21.export import DataFormat, MEDIA_TYPES, ObservationEncoder
+from fennec_api.sdmx_v21.keys import read_key_dictionary
+from fennec_api.sdmx_v21.models import Code, Concept, Dataflow, DataStructure
+from fennec_api.sdmx_v21.schemas import (
+    AvailabilityRead,
+    CodeRead,
+    CodeSearchRead,
+    CodelistInclude,
+    CodelistRead,
+    ConceptRead,
+    ConceptSchemeInclude,
+    ConceptSchemeRead,
+    ConceptSearchRead,
+    DataflowRead,
+    DataStructureInclude,
+    DataStructureRead,
+    ListFormat,
+    MetadataRead,
+    ProviderCreate,
+    ProviderRead,
+    ProviderUpdate,
+    CollectJobRead,
+)
+from fennec_api.sdmx_v21.tasks import enqueue_collect_provider
 import fennec_api.sdmx_v21.service as service
 
 
 router = APIRouter(prefix="/sdmx", tags=["SDMX"])
 
 
+def _next_cursor(
+    cursor: Callable[[Any], str], items: Sequence[Any], limit: int
+) -> dict[str, str]:
+    if items and len(items) == limit:
+        return {"X-Next-Cursor": cursor(items[-1])}
+    return {}
+
+
+async def _find_maintainable(
+    session: AsyncSession,
+    crud: CRUDBase[Any, Any, Any],
+    *,
+    agency_id: str,
+    id: str,
+    version: str,
+    include: Sequence[Enum] = (),
+) -> Any:
+    item = await service.get_maintainable(
+        session,
+        crud,
+        agency_id=agency_id,
+        id=id,
+        version=version,
+        include=(i.value for i in include),
+    )
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find {crud.model.__name__} {agency_id}:{id}({version})",
+        )
+    return item
+
+
+async def _render_maintainable(
+    session: AsyncSession,
+    crud: CRUDBase[Any, Any, Any],
+    schema: type[MetadataRead],
+    *,
+    agency_id: str,
+    id: str,
+    version: str,
+    include: Sequence[Enum] = (),
+) -> tuple[bytes, dict[str, str]]:
+    item = await _find_maintainable(
+        session, crud, agency_id=agency_id, id=id, version=version, include=include
+    )
+    return schema.model_validate(item).model_dump_json().encode(), {}
+
+
+def _stream_rows(
+    session_factory: async_sessionmaker[AsyncSession],
+    crud: CRUDBase[Any, Any, Any],
+    schema: type[MetadataRead],
+    stream: Callable[[AsyncSession, Sequence[Any]], AsyncIterator[Sequence[Row[Any]]]],
+    *,
+    cursor: str | None,
+) -> StreamingResponse:
+    fields = list(schema.model_fields)
+    columns = service.listing_columns(crud.model, fields)
+    if cursor is not None:
+        try:
+            crud.seek_values(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def batches() -> AsyncIterator[Sequence[Row[Any]]]:
+        async with session_factory() as stream_session:
+            async for rows in stream(stream_session, columns):
+                yield rows
+
+    return StreamingResponse(
+        stream_ndjson(fields, batches()), media_type=MEDIA_TYPES[DataFormat.NDJSON]
+    )
+
+
+async def _render_rows(
+    crud: CRUDBase[Any, Any, Any],
+    schema: type[MetadataRead],
+    rows: Callable[[Sequence[Any]], Awaitable[Sequence[Row[Any]]]],
+    *,
+    limit: int,
+) -> tuple[bytes, dict[str, str]]:
+    fields = list(schema.model_fields)
+    try:
+        items = await rows(service.listing_columns(crud.model, fields))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return encode_json(fields, items), _next_cursor(crud.row_cursor, items, limit)
+
+
+async def _list_maintainables(
+    request: Request,
+    session: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+    crud: CRUDBase[Any, Any, Any],
+    schema: type[MetadataRead],
+    *,
+    resource: str,
+    agency_id: str | None,
+    limit: int,
+    cursor: str | None,
+    format: ListFormat,
+) -> Response:
+    if format == ListFormat.NDJSON:
+        return _stream_rows(
+            session_factory,
+            crud,
+            schema,
+            lambda s, columns: service.stream_maintainables(
+                s, crud, columns, agency_id=agency_id, cursor=cursor
+            ),
+            cursor=cursor,
+        )
+    return await cached_response(
+        request,
+        tags=[resource],
+        render=partial(
+            _render_rows,
+            crud,
+            schema,
+            lambda columns: service.list_maintainables(
+                session, crud, columns, agency_id=agency_id, limit=limit, cursor=cursor
+            ),
+            limit=limit,
+        ),
+    )
+
+
+async def _list_items(
+    request: Request,
+    session: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+    parent_crud: CRUDBase[Any, Any, Any],
+    crud: CRUDBase[Any, Any, Any],
+    schema: type[MetadataRead],
+    list_items: Callable[..., Awaitable[Sequence[Row[Any]]]],
+    stream_items: Callable[..., AsyncIterator[Sequence[Row[Any]]]],
+    *,
+    resource: str,
+    agency_id: str,
+    id: str,
+    version: str,
+    limit: int,
+    cursor: str | None,
+    format: ListFormat,
+) -> Response:
+    if format == ListFormat.NDJSON:
+        parent = await _find_maintainable(
+            session, parent_crud, agency_id=agency_id, id=id, version=version
+        )
+        return _stream_rows(
+            session_factory,
+            crud,
+            schema,
+            lambda s, columns: stream_items(s, parent, columns, cursor=cursor),
+            cursor=cursor,
+        )
+
+    async def render() -> tuple[bytes, dict[str, str]]:
+        parent = await _find_maintainable(
+            session, parent_crud, agency_id=agency_id, id=id, version=version
+        )
+        return await _render_rows(
+            crud,
+            schema,
+            lambda columns: list_items(
+                session, parent, columns, limit=limit, cursor=cursor
+            ),
+            limit=limit,
+        )
+
+    return await cached_response(
+        request, tags=[tag(resource, agency_id, id, version)], render=render
+    )
+
+
+async def _render_search(
+    model: type[Dataflow | Code | Concept],
+    schema: type[MetadataRead],
+    search: Callable[[Sequence[Any]], Awaitable[Sequence[Row[Any]]]],
+) -> tuple[bytes, dict[str, str]]:
+    fields = list(schema.model_fields)
+    return encode_json(fields, await search(service.listing_columns(model, fields))), {}
+
+
 @router.post(
     "/providers", status_code=status.HTTP_201_CREATED, response_model=ProviderRead
 )
@@ -28,10 +262,21 @@ async def create_providers(
 async def list_providers(
     session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[User, Depends(get_current_admin)],
+    response: Response,
     offset: Annotated[int, Query(...)] = 0,
     limit: Annotated[int, Query(...)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
 ) -> Any:
-    return await service.list_providers(session, offset=offset, limit=limit)
+    try:
+        providers = await service.list_providers(
+            session, offset=offset, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response.headers.update(
+        _next_cursor(service.crud_provider.cursor, providers, limit)
+    )
+    return providers
 
 
 @router.get(
@@ -67,3 +312,600 @@ async def update_provider(
             detail=f"Could not find provider {id}",
         )
     return await service.update_provider(session, db_obj=provider, obj_in=provider_data)
+
+
+@router.post(
+    "/providers/{id}/collect",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=CollectJobRead,
+)
+async def collect_provider(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_admin)],
+    id: int,
+    profile_memory: Annotated[bool, Query()] = False,
+) -> Any:
+    provider = await service.get_provider(session, id=id)
+    if not provider:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find provider {id}",
+        )
+    if not queue.pool:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue is not available",
+        )
+    job = await enqueue_collect_provider(
+        queue.pool, provider.id, profile_memory=profile_memory
+    )
+    return {"job_id": job.job_id}
+
+
+@router.get(
+    "/dataflows", status_code=status.HTTP_200_OK, response_model=list[DataflowRead]
+)
+async def list_dataflows(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
+    format: Annotated[ListFormat, Query()] = ListFormat.JSON,
+) -> Response:
+    return await _list_maintainables(
+        request,
+        session,
+        session_factory,
+        service.crud_dataflow,
+        DataflowRead,
+        resource="dataflow",
+        agency_id=agency_id,
+        limit=limit,
+        cursor=cursor,
+        format=format,
+    )
+
+
+@router.get(
+    "/dataflows/{agency_id}/{id}/{version}",
+    status_code=status.HTTP_200_OK,
+    response_model=DataflowRead,
+)
+async def get_dataflow(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: str,
+    id: str,
+    version: str,
+) -> Response:
+    return await cached_response(
+        request,
+        tags=[tag("dataflow", agency_id, id, version)],
+        render=partial(
+            _render_maintainable,
+            session,
+            service.crud_dataflow,
+            DataflowRead,
+            agency_id=agency_id,
+            id=id,
+            version=version,
+        ),
+    )
+
+
+@router.get(
+    "/datastructures",
+    status_code=status.HTTP_200_OK,
+    response_model=list[DataStructureRead],
+)
+async def list_data_structures(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
+    format: Annotated[ListFormat, Query()] = ListFormat.JSON,
+) -> Response:
+    return await _list_maintainables(
+        request,
+        session,
+        session_factory,
+        service.crud_data_structure,
+        DataStructureRead,
+        resource="datastructure",
+        agency_id=agency_id,
+        limit=limit,
+        cursor=cursor,
+        format=format,
+    )
+
+
+@router.get(
+    "/datastructures/{agency_id}/{id}/{version}",
+    status_code=status.HTTP_200_OK,
+    response_model=DataStructureRead,
+)
+async def get_data_structure(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: str,
+    id: str,
+    version: str,
+    include: Annotated[list[DataStructureInclude], Query()] = [],
+) -> Response:
+    return await cached_response(
+        request,
+        tags=[tag("datastructure", agency_id, id, version)],
+        render=partial(
+            _render_maintainable,
+            session,
+            service.crud_data_structure,
+            DataStructureRead,
+            agency_id=agency_id,
+            id=id,
+            version=version,
+            include=include,
+        ),
+    )
+
+
+@router.get(
+    "/codelists", status_code=status.HTTP_200_OK, response_model=list[CodelistRead]
+)
+async def list_codelists(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
+    format: Annotated[ListFormat, Query()] = ListFormat.JSON,
+) -> Response:
+    return await _list_maintainables(
+        request,
+        session,
+        session_factory,
+        service.crud_codelist,
+        CodelistRead,
+        resource="codelist",
+        agency_id=agency_id,
+        limit=limit,
+        cursor=cursor,
+        format=format,
+    )
+
+
+@router.get(
+    "/codelists/{agency_id}/{id}/{version}",
+    status_code=status.HTTP_200_OK,
+    response_model=CodelistRead,
+)
+async def get_codelist(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: str,
+    id: str,
+    version: str,
+    include: Annotated[list[CodelistInclude], Query()] = [],
+) -> Response:
+    return await cached_response(
+        request,
+        tags=[tag("codelist", agency_id, id, version)],
+        render=partial(
+            _render_maintainable,
+            session,
+            service.crud_codelist,
+            CodelistRead,
+            agency_id=agency_id,
+            id=id,
+            version=version,
+            include=include,
+        ),
+    )
+
+
+@router.get(
+    "/codelists/{agency_id}/{id}/{version}/codes",
+    status_code=status.HTTP_200_OK,
+    response_model=list[CodeRead],
+)
+async def list_codes(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: str,
+    id: str,
+    version: str,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
+    format: Annotated[ListFormat, Query()] = ListFormat.JSON,
+) -> Response:
+    return await _list_items(
+        request,
+        session,
+        session_factory,
+        service.crud_codelist,
+        service.crud_code,
+        CodeRead,
+        service.list_codes,
+        service.stream_codes,
+        resource="codelist",
+        agency_id=agency_id,
+        id=id,
+        version=version,
+        limit=limit,
+        cursor=cursor,
+        format=format,
+    )
+
+
+@router.get(
+    "/conceptschemes",
+    status_code=status.HTTP_200_OK,
+    response_model=list[ConceptSchemeRead],
+)
+async def list_concept_schemes(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
+    format: Annotated[ListFormat, Query()] = ListFormat.JSON,
+) -> Response:
+    return await _list_maintainables(
+        request,
+        session,
+        session_factory,
+        service.crud_concept_scheme,
+        ConceptSchemeRead,
+        resource="conceptscheme",
+        agency_id=agency_id,
+        limit=limit,
+        cursor=cursor,
+        format=format,
+    )
+
+
+@router.get(
+    "/conceptschemes/{agency_id}/{id}/{version}",
+    status_code=status.HTTP_200_OK,
+    response_model=ConceptSchemeRead,
+)
+async def get_concept_scheme(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: str,
+    id: str,
+    version: str,
+    include: Annotated[list[ConceptSchemeInclude], Query()] = [],
+) -> Response:
+    return await cached_response(
+        request,
+        tags=[tag("conceptscheme", agency_id, id, version)],
+        render=partial(
+            _render_maintainable,
+            session,
+            service.crud_concept_scheme,
+            ConceptSchemeRead,
+            agency_id=agency_id,
+            id=id,
+            version=version,
+            include=include,
+        ),
+    )
+
+
+@router.get(
+    "/conceptschemes/{agency_id}/{id}/{version}/concepts",
+    status_code=status.HTTP_200_OK,
+    response_model=list[ConceptRead],
+)
+async def list_concepts(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    user: Annotated[User, Depends(get_current_active_user)],
+    agency_id: str,
+    id: str,
+    version: str,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: Annotated[str | None, Query()] = None,
+    format: Annotated[ListFormat, Query()] = ListFormat.JSON,
+) -> Response:
+    return await _list_items(
+        request,
+        session,
+        session_factory,
+        service.crud_concept_scheme,
+        service.crud_concept,
+        ConceptRead,
+        service.list_concepts,
+        service.stream_concepts,
+        resource="conceptscheme",
+        agency_id=agency_id,
+        id=id,
+        version=version,
+        limit=limit,
+        cursor=cursor,
+        format=format,
+    )
+
+
+@router.get(
+    "/search/dataflows",
+    status_code=status.HTTP_200_OK,
+    response_model=list[DataflowRead],
+)
+async def search_dataflows(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    q: Annotated[str, Query(min_length=2, max_length=200)],
+    agency_id: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0, le=10_000)] = 0,
+) -> Response:
+    return await cached_response(
+        request,
+        tags=["dataflow"],
+        render=partial(
+            _render_search,
+            Dataflow,
+            DataflowRead,
+            lambda columns: service.search_dataflows(
+                session, columns, q=q, agency_id=agency_id, limit=limit, offset=offset
+            ),
+        ),
+    )
+
+
+@router.get(
+    "/search/codes",
+    status_code=status.HTTP_200_OK,
+    response_model=list[CodeSearchRead],
+)
+async def search_codes(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    q: Annotated[str, Query(min_length=2, max_length=200)],
+    agency_id: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0, le=10_000)] = 0,
+) -> Response:
+    return await cached_response(
+        request,
+        tags=["codelist"],
+        render=partial(
+            _render_search,
+            Code,
+            CodeSearchRead,
+            lambda columns: service.search_codes(
+                session, columns, q=q, agency_id=agency_id, limit=limit, offset=offset
+            ),
+        ),
+    )
+
+
+@router.get(
+    "/search/concepts",
+    status_code=status.HTTP_200_OK,
+    response_model=list[ConceptSearchRead],
+)
+async def search_concepts(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    q: Annotated[str, Query(min_length=2, max_length=200)],
+    agency_id: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0, le=10_000)] = 0,
+) -> Response:
+    return await cached_response(
+        request,
+        tags=["conceptscheme"],
+        render=partial(
+            _render_search,
+            Concept,
+            ConceptSearchRead,
+            lambda columns: service.search_concepts(
+                session, columns, q=q, agency_id=agency_id, limit=limit, offset=offset
+            ),
+        ),
+    )
+
+
+@router.get("/data/{flow_ref}/{key}", status_code=status.HTTP_200_OK)
+async def get_data(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    user: Annotated[User, Depends(get_current_active_user)],
+    flow_ref: str,
+    key: str,
+    start_period: Annotated[str | None, Query(alias="startPeriod")] = None,
+    end_period: Annotated[str | None, Query(alias="endPeriod")] = None,
+    format: Annotated[DataFormat, Query()] = DataFormat.ARROW,
+    frequency: Annotated[RollupFrequency | None, Query()] = None,
+    aggregation: Annotated[Aggregation, Query()] = Aggregation.MEAN,
+    batch_size: Annotated[int, Query(gt=0, le=100_000)] = 10_000,
+) -> StreamingResponse:
+    dataflow = await service.get_dataflow(session, flow_ref=flow_ref)
+    if not dataflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find dataflow {flow_ref}",
+        )
+    data_structure = await session.get(
+        DataStructure,
+        (
+            dataflow.structure_id,
+            dataflow.structure_agency_id,
+            dataflow.structure_version,
+        ),
+    )
+    partition_id = await get_partition(session, dataflow)
+    if not data_structure or partition_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No data for dataflow {flow_ref}",
+        )
+    if not data_structure.time_dimensions or not data_structure.primary_measures:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Data structure {data_structure.id} has no observations",
+        )
+
+    key_dictionary = await read_key_dictionary(session, data_structure)
+    try:
+        matcher = key_dictionary.matcher(key)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    matcher = prune(
+        key_dictionary,
+        matcher,
+        await read_constraints(session, dataflow, key_dictionary),
+    )
+    start = period_bounds(start_period) if start_period else None
+    end = period_bounds(end_period) if end_period else None
+    if (start_period and not start) or (end_period and not end):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid startPeriod or endPeriod",
+        )
+
+    encoder = ObservationEncoder(
+        key_dictionary,
+        time_dimension=data_structure.time_dimensions[0].id,
+        primary_measure=data_structure.primary_measures[0].id,
+        attributes=tuple(a.id for a in data_structure.attributes),
+    )
+
+    async def batches() -> AsyncIterator[Sequence[Row[Any]]]:
+        if matcher.empty:
+            return
+        async with session_factory() as stream_session:
+            async for rows in (
+                service.stream_rollups(
+                    stream_session,
+                    partition_id=partition_id,
+                    matcher=matcher,
+                    frequency=frequency,
+                    aggregation=aggregation,
+                    start=start[0] if start else None,
+                    end=end[1] if end else None,
+                    batch_size=batch_size,
+                )
+                if frequency
+                else service.stream_observations(
+                    stream_session,
+                    partition_id=partition_id,
+                    matcher=matcher,
+                    start=start[0] if start else None,
+                    end=end[1] if end else None,
+                    batch_size=batch_size,
+                )
+            ):
+                yield rows
+
+    return StreamingResponse(
+        encoder.encode(batches(), format), media_type=MEDIA_TYPES[format]
+    )
+
+
+@router.get(
+    "/availableconstraint/{flow_ref}/{key}",
+    status_code=status.HTTP_200_OK,
+    response_model=AvailabilityRead,
+)
+async def get_available_constraint(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    flow_ref: str,
+    key: str,
+    mode: Annotated[AvailabilityMode, Query()] = AvailabilityMode.EXACT,
+) -> Any:
+    dataflow = await service.get_dataflow(session, flow_ref=flow_ref)
+    if not dataflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not find dataflow {flow_ref}",
+        )
+    data_structure = await session.get(
+        DataStructure,
+        (
+            dataflow.structure_id,
+            dataflow.structure_agency_id,
+            dataflow.structure_version,
+        ),
+    )
+    if not data_structure:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No data structure for dataflow {flow_ref}",
+        )
+
+    key_dictionary = await read_key_dictionary(session, data_structure)
+    try:
+        matcher = key_dictionary.matcher(key)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    partition_id = await get_partition(session, dataflow)
+    index = (
+        await read_availability(
+            session, partition_id, len(key_dictionary.dimensions), matcher, mode
+        )
+        if partition_id is not None
+        else None
+    )
+    if index and index.series:
+        series: int | None = index.count(matcher)
+        codes = index.codes(matcher, mode)
+    else:
+        constraints = await read_constraints(
+            session, dataflow, key_dictionary, type="Actual"
+        )
+        if not constraints:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No availability for dataflow {flow_ref}",
+            )
+        series = None
+        codes = constrained_codes(key_dictionary, matcher, constraints, mode)
+
+    return {
+        "series": series,
+        "key_values": {
+            dimension: sorted(values[i] for i in ordinals)
+            for dimension, values, ordinals in zip(
+                key_dictionary.dimensions, key_dictionary.values, codes
+            )
+        },
+    }
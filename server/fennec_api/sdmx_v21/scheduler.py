@@ -0,0 +1,133 @@
+from typing import Sequence
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from fennec_api.sdmx_v21.models import Provider
+
+
+@dataclass
+class HarvestPlan:
+    provider_id: int
+    defer_by: timedelta
+
+
+def is_due(
+    provider: Provider,
+    now: datetime,
+    *,
+    retry_delay: timedelta = timedelta(minutes=15),
+) -> bool:
+    if provider.failure_count and provider.last_attempted_at is not None:
+        backoff = min(
+            retry_delay * (1 << min(provider.failure_count - 1, 16)),
+            timedelta(hours=provider.harvest_interval),
+        )
+        return provider.last_attempted_at + backoff <= now
+    if provider.last_collected_at is None:
+        return True
+    return (
+        provider.last_collected_at + timedelta(hours=provider.harvest_interval) <= now
+    )
+
+
+def is_overdue(provider: Provider, now: datetime) -> bool:
+    return (
+        provider.last_collected_at is not None
+        and provider.last_collected_at + timedelta(hours=2 * provider.harvest_interval)
+        <= now
+    )
+
+
+def provider_host(provider: Provider) -> str:
+    return urlparse(provider.root_url).hostname or provider.root_url
+
+
+def minutes_until_window_end(
+    now: datetime, *, start_hour: int, end_hour: int
+) -> int | None:
+    start = now.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    end = now.replace(hour=end_hour, minute=0, second=0, microsecond=0)
+    if start_hour > end_hour:
+        if now >= start:
+            end += timedelta(days=1)
+        else:
+            start -= timedelta(days=1)
+    if not start <= now < end:
+        return None
+    return math.ceil((end - now).total_seconds() / 60)
+
+
+def bulk_quota(
+    due_bulk: int,
+    now: datetime,
+    *,
+    start_hour: int,
+    end_hour: int,
+    schedule_interval: int,
+) -> int:
+    if start_hour == end_hour:
+        return due_bulk
+    remaining = minutes_until_window_end(now, start_hour=start_hour, end_hour=end_hour)
+    if remaining is None:
+        return 0
+    return math.ceil(due_bulk / max(math.ceil(remaining / schedule_interval), 1))
+
+
+def plan_harvests(
+    providers: Sequence[Provider],
+    *,
+    now: datetime,
+    in_flight: set[int],
+    max_concurrency: int,
+    max_per_host: int,
+    jitter: int,
+    night_start_hour: int,
+    night_end_hour: int,
+    schedule_interval: int,
+    retry_delay: timedelta = timedelta(minutes=15),
+    rng: random.Random | None = None,
+) -> list[HarvestPlan]:
+    rng = rng or random.Random()
+
+    host_counts = Counter(provider_host(p) for p in providers if p.id in in_flight)
+    due = sorted(
+        (
+            p
+            for p in providers
+            if p.id not in in_flight and is_due(p, now, retry_delay=retry_delay)
+        ),
+        key=lambda p: (-p.priority, p.last_collected_at or datetime.min),
+    )
+    # Bulk providers that missed a whole interval, e.g. because their night
+    # run failed or overran, are not held back until the next window
+    remaining_bulk = bulk_quota(
+        sum(1 for p in due if p.bulk_download and not is_overdue(p, now)),
+        now,
+        start_hour=night_start_hour,
+        end_hour=night_end_hour,
+        schedule_interval=schedule_interval,
+    )
+    budget = max_concurrency - len(in_flight)
+
+    plans: list[HarvestPlan] = []
+    for provider in due:
+        if len(plans) >= budget:
+            break
+        host = provider_host(provider)
+        if host_counts[host] >= max_per_host:
+            continue
+        if provider.bulk_download and not is_overdue(provider, now):
+            if remaining_bulk <= 0:
+                continue
+            remaining_bulk -= 1
+        host_counts[host] += 1
+        plans.append(
+            HarvestPlan(
+                provider_id=provider.id,
+                defer_by=timedelta(seconds=rng.uniform(0, jitter)),
+            )
+        )
+    return plans
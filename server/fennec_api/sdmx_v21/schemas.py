@@ -1,5 +1,11 @@
-from pydantic import HttpUrl
+from typing import Any
+from datetime import datetime
+from enum import Enum
+from pydantic import ConfigDict, HttpUrl, model_validator
+from sqlalchemy import inspect
+from fennec_api.core.database import Base
 from fennec_api.core.schemas import FennecBaseModel
+from fennec_api.sdmx_v21.client import WireFormat
 
 
 class ProviderBase(FennecBaseModel):
@@ -8,6 +14,9 @@ class ProviderBase(FennecBaseModel):
     bulk_download: bool
     skip_categories: bool
     process_all_agencies: bool
+    harvest_interval: int = 24
+    priority: int = 0
+    wire_format: WireFormat = WireFormat.XML
 
 
 class ProviderCreate(ProviderBase):
@@ -20,3 +29,132 @@ class ProviderUpdate(ProviderBase):
 
 class ProviderRead(ProviderBase):
     id: int
+    last_collected_at: datetime | None
+    last_attempted_at: datetime | None
+    failure_count: int
+
+
+class CollectJobRead(FennecBaseModel):
+    job_id: str
+
+
+class AvailabilityRead(FennecBaseModel):
+    series: int | None
+    key_values: dict[str, list[str]]
+
+
+class MetadataRead(FennecBaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded(cls, data: Any) -> Any:
+        if not isinstance(data, Base):
+            return data
+        unloaded = inspect(data).unloaded
+        return {
+            field: getattr(data, field)
+            for field in cls.model_fields
+            if field not in unloaded
+        }
+
+
+class ItemRead(MetadataRead):
+    id: str
+    urn: str | None
+    name: str | None
+    description: str | None = None
+
+
+class CodeRead(ItemRead):
+    pass
+
+
+class ConceptRead(ItemRead):
+    pass
+
+
+class CodeSearchRead(CodeRead):
+    codelist_id: str
+    codelist_agency_id: str
+    codelist_version: str
+
+
+class ConceptSearchRead(ConceptRead):
+    concept_scheme_id: str
+    concept_scheme_agency_id: str
+    concept_scheme_version: str
+
+
+class ComponentRead(MetadataRead):
+    id: str
+    urn: str | None
+    concept_id: str | None
+    concept_maintainable_parent_id: str | None
+    concept_maintainable_parent_version: str | None
+    concept_agency_id: str | None
+
+
+class RepresentableComponentRead(ComponentRead):
+    format_type: str | None
+    codelist_id: str | None
+    codelist_agency_id: str | None
+    codelist_version: str | None
+
+
+class DimensionRead(RepresentableComponentRead):
+    position: int
+
+
+class AttributeRead(RepresentableComponentRead):
+    assignment_status: str | None
+
+
+class MaintainableRead(MetadataRead):
+    id: str
+    agency_id: str
+    version: str
+    urn: str | None
+    name: str | None
+    description: str | None = None
+
+
+class DataflowRead(MaintainableRead):
+    structure_id: str | None
+    structure_agency_id: str | None
+    structure_version: str | None
+
+
+class ListFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+class DataStructureInclude(str, Enum):
+    DIMENSIONS = "dimensions"
+    TIME_DIMENSIONS = "time_dimensions"
+    ATTRIBUTES = "attributes"
+    PRIMARY_MEASURES = "primary_measures"
+
+
+class DataStructureRead(MaintainableRead):
+    dimensions: list[DimensionRead] | None = None
+    time_dimensions: list[DimensionRead] | None = None
+    attributes: list[AttributeRead] | None = None
+    primary_measures: list[ComponentRead] | None = None
+
+
+class CodelistInclude(str, Enum):
+    CODES = "codes"
+
+
+class CodelistRead(MaintainableRead):
+    codes: list[CodeRead] | None = None
+
+
+class ConceptSchemeInclude(str, Enum):
+    CONCEPTS = "concepts"
+
+
+class ConceptSchemeRead(MaintainableRead):
+    concepts: list[ConceptRead] | None = None
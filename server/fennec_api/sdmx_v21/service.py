@@ -1,10 +1,57 @@
-from typing import Sequence
+from typing import Any, AsyncIterator, Iterable, Sequence, TypeVar
+from datetime import datetime, UTC
+from functools import reduce
+import re
+from sqlalchemy import (
+    ColumnElement,
+    func,
+    inspect,
+    null,
+    or_,
+    Row,
+    Select,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 from fennec_api.core.crud import CRUDBase
-from fennec_api.sdmx_v21.models import Provider
+from fennec_api.core.database import Base
+from fennec_api.core.schemas import FennecBaseModel
+from fennec_api.sdmx_v21.etl.rollups import Aggregation, RollupFrequency
+from fennec_api.sdmx_v21.keys import KeyMatcher
+from fennec_api.sdmx_v21.models import (
+    Code,
+    Codelist,
+    Concept,
+    ConceptScheme,
+    Dataflow,
+    DataStructure,
+    Observation,
+    Provider,
+    Rollup,
+    SEARCH_CONFIGS,
+    Series,
+)
 from fennec_api.sdmx_v21.schemas import ProviderCreate, ProviderUpdate
 
+MaintainableType = TypeVar(
+    "MaintainableType", Dataflow, DataStructure, Codelist, ConceptScheme
+)
+
+SearchableType = TypeVar("SearchableType", Dataflow, Code, Concept)
+
 crud_provider = CRUDBase[Provider, ProviderCreate, ProviderUpdate](Provider)
+crud_dataflow = CRUDBase[Dataflow, FennecBaseModel, FennecBaseModel](Dataflow)
+crud_data_structure = CRUDBase[DataStructure, FennecBaseModel, FennecBaseModel](
+    DataStructure
+)
+crud_codelist = CRUDBase[Codelist, FennecBaseModel, FennecBaseModel](Codelist)
+crud_concept_scheme = CRUDBase[ConceptScheme, FennecBaseModel, FennecBaseModel](
+    ConceptScheme
+)
+crud_code = CRUDBase[Code, FennecBaseModel, FennecBaseModel](Code)
+crud_concept = CRUDBase[Concept, FennecBaseModel, FennecBaseModel](Concept)
 
 
 async def get_provider(session: AsyncSession, *, id: int) -> Provider | None:
@@ -12,9 +59,11 @@ async def get_provider(session: AsyncSession, *, id: int) -> Provider | None:
 
 
 async def list_providers(
-    session: AsyncSession, *, offset: int, limit: int
+    session: AsyncSession, *, offset: int, limit: int, cursor: str | None = None
 ) -> Sequence[Provider]:
-    return await crud_provider.get_multi(session, offset=offset, limit=limit)
+    return await crud_provider.get_multi(
+        session, offset=offset, limit=limit, cursor=cursor
+    )
 
 
 async def create_provider(session: AsyncSession, *, obj_in: ProviderCreate) -> Provider:
@@ -31,3 +80,377 @@ async def delete_provider(
     session: AsyncSession, *, db_obj: Provider | None
 ) -> Provider | None:
     return await crud_provider.delete(session, db_obj=db_obj)
+
+
+async def mark_provider_collected(
+    session: AsyncSession, *, db_obj: Provider
+) -> Provider:
+    db_obj.last_collected_at = datetime.now(UTC).replace(tzinfo=None)
+    db_obj.failure_count = 0
+    session.add(db_obj)
+    await session.commit()
+    return db_obj
+
+
+async def mark_provider_attempted(
+    session: AsyncSession, *, db_obj: Provider
+) -> Provider:
+    db_obj.last_attempted_at = datetime.now(UTC).replace(tzinfo=None)
+    session.add(db_obj)
+    await session.commit()
+    return db_obj
+
+
+async def mark_provider_failed(session: AsyncSession, *, id: int) -> None:
+    await session.execute(
+        update(Provider)
+        .where(Provider.id == id)
+        .values(failure_count=Provider.failure_count + 1)
+    )
+    await session.commit()
+
+
+async def get_dataflow(session: AsyncSession, *, flow_ref: str) -> Dataflow | None:
+    parts = flow_ref.split(",")
+    if len(parts) == 1:
+        agency_id, id, version = None, parts[0], None
+    elif len(parts) == 2:
+        agency_id, id, version = parts[0], parts[1], None
+    else:
+        agency_id, id, version = parts[0], parts[1], parts[2]
+
+    statement = select(Dataflow).where(Dataflow.id == id)
+    if agency_id and agency_id != "all":
+        statement = statement.where(Dataflow.agency_id == agency_id)
+    if version and version != "latest":
+        statement = statement.where(Dataflow.version == version)
+    return (
+        await session.scalars(statement.order_by(Dataflow.version.desc()).limit(1))
+    ).first()
+
+
+def listing_columns(model: type[Base], fields: Iterable[str]) -> list[Any]:
+    attributes = inspect(model).column_attrs
+    return [
+        getattr(model, f) if f in attributes and f != "description" else null().label(f)
+        for f in fields
+    ]
+
+
+def _agency(crud: CRUDBase[Any, Any, Any], agency_id: str | None) -> list[Any]:
+    return [crud.model.agency_id == agency_id] if agency_id else []
+
+
+def _codelist(codelist: Codelist) -> dict[str, str]:
+    return dict(
+        codelist_id=codelist.id,
+        codelist_agency_id=codelist.agency_id,
+        codelist_version=codelist.version,
+    )
+
+
+def _concept_scheme(concept_scheme: ConceptScheme) -> dict[str, str]:
+    return dict(
+        concept_scheme_id=concept_scheme.id,
+        concept_scheme_agency_id=concept_scheme.agency_id,
+        concept_scheme_version=concept_scheme.version,
+    )
+
+
+async def list_maintainables(
+    session: AsyncSession,
+    crud: CRUDBase[MaintainableType, Any, Any],
+    columns: Sequence[Any],
+    *,
+    agency_id: str | None = None,
+    limit: int,
+    cursor: str | None = None,
+) -> Sequence[Row[Any]]:
+    return await crud.get_rows(
+        session, *_agency(crud, agency_id), columns=columns, limit=limit, cursor=cursor
+    )
+
+
+def stream_maintainables(
+    session: AsyncSession,
+    crud: CRUDBase[MaintainableType, Any, Any],
+    columns: Sequence[Any],
+    *,
+    agency_id: str | None = None,
+    cursor: str | None = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    return crud.stream_rows(
+        session,
+        *_agency(crud, agency_id),
+        columns=columns,
+        cursor=cursor,
+        batch_size=batch_size,
+    )
+
+
+async def get_maintainable(
+    session: AsyncSession,
+    crud: CRUDBase[MaintainableType, Any, Any],
+    *,
+    agency_id: str,
+    id: str,
+    version: str,
+    include: Iterable[str] = (),
+) -> MaintainableType | None:
+    return await crud.get(
+        session,
+        options=[
+            *(selectinload(getattr(crud.model, i)) for i in include),
+            raiseload("*"),
+        ],
+        agency_id=agency_id,
+        id=id,
+        version=version,
+    )
+
+
+async def list_codes(
+    session: AsyncSession,
+    codelist: Codelist,
+    columns: Sequence[Any],
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> Sequence[Row[Any]]:
+    return await crud_code.get_rows(
+        session, columns=columns, limit=limit, cursor=cursor, **_codelist(codelist)
+    )
+
+
+def stream_codes(
+    session: AsyncSession,
+    codelist: Codelist,
+    columns: Sequence[Any],
+    *,
+    cursor: str | None = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    return crud_code.stream_rows(
+        session,
+        columns=columns,
+        cursor=cursor,
+        batch_size=batch_size,
+        **_codelist(codelist),
+    )
+
+
+async def list_concepts(
+    session: AsyncSession,
+    concept_scheme: ConceptScheme,
+    columns: Sequence[Any],
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> Sequence[Row[Any]]:
+    return await crud_concept.get_rows(
+        session,
+        columns=columns,
+        limit=limit,
+        cursor=cursor,
+        **_concept_scheme(concept_scheme),
+    )
+
+
+def stream_concepts(
+    session: AsyncSession,
+    concept_scheme: ConceptScheme,
+    columns: Sequence[Any],
+    *,
+    cursor: str | None = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    return crud_concept.stream_rows(
+        session,
+        columns=columns,
+        cursor=cursor,
+        batch_size=batch_size,
+        **_concept_scheme(concept_scheme),
+    )
+
+
+def search_query(q: str) -> ColumnElement[Any]:
+    return reduce(
+        lambda a, b: a.op("||")(b),
+        [func.websearch_to_tsquery(c, q) for c in SEARCH_CONFIGS],
+    )
+
+
+async def _search(
+    session: AsyncSession,
+    model: type[SearchableType],
+    columns: Sequence[Any],
+    *args: Any,
+    q: str,
+    limit: int,
+    offset: int,
+) -> Sequence[Row[Any]]:
+    query = search_query(q)
+    pattern = "%" + re.sub(r"([\\%_])", r"\\\1", q) + "%"
+    result = await session.execute(
+        select(*columns)
+        .where(
+            or_(
+                model.search_vector.bool_op("@@")(query),
+                model.id.ilike(pattern),
+                model.name.ilike(pattern),
+            ),
+            *args,
+        )
+        .order_by(
+            (func.lower(model.id) == q.lower()).desc(),
+            func.ts_rank_cd(model.search_vector, query).desc(),
+            *inspect(model).primary_key,
+        )
+        .limit(limit)
+        .offset(offset)
+    )
+    return result.all()
+
+
+async def search_dataflows(
+    session: AsyncSession,
+    columns: Sequence[Any],
+    *,
+    q: str,
+    agency_id: str | None = None,
+    limit: int,
+    offset: int = 0,
+) -> Sequence[Row[Any]]:
+    return await _search(
+        session,
+        Dataflow,
+        columns,
+        *_agency(crud_dataflow, agency_id),
+        q=q,
+        limit=limit,
+        offset=offset,
+    )
+
+
+async def search_codes(
+    session: AsyncSession,
+    columns: Sequence[Any],
+    *,
+    q: str,
+    agency_id: str | None = None,
+    limit: int,
+    offset: int = 0,
+) -> Sequence[Row[Any]]:
+    return await _search(
+        session,
+        Code,
+        columns,
+        *([Code.codelist_agency_id == agency_id] if agency_id else []),
+        q=q,
+        limit=limit,
+        offset=offset,
+    )
+
+
+async def search_concepts(
+    session: AsyncSession,
+    columns: Sequence[Any],
+    *,
+    q: str,
+    agency_id: str | None = None,
+    limit: int,
+    offset: int = 0,
+) -> Sequence[Row[Any]]:
+    return await _search(
+        session,
+        Concept,
+        columns,
+        *([Concept.concept_scheme_agency_id == agency_id] if agency_id else []),
+        q=q,
+        limit=limit,
+        offset=offset,
+    )
+
+
+async def _partitions(
+    session: AsyncSession, statement: Select[Any], batch_size: int
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    result = await session.stream(statement.execution_options(yield_per=batch_size))
+    async for rows in result.partitions(batch_size):
+        yield rows
+
+
+def stream_observations(
+    session: AsyncSession,
+    *,
+    partition_id: int,
+    matcher: KeyMatcher,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    batch_size: int = 10_000,
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    statement = (
+        select(
+            Series.key,
+            Series.attributes.label("series_attributes"),
+            Observation.time_period,
+            Observation.obs_value,
+            Observation.attributes,
+        )
+        .join(Series, Series.id == Observation.series_id)
+        .where(
+            Observation.partition_id == partition_id,
+            Series.partition_id == partition_id,
+            matcher.clause(),
+        )
+        .order_by(Observation.series_id, Observation.period_start)
+    )
+    if start:
+        statement = statement.where(Observation.period_start >= start)
+    if end:
+        statement = statement.where(Observation.period_start < end)
+    return _partitions(session, statement, batch_size)
+
+
+ROLLUP_VALUES: dict[Aggregation, Any] = {
+    Aggregation.SUM: Rollup.obs_sum,
+    Aggregation.MEAN: Rollup.obs_sum / Rollup.observations,
+    Aggregation.FIRST: Rollup.obs_first,
+    Aggregation.LAST: Rollup.obs_last,
+}
+
+
+def stream_rollups(
+    session: AsyncSession,
+    *,
+    partition_id: int,
+    matcher: KeyMatcher,
+    frequency: RollupFrequency,
+    aggregation: Aggregation,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    batch_size: int = 10_000,
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    statement = (
+        select(
+            Series.key,
+            Series.attributes.label("series_attributes"),
+            Rollup.time_period,
+            ROLLUP_VALUES[aggregation].label("obs_value"),
+            null().label("attributes"),
+        )
+        .join(Series, Series.id == Rollup.series_id)
+        .where(
+            Rollup.partition_id == partition_id,
+            Series.partition_id == partition_id,
+            Rollup.frequency == frequency.value,
+            matcher.clause(),
+        )
+        .order_by(Rollup.series_id, Rollup.period_start)
+    )
+    if start:
+        statement = statement.where(Rollup.period_start >= start)
+    if end:
+        statement = statement.where(Rollup.period_start < end)
+    return _partitions(session, statement, batch_size)
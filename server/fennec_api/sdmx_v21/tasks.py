@@ -1,13 +1,114 @@
-from typing import Any
+from typing import Any, Iterable
+import asyncio
+import logging
+import time
+import zlib
+from datetime import datetime, timedelta, UTC
 from sqlalchemy.ext.asyncio import AsyncSession
-from httpx import AsyncClient
+from httpx import AsyncClient, HTTPStatusError
 from arq.connections import ArqRedis
-from fennec_api.sdmx_v21.client import SDMX21RestClient
+from arq.constants import job_key_prefix
+from arq.jobs import Job
+from fennec_api.core.config import settings
+from fennec_api.core.database import engine
+from fennec_api.etl.postgres import try_advisory_lock
+from fennec_api.etl.metrics import current_provider, QUEUE_WAIT
+from fennec_api.etl.memory import checkpoint, profile_memory as memory_profiling
+from fennec_api.sdmx_v21.client import SDMX21RestClient, WireFormat
+from fennec_api.sdmx_v21.exceptions import SDMXRestProviderError
+from fennec_api.sdmx_v21.models import Provider
+from fennec_api.sdmx_v21.scheduler import plan_harvests
 import fennec_api.sdmx_v21.etl as etl
 import fennec_api.sdmx_v21.service as service
 
+logger = logging.getLogger(__name__)
 
-async def collect_provider(ctx: dict[str, Any], provider_id: int) -> None:
+COLLECT_PROVIDER_LOCK_NAMESPACE = zlib.crc32(b"collect_provider") & 0x7FFFFFFF
+
+
+def collect_provider_job_id(provider_id: int) -> str:
+    return f"collect_provider:{provider_id}"
+
+
+async def enqueue_collect_provider(
+    redis: ArqRedis,
+    provider_id: int,
+    *,
+    defer_by: timedelta | None = None,
+    profile_memory: bool = False,
+) -> Job:
+    job_id = collect_provider_job_id(provider_id)
+    kwargs: dict[str, Any] = {"profile_memory": True} if profile_memory else {}
+    job = await redis.enqueue_job(
+        "collect_provider", provider_id, _job_id=job_id, _defer_by=defer_by, **kwargs
+    )
+    if job is None:
+        logger.info("Provider %d collection already queued, coalescing", provider_id)
+        return Job(job_id, redis)
+    return job
+
+
+async def harvest_provider(
+    session: AsyncSession, sdmx_client: SDMX21RestClient, provider: Provider
+) -> None:
+    agency_id = provider.agency_id if not provider.process_all_agencies else None
+
+    dataflows = await etl.fetch_all_dataflows(sdmx_client, agency_id)
+    await etl.load_dataflows(session, dataflows)
+    checkpoint("load_dataflows")
+
+    if provider.bulk_download:
+        dsds = await etl.fetch_all_data_structures(sdmx_client, agency_id)
+        await etl.load_data_structures(session, dsds)
+        checkpoint("load_data_structures")
+
+        codelists = await etl.fetch_all_codelists(sdmx_client, agency_id)
+        await etl.load_codelists(session, codelists)
+        checkpoint("load_codelists")
+
+        concept_schemes = await etl.fetch_all_concept_schemes(sdmx_client, agency_id)
+        await etl.load_concept_schemes(session, concept_schemes)
+        checkpoint("load_concept_schemes")
+    else:
+        dsds = [
+            await etl.fetch_data_structure(sdmx_client, ref)
+            for ref in etl.extract_data_structure_refs(dataflows)
+        ]
+        await etl.load_data_structures(session, dsds)
+        checkpoint("load_data_structures")
+
+        codelists = await etl.fetch_codelists(
+            sdmx_client, etl.extract_codelist_refs(dsds)
+        )
+        await etl.load_codelists(session, codelists)
+        checkpoint("load_codelists")
+
+        concept_schemes = await etl.fetch_concept_schemes(
+            sdmx_client, etl.extract_concept_refs(dsds)
+        )
+        await etl.load_concept_schemes(session, concept_schemes)
+        checkpoint("load_concept_schemes")
+
+    try:
+        constraints = await etl.fetch_all_content_constraints(sdmx_client, agency_id)
+    except (HTTPStatusError, SDMXRestProviderError) as e:
+        logger.info("Provider %s has no content constraints: %s", provider.agency_id, e)
+    else:
+        await etl.load_content_constraints(session, constraints)
+        checkpoint("load_content_constraints")
+
+    if not provider.skip_categories:
+        categorisations = await etl.fetch_all_categorisations(sdmx_client, agency_id)
+        await etl.load_categorisations(session, categorisations)
+        checkpoint("load_categorisations")
+        category_schemes = await etl.fetch_all_category_schemes(sdmx_client, agency_id)
+        await etl.load_category_schemes(session, category_schemes)
+        checkpoint("load_category_schemes")
+
+
+async def collect_provider(
+    ctx: dict[str, Any], provider_id: int, profile_memory: bool | None = None
+) -> None:
     session: AsyncSession = ctx["session"]
 
     provider = await service.get_provider(session, id=provider_id)
@@ -15,59 +116,71 @@ async def collect_provider(ctx: dict[str, Any], provider_id: int) -> None:
     if not provider:
         return
 
-    agency_id = provider.agency_id if not provider.process_all_agencies else None
-
-    async with AsyncClient() as http_client:
-        sdmx_client = SDMX21RestClient(
-            http_client=http_client, root_url=provider.root_url
+    current_provider.set(str(provider.id))
+    if "score" in ctx:
+        QUEUE_WAIT.observe(
+            max(time.time() - ctx["score"] / 1000, 0), provider=str(provider.id)
         )
-        dataflows = await etl.fetch_all_dataflows(sdmx_client, agency_id)
-        await etl.load_dataflows(session, dataflows)
-
-        if provider.bulk_download:
-            dsds = await etl.fetch_all_data_structures(sdmx_client, agency_id)
-            await etl.load_data_structures(session, dsds)
-
-            codelists = await etl.fetch_all_codelists(sdmx_client, agency_id)
-            await etl.load_codelists(session, codelists)
-
-            concept_schemes = await etl.fetch_all_concept_schemes(
-                sdmx_client, agency_id
-            )
-            await etl.load_concept_schemes(session, concept_schemes)
-        else:
-            dsds = [
-                await etl.fetch_data_structure(sdmx_client, ref)
-                for ref in etl.extract_data_structure_refs(dataflows)
-            ]
-            await etl.load_data_structures(session, dsds)
-
-            codelists = await etl.fetch_codelists(
-                sdmx_client, etl.extract_codelist_refs(dsds)
-            )
-            await etl.load_codelists(session, codelists)
-
-            concept_schemes = await etl.fetch_concept_schemes(
-                sdmx_client, etl.extract_concept_refs(dsds)
-            )
-            await etl.load_concept_schemes(session, concept_schemes)
-
-        if not provider.skip_categories:
-            categorisations = await etl.fetch_all_categorisations(
-                sdmx_client, agency_id
-            )
-            await etl.load_categorisations(session, categorisations)
-            category_schemes = await etl.fetch_all_category_schemes(
-                sdmx_client, agency_id
-            )
-            await etl.load_category_schemes(session, category_schemes)
-
-
-async def collect_metadata(ctx: dict[str, Any]) -> None:
+
+    async with engine.connect() as connection, try_advisory_lock(
+        connection, COLLECT_PROVIDER_LOCK_NAMESPACE, provider_id
+    ) as acquired:
+        if not acquired:
+            logger.info("Provider %d is already being collected, skipping", provider_id)
+            return
+
+        await service.mark_provider_attempted(session, db_obj=provider)
+        try:
+            async with AsyncClient() as http_client:
+                sdmx_client = SDMX21RestClient(
+                    http_client=http_client,
+                    root_url=provider.root_url,
+                    wire_format=WireFormat(provider.wire_format),
+                )
+                async with memory_profiling(
+                    settings.HARVEST_MEMORY_PROFILING
+                    if profile_memory is None
+                    else profile_memory
+                ):
+                    await harvest_provider(session, sdmx_client, provider)
+        # arq cancels the job on job_timeout, which is not an Exception
+        except BaseException:
+            await session.rollback()
+            await service.mark_provider_failed(session, id=provider_id)
+            raise
+
+        await service.mark_provider_collected(session, db_obj=provider)
+
+
+async def get_in_flight_provider_ids(
+    redis: ArqRedis, provider_ids: Iterable[int]
+) -> set[int]:
+    ids = list(provider_ids)
+    exists = await asyncio.gather(
+        *(redis.exists(job_key_prefix + collect_provider_job_id(id)) for id in ids)
+    )
+    return {id for id, e in zip(ids, exists) if e}
+
+
+async def schedule_harvests(ctx: dict[str, Any]) -> None:
     session: AsyncSession = ctx["session"]
     redis: ArqRedis = ctx["redis"]
 
     providers = await service.list_providers(session, offset=0, limit=-1)
-
-    for provider in providers:
-        await redis.enqueue_job("collect_provider", provider.id)
+    in_flight = await get_in_flight_provider_ids(redis, (p.id for p in providers))
+
+    plans = plan_harvests(
+        providers,
+        now=datetime.now(UTC).replace(tzinfo=None),
+        in_flight=in_flight,
+        max_concurrency=settings.HARVEST_MAX_CONCURRENCY,
+        max_per_host=settings.HARVEST_MAX_PER_HOST,
+        jitter=settings.HARVEST_JITTER,
+        night_start_hour=settings.HARVEST_NIGHT_START_HOUR,
+        night_end_hour=settings.HARVEST_NIGHT_END_HOUR,
+        schedule_interval=settings.HARVEST_SCHEDULE_INTERVAL,
+        retry_delay=timedelta(minutes=settings.HARVEST_RETRY_DELAY),
+    )
+
+    for plan in plans:
+        await enqueue_collect_provider(redis, plan.provider_id, defer_by=plan.defer_by)
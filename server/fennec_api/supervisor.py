@@ -0,0 +1,198 @@
+from typing import Callable, Sequence, cast
+import argparse
+import asyncio
+import logging
+import logging.config
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from types import FrameType
+from multiprocessing.context import SpawnProcess
+from arq.constants import default_queue_name, health_check_key_suffix
+from arq.logs import default_log_config
+from arq.typing import WorkerSettingsType
+from arq.worker import async_check_health, run_worker
+from fennec_api.core.config import settings
+from fennec_api.core.arq import redis_settings
+
+logger = logging.getLogger(__name__)
+
+WorkerTarget = Callable[[int, int, int], None]
+
+
+def build_health_check_key(index: int) -> str:
+    return f"{default_queue_name}{health_check_key_suffix}:{index}"
+
+
+def run(index: int, max_jobs: int, job_timeout: int) -> None:
+    from fennec_api.worker import WorkerSettings
+
+    logging.config.dictConfig(default_log_config(verbose=False))
+    run_worker(
+        cast(WorkerSettingsType, WorkerSettings),
+        max_jobs=max_jobs,
+        job_timeout=job_timeout,
+        health_check_key=build_health_check_key(index),
+        ctx={"worker_index": index},
+    )
+
+
+class Supervisor:
+    def __init__(
+        self,
+        *,
+        processes: int,
+        max_jobs: int,
+        job_timeout: int,
+        shutdown_timeout: int,
+        target: WorkerTarget = run,
+        poll_interval: float = 1.0,
+        min_uptime: float = 10.0,
+        restart_backoff: float = 1.0,
+        max_restart_backoff: float = 60.0,
+        max_fast_failures: int = 5,
+    ) -> None:
+        self.processes = processes
+        self.max_jobs = max_jobs
+        self.job_timeout = job_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self.target = target
+        self.poll_interval = poll_interval
+        self.min_uptime = min_uptime
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.max_fast_failures = max_fast_failures
+        self.workers: dict[int, SpawnProcess] = {}
+        self.started_at: dict[int, float] = {}
+        self.fast_failures: dict[int, int] = {}
+        self.restart_at: dict[int, float] = {}
+        self.exit_code = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = False
+
+    def spawn(self, index: int) -> SpawnProcess:
+        process = self._context.Process(
+            target=self.target,
+            args=(index, self.max_jobs, self.job_timeout),
+            name=f"arq-worker-{index}",
+        )
+        process.start()
+        self.workers[index] = process
+        self.started_at[index] = time.monotonic()
+        self.restart_at.pop(index, None)
+        logger.info("Started worker %d (pid %s)", index, process.pid)
+        return process
+
+    def start(self) -> None:
+        for index in range(self.processes):
+            self.spawn(index)
+
+    def stop(self, signum: int | None = None, frame: FrameType | None = None) -> None:
+        self._stopping = True
+
+    def restart_dead_workers(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        for index, process in list(self.workers.items()):
+            if process.is_alive():
+                continue
+            if index not in self.restart_at:
+                if now - self.started_at[index] < self.min_uptime:
+                    self.fast_failures[index] = self.fast_failures.get(index, 0) + 1
+                else:
+                    self.fast_failures[index] = 0
+                failures = self.fast_failures[index]
+                if failures >= self.max_fast_failures:
+                    logger.error(
+                        "Worker %d failed %d times in a row at startup, giving up",
+                        index,
+                        failures,
+                    )
+                    self.exit_code = 1
+                    self._stopping = True
+                    return
+                delay = (
+                    min(
+                        self.restart_backoff * 2 ** (failures - 1),
+                        self.max_restart_backoff,
+                    )
+                    if failures
+                    else 0.0
+                )
+                self.restart_at[index] = now + delay
+                logger.warning(
+                    "Worker %d (pid %s) exited with code %s, restarting in %.1fs",
+                    index,
+                    process.pid,
+                    process.exitcode,
+                    delay,
+                )
+            if self.restart_at[index] <= now:
+                self.spawn(index)
+
+    def shutdown(self) -> None:
+        for process in self.workers.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout + self.poll_interval
+        for index, process in self.workers.items():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning("Worker %d did not stop in time, killing it", index)
+                process.kill()
+                process.join()
+
+    def supervise(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.start()
+        while not self._stopping:
+            time.sleep(self.poll_interval)
+            if not self._stopping:
+                self.restart_dead_workers()
+        self.shutdown()
+        return self.exit_code
+
+
+async def check_health(processes: int) -> int:
+    results = await asyncio.gather(
+        *(
+            async_check_health(redis_settings, build_health_check_key(index))
+            for index in range(processes)
+        )
+    )
+    return max(results, default=0)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a pool of arq workers")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.WORKER_PROCESSES or os.cpu_count() or 1,
+    )
+    parser.add_argument("--max-jobs", type=int, default=settings.WORKER_MAX_JOBS)
+    parser.add_argument("--job-timeout", type=int, default=settings.WORKER_JOB_TIMEOUT)
+    parser.add_argument(
+        "--check", action="store_true", help="Check the health of every worker"
+    )
+    args = parser.parse_args(argv)
+
+    logging.config.dictConfig(default_log_config(verbose=False))
+
+    if args.check:
+        sys.exit(asyncio.run(check_health(args.processes)))
+
+    supervisor = Supervisor(
+        processes=args.processes,
+        max_jobs=args.max_jobs,
+        job_timeout=args.job_timeout,
+        shutdown_timeout=settings.WORKER_SHUTDOWN_TIMEOUT,
+    )
+    sys.exit(supervisor.supervise())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,42 @@
 from typing import Any
+from arq import cron, func
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from fennec_api.core.database import SessionLocal
+from fennec_api.core import queue
+from fennec_api.core.config import settings
+from fennec_api.core.database import SessionLocal, engine
 from fennec_api.core.arq import redis_settings
-from fennec_api.sdmx_v21.tasks import collect_provider
+from fennec_api.core.metrics import start_metrics_server
+from fennec_api.core.tracing import init_sentry
+from fennec_api.sdmx_v21.tasks import collect_provider, schedule_harvests
+
+init_sentry()
 
 
 async def startup(ctx: dict[str, Any]) -> None:
-    ctx["session"] = SessionLocal()
+    queue.pool = ctx["redis"]
+    if settings.WORKER_METRICS_PORT is not None:
+        ctx["metrics_server"] = await start_metrics_server(
+            settings.WORKER_METRICS_HOST,
+            settings.WORKER_METRICS_PORT + ctx.get("worker_index", 0),
+        )
 
 
 async def shutdown(ctx: dict[str, Any]) -> None:
+    queue.pool = None
+    if "metrics_server" in ctx:
+        ctx["metrics_server"].close()
+        await ctx["metrics_server"].wait_closed()
+    await engine.dispose()
+
+
+async def on_job_start(ctx: dict[str, Any]) -> None:
+    ctx["session"] = SessionLocal()
+
+
+async def on_job_end(ctx: dict[str, Any]) -> None:
     session: AsyncSession = ctx["session"]
-    await session.aclose()
+    await session.close()
 
 
 async def health_check_task(ctx: dict[str, Any]) -> None:
@@ -21,7 +45,19 @@ async def health_check_task(ctx: dict[str, Any]) -> None:
 
 
 class WorkerSettings:
-    functions = [health_check_task, collect_provider]
+    functions = [health_check_task, func(collect_provider, keep_result=0)]
+    cron_jobs = [
+        cron(
+            schedule_harvests,
+            minute=set(range(0, 60, settings.HARVEST_SCHEDULE_INTERVAL)),
+            unique=True,
+        )
+    ]
     on_startup = startup
     on_shutdown = shutdown
+    on_job_start = on_job_start
+    on_job_end = on_job_end
+    max_jobs = settings.WORKER_MAX_JOBS
+    job_timeout = settings.WORKER_JOB_TIMEOUT
+    job_completion_wait = settings.WORKER_SHUTDOWN_TIMEOUT
     redis_settings = redis_settings
@@ -1,4 +1,5 @@
 import asyncio
+from typing import Any
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -39,6 +40,15 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(
+    obj: Any, name: str | None, type_: str, reflected: bool, compare_to: Any
+) -> bool:
+    # pg_trgm indexes are created by migrations but not declared on the models
+    return not (
+        type_ == "index" and reflected and name is not None and name.endswith("_trgm")
+    )
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -55,6 +65,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -64,7 +75,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,35 @@
+"""chunk series availability
+
+Revision ID: 3b9e41c7d052
+Revises: fd256a51219a
+Create Date: 2026-10-19 12:13:41.208517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e41c7d052'
+down_revision: Union[str, None] = 'fd256a51219a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing bitmaps are dropped and rebuilt chunked on the next load.
+    op.execute('DELETE FROM sdmxv21_series_availability')
+    op.execute('UPDATE sdmxv21_observation_partition SET series_count = NULL')
+    op.add_column('sdmxv21_series_availability', sa.Column('chunk', sa.Integer(), nullable=False))
+    op.drop_constraint('pk_sdmxv21_series_availability', 'sdmxv21_series_availability', type_='primary')
+    op.create_primary_key('pk_sdmxv21_series_availability', 'sdmxv21_series_availability', ['partition_id', 'position', 'ordinal', 'chunk'])
+
+
+def downgrade() -> None:
+    op.execute('DELETE FROM sdmxv21_series_availability')
+    op.execute('UPDATE sdmxv21_observation_partition SET series_count = NULL')
+    op.drop_constraint('pk_sdmxv21_series_availability', 'sdmxv21_series_availability', type_='primary')
+    op.drop_column('sdmxv21_series_availability', 'chunk')
+    op.create_primary_key('pk_sdmxv21_series_availability', 'sdmxv21_series_availability', ['partition_id', 'position', 'ordinal'])
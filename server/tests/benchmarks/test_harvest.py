@@ -0,0 +1,38 @@
+from typing import Any
+from benchmarks.harvest import baseline_path, compare_to_baseline
+from fennec_api.sdmx_v21.client import WireFormat
+
+
+def make_report(wall_time: float, upsert: float, parse: float) -> dict[str, Any]:
+    return {
+        "wall_time": wall_time,
+        "peak_rss": 100,
+        "stages": {
+            "upsert.sdmxv21_code": {"seconds": upsert, "rows": 10},
+            "parse.codelist": {"seconds": parse, "messages": 1},
+        },
+    }
+
+
+def test_baseline_path() -> None:
+    assert baseline_path("10k", True).name == "harvest-10k-bulk.json"
+    assert baseline_path("10k", False).name == "harvest-10k-refs.json"
+    assert (
+        baseline_path("10k", True, WireFormat.JSON).name == "harvest-10k-bulk-json.json"
+    )
+
+
+def test_compare_to_baseline() -> None:
+    baseline = make_report(2, 1, 0.01)
+
+    assert not compare_to_baseline(
+        make_report(2.2, 1.1, 0.05), baseline, tolerance=0.25, min_seconds=0.1
+    )
+
+    regressions = compare_to_baseline(
+        make_report(3, 2, 0.05), baseline, tolerance=0.25, min_seconds=0.1
+    )
+    assert [r.split(":")[0] for r in regressions] == [
+        "wall_time",
+        "upsert.sdmxv21_code.seconds",
+    ]
@@ -1,46 +1,23 @@
-from dotenv import load_dotenv
-
-load_dotenv(".unittest.env", override=True)
-
-import asyncio
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator
 import pytest
 import pytest_asyncio
-from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
 from httpx import AsyncClient, ASGITransport
-from fennec_api.core.database import Base, engine
-from fennec_api.core.dependencies import get_session
+from fennec_api.core.dependencies import get_session, get_session_factory
 from fennec_api.core.security import get_password_hash
 from fennec_api.main import app
 from fennec_api.users.models import User
 from fennec_api.auth.service import create_access_token
 
 
-@pytest_asyncio.fixture()
-async def connection() -> AsyncGenerator[AsyncConnection, None]:
-    async with engine.connect() as connection:
-        await connection.run_sync(Base.metadata.drop_all)
-        await connection.run_sync(Base.metadata.create_all)
-        yield connection
-        await connection.rollback()
-
-
-@pytest_asyncio.fixture()
-async def session(connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSession(connection, expire_on_commit=False) as session:
-        yield session
-
-
 @pytest_asyncio.fixture(autouse=True)
-async def override_dependencies(session: AsyncSession) -> None:
+async def override_dependencies(
+    connection: AsyncConnection, session: AsyncSession
+) -> None:
     app.dependency_overrides[get_session] = lambda: session
-
-
-@pytest.fixture(scope="session", autouse=True)
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+    app.dependency_overrides[get_session_factory] = lambda: async_sessionmaker(
+        connection, expire_on_commit=False
+    )
 
 
 @pytest_asyncio.fixture()
@@ -0,0 +1,75 @@
+from typing import AsyncGenerator, cast
+import pytest
+import pytest_asyncio
+from arq.connections import ArqRedis
+from fastapi import Request
+from fennec_api.core import queue
+from fennec_api.core.cache import (
+    cached_response,
+    generation_key,
+    generation_ttl,
+    invalidate,
+    tag,
+)
+from tests.sdmx_v21.conftest import FakeArqRedis
+
+TAGS = [tag("codelist", "SYNTH", "CL_FREQ")]
+
+
+@pytest_asyncio.fixture()
+async def redis() -> AsyncGenerator[FakeArqRedis, None]:
+    redis = FakeArqRedis()
+    queue.pool = cast(ArqRedis, redis)
+    yield redis
+    queue.pool = None
+
+
+def make_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/sdmx/codelists/SYNTH/CL_FREQ/1.0",
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_render(redis: FakeArqRedis) -> None:
+    renders: list[bytes] = []
+
+    async def stale() -> tuple[bytes, dict[str, str]]:
+        await invalidate(TAGS)
+        renders.append(b"stale")
+        return b"stale", {}
+
+    async def fresh() -> tuple[bytes, dict[str, str]]:
+        renders.append(b"fresh")
+        return b"fresh", {}
+
+    r = await cached_response(make_request(), tags=TAGS, render=stale)
+    assert r.body == b"stale"
+    r = await cached_response(make_request(), tags=TAGS, render=fresh)
+    assert r.body == b"fresh"
+    r = await cached_response(make_request(), tags=TAGS, render=fresh)
+    assert r.body == b"fresh"
+    assert renders == [b"stale", b"fresh"]
+
+
+@pytest.mark.asyncio
+async def test_generation_expires(redis: FakeArqRedis) -> None:
+    async def render() -> tuple[bytes, dict[str, str]]:
+        return b"codelist", {}
+
+    key = generation_key(TAGS[0])
+    await cached_response(make_request(), tags=TAGS, render=render)
+    assert key not in redis.ttls
+
+    await invalidate(TAGS)
+    assert redis.ttls[key] == generation_ttl()
+
+    del redis.ttls[key]
+    await cached_response(make_request(), tags=TAGS, render=render)
+    assert redis.ttls[key] == generation_ttl()
@@ -0,0 +1,10 @@
+import pytest
+from pydantic import ValidationError
+from fennec_api.core.config import Settings
+
+
+@pytest.mark.parametrize("interval", [0, 7, 90])
+def test_harvest_schedule_interval_divides_hour(interval: int) -> None:
+    with pytest.raises(ValidationError, match="must divide 60 minutes"):
+        Settings(HARVEST_SCHEDULE_INTERVAL=interval)
+    assert Settings(HARVEST_SCHEDULE_INTERVAL=15).HARVEST_SCHEDULE_INTERVAL == 15
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core.crud import CRUDBase, decode_cursor, encode_cursor
+from fennec_api.core.schemas import FennecBaseModel
+from fennec_api.sdmx_v21.models import Codelist
+
+crud_codelist = CRUDBase[Codelist, FennecBaseModel, FennecBaseModel](Codelist)
+
+
+def test_cursor() -> None:
+    assert decode_cursor(encode_cursor(("CL_FREQ", "SDMX", "1.0"))) == [
+        "CL_FREQ",
+        "SDMX",
+        "1.0",
+    ]
+    assert decode_cursor(encode_cursor([12])) == [12]
+    for cursor in ["", "!!", encode_cursor([]).rstrip("W") + "e30", "eyJhIjoxfQ"]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination(session: AsyncSession) -> None:
+    session.add_all(
+        Codelist(id=f"CL_{i:02d}", agency_id=agency_id, version="1.0")
+        for i in range(5)
+        for agency_id in ("A", "B")
+    )
+    await session.commit()
+
+    pages = []
+    cursor = None
+    while page := await crud_codelist.get_multi(session, limit=3, cursor=cursor):
+        pages.append([(c.id, c.agency_id) for c in page])
+        cursor = crud_codelist.cursor(page[-1])
+    assert [len(p) for p in pages] == [3, 3, 3, 1]
+    assert sum(pages, []) == [
+        (f"CL_{i:02d}", agency_id) for i in range(5) for agency_id in ("A", "B")
+    ]
+
+    cursor = encode_cursor(["CL_02", "A", "1.0"])
+    assert [
+        (c.id, c.agency_id)
+        for c in await crud_codelist.get_multi(
+            session, agency_id="A", limit=2, cursor=cursor
+        )
+    ] == [("CL_03", "A"), ("CL_04", "A")]
+    assert [
+        (c.id, c.agency_id)
+        async for c in crud_codelist.stream_multi(session, cursor=cursor, batch_size=2)
+    ] == [("CL_02", "B")] + [
+        (f"CL_{i:02d}", agency_id) for i in range(3, 5) for agency_id in ("A", "B")
+    ]
+
+    for cursor in [encode_cursor(["CL_02", "A"]), encode_cursor(["CL_02", "A", 1])]:
+        with pytest.raises(ValueError):
+            await crud_codelist.get_multi(session, cursor=cursor)
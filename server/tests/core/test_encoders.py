@@ -0,0 +1,29 @@
+from typing import Any, AsyncIterator, Sequence
+import orjson
+import pytest
+from fennec_api.core.encoders import encode_json, encode_ndjson, stream_ndjson
+
+FIELDS = ["id", "name"]
+ROWS = [("A", "Annual", "CL_FREQ"), ("M", None, "CL_FREQ")]
+
+
+def test_encode_json() -> None:
+    assert orjson.loads(encode_json(FIELDS, ROWS)) == [
+        {"id": "A", "name": "Annual"},
+        {"id": "M", "name": None},
+    ]
+    assert encode_json(FIELDS, []) == b"[]"
+
+
+@pytest.mark.asyncio
+async def test_stream_ndjson() -> None:
+    async def batches() -> AsyncIterator[Sequence[Sequence[Any]]]:
+        yield ROWS[:1]
+        yield ROWS[1:]
+
+    content = b"".join([chunk async for chunk in stream_ndjson(FIELDS, batches())])
+    assert content == encode_ndjson(FIELDS, ROWS)
+    assert content.splitlines() == [
+        b'{"id":"A","name":"Annual"}',
+        b'{"id":"M","name":null}',
+    ]
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from fennec_api.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    registry,
+    start_metrics_server,
+)
+
+
+def test_counter() -> None:
+    counter = Counter("fetched_bytes_total", "Fetched bytes", ["provider"])
+    counter.inc(10, provider="1")
+    counter.inc(5, provider="1")
+    counter.inc(provider='"2"')
+    assert counter.get(provider="1") == 15
+    assert counter.render() == "\n".join(
+        [
+            "# HELP fetched_bytes_total Fetched bytes",
+            "# TYPE fetched_bytes_total counter",
+            'fetched_bytes_total{provider="1"} 15.0',
+            'fetched_bytes_total{provider="\\"2\\""} 1.0',
+        ]
+    )
+
+    with pytest.raises(ValueError):
+        counter.inc(artefact="codelist")
+
+
+def test_gauge() -> None:
+    gauge = Gauge("peak_memory_bytes", "Peak memory")
+    gauge.set(10)
+    gauge.set(3)
+    assert gauge.get() == 3
+    assert gauge.render().endswith("peak_memory_bytes 3.0")
+
+
+def test_histogram() -> None:
+    histogram = Histogram(
+        "parse_duration_seconds", "Parse duration", ["artefact"], buckets=[0.1, 1]
+    )
+    histogram.observe(0.05, artefact="codelist")
+    histogram.observe(0.5, artefact="codelist")
+    histogram.observe(2, artefact="codelist")
+    with histogram.time(artefact="dataflow"):
+        pass
+
+    assert histogram.count(artefact="codelist") == 3
+    assert histogram.sum(artefact="codelist") == 2.55
+    assert histogram.count(artefact="dataflow") == 1
+    assert (
+        'parse_duration_seconds_bucket{artefact="codelist",le="0.1"} 1.0'
+        in histogram.render()
+    )
+    assert (
+        'parse_duration_seconds_bucket{artefact="codelist",le="1.0"} 2.0'
+        in histogram.render()
+    )
+    assert (
+        'parse_duration_seconds_bucket{artefact="codelist",le="+Inf"} 3.0'
+        in histogram.render()
+    )
+    assert 'parse_duration_seconds_count{artefact="codelist"} 3.0' in histogram.render()
+
+
+def test_registry() -> None:
+    test_registry = Registry()
+    counter = test_registry.register(Counter("jobs_total", "Jobs"))
+    counter.inc()
+    assert test_registry.render() == (
+        "# HELP jobs_total Jobs\n# TYPE jobs_total counter\njobs_total 1.0\n"
+    )
+    with pytest.raises(ValueError):
+        test_registry.register(Counter("jobs_total", "Jobs"))
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(test_client: AsyncClient) -> None:
+    r = await test_client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert r.text == registry.render()
+
+
+@pytest.mark.asyncio
+async def test_metrics_server() -> None:
+    server = await start_metrics_server("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            r = await client.get("/metrics")
+            assert r.status_code == 200
+            assert "etl_upserted_rows_total" in r.text
+
+            r = await client.get("/other")
+            assert r.status_code == 404
+    finally:
+        server.close()
+        await asyncio.wait_for(server.wait_closed(), timeout=1)
@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING
+from datetime import datetime, timedelta
+import pytest
+from fennec_api.core.config import settings
+from fennec_api.core.tracing import traces_sampler, before_send_transaction
+
+if TYPE_CHECKING:
+    from sentry_sdk._types import Event
+
+START = datetime(2024, 9, 1, 12, 0)
+
+
+def make_event(duration: float, status: str | None = "ok") -> "Event":
+    return {
+        "type": "transaction",
+        "start_timestamp": START,
+        "timestamp": START + timedelta(seconds=duration),
+        "contexts": {"trace": {"status": status}},
+    }
+
+
+def test_traces_sampler() -> None:
+    assert traces_sampler({"parent_sampled": True}) == 1.0
+    assert traces_sampler({"parent_sampled": False}) == 0.0
+    assert traces_sampler({}) == settings.SENTRY_TRACES_SAMPLE_RATE
+    assert traces_sampler({"asgi_scope": {"path": "/metrics"}}) == 0
+    assert traces_sampler({"asgi_scope": {"path": "/api/v1/health"}}) == 0
+    assert (
+        traces_sampler({"asgi_scope": {"path": "/api/v1/sdmx/providers"}})
+        == settings.SENTRY_TRACES_SAMPLE_RATE
+    )
+
+
+def test_before_send_transaction(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SENTRY_TAIL_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "SENTRY_SLOW_TRANSACTION_THRESHOLD", 1.0)
+
+    assert before_send_transaction(make_event(0.1), {}) is None
+    assert before_send_transaction(make_event(2.0), {}) is not None
+    assert before_send_transaction(make_event(0.1, "internal_error"), {}) is not None
+
+    monkeypatch.setattr(settings, "SENTRY_TAIL_SAMPLE_RATE", 1.0)
+    assert before_send_transaction(make_event(0.1), {}) is not None
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import os
+import tracemalloc
+import pytest
+from fennec_api.etl.memory import (
+    checkpoint,
+    current_rss,
+    MemoryProfiler,
+    profile_memory,
+)
+from fennec_api.etl.metrics import current_provider, MEMORY_RSS, MEMORY_TRACED_PEAK
+
+
+def test_current_rss(monkeypatch: pytest.MonkeyPatch) -> None:
+    rss = current_rss()
+    assert rss is not None and rss > 0
+
+    def sysconf(name: str) -> int:
+        raise ValueError(name)
+
+    monkeypatch.setattr(os, "sysconf", sysconf)
+    assert current_rss() is None
+
+
+@pytest.mark.asyncio
+async def test_profile_memory_disabled() -> None:
+    async with profile_memory(False):
+        assert not tracemalloc.is_tracing()
+        checkpoint("disabled")
+
+    assert MEMORY_RSS.get(provider="", stage="disabled") == 0
+
+
+@pytest.mark.asyncio
+async def test_profile_memory_enabled(caplog: pytest.LogCaptureFixture) -> None:
+    token = current_provider.set("ECB")
+    try:
+        with caplog.at_level(logging.INFO, logger="fennec_api.etl.memory"):
+            async with profile_memory(True):
+                assert tracemalloc.is_tracing()
+                data = [bytes(1024) for _ in range(1024)]
+                checkpoint("allocate")
+                del data
+        assert not tracemalloc.is_tracing()
+    finally:
+        current_provider.reset(token)
+
+    assert MEMORY_RSS.get(provider="ECB", stage="allocate") > 0
+    assert MEMORY_TRACED_PEAK.get(provider="ECB", stage="allocate") >= 1024 * 1024
+    assert "Provider ECB stage allocate" in caplog.text
+
+
+def test_memory_profiler_reference_count() -> None:
+    first, second = MemoryProfiler(True), MemoryProfiler(True)
+    first.start()
+    second.start()
+    first.stop()
+    assert tracemalloc.is_tracing()
+    second.stop()
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_profile_memory_exclusive() -> None:
+    events: list[str] = []
+
+    async def harvest(name: str, enabled: bool) -> None:
+        async with profile_memory(enabled):
+            events.append(f"start {name}")
+            await asyncio.sleep(0.01)
+            events.append(f"end {name}")
+
+    await asyncio.gather(harvest("a", False), harvest("b", True), harvest("c", False))
+
+    assert events == ["start a", "end a", "start b", "end b", "start c", "end c"]
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,96 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from fennec_api.etl.periods import PeriodParser, period_bounds, period_start
+
+
+@pytest.mark.parametrize(
+    "time_period,start,end",
+    [
+        ("2022", datetime(2022, 1, 1), datetime(2023, 1, 1)),
+        ("2022-11", datetime(2022, 11, 1), datetime(2022, 12, 1)),
+        ("2022-11-15", datetime(2022, 11, 15), datetime(2022, 11, 16)),
+        (
+            "2022-01-01T06:30:00",
+            datetime(2022, 1, 1, 6, 30),
+            datetime(2022, 1, 1, 6, 30, 1),
+        ),
+        ("2022-Q3", datetime(2022, 7, 1), datetime(2022, 10, 1)),
+        ("2022-Q4", datetime(2022, 10, 1), datetime(2023, 1, 1)),
+        ("2022-S2", datetime(2022, 7, 1), datetime(2023, 1, 1)),
+        ("2022-T2", datetime(2022, 5, 1), datetime(2022, 9, 1)),
+        ("2022-A1", datetime(2022, 1, 1), datetime(2023, 1, 1)),
+        ("2022-M11", datetime(2022, 11, 1), datetime(2022, 12, 1)),
+        ("2022-W05", datetime(2022, 1, 31), datetime(2022, 2, 7)),
+        ("2022-D032", datetime(2022, 2, 1), datetime(2022, 2, 2)),
+        ("2022-01-01/P1Y", datetime(2022, 1, 1), datetime(2022, 1, 2)),
+    ],
+)
+def test_period_bounds(time_period: str, start: datetime, end: datetime) -> None:
+    assert period_bounds(time_period) == (start, end)
+    assert period_start(time_period) == start
+
+
+@pytest.mark.parametrize("time_period", ["2022-Q5", "2022-W54", "N/A", ""])
+def test_invalid_period(time_period: str) -> None:
+    assert period_bounds(time_period) is None
+    assert period_start(time_period) is None
+
+
+def test_parse_periods() -> None:
+    time_periods = [
+        "2022",
+        "2022-11",
+        "2022-11-15",
+        "2022-01-01T06:30:00",
+        "2022-Q4",
+        "2022S2",
+        "2022-W05",
+        "2020-W53",
+        "2021-W53",
+        "2020-D366",
+        "2021-D366",
+        "2022-02-29",
+        "N/A",
+        "2022-Q4",
+    ]
+    periods = PeriodParser().parse(time_periods)
+
+    assert len(periods) == len(time_periods)
+    for time_period, start, end in zip(time_periods, periods.start, periods.end):
+        bounds = period_bounds(time_period)
+        if bounds is None:
+            assert np.isnat(start) and np.isnat(end)
+        else:
+            assert (start.item(), end.item()) == bounds
+    assert periods.frequency.tolist() == [
+        "A",
+        "M",
+        "D",
+        "I",
+        "Q",
+        "S",
+        "W",
+        "W",
+        "",
+        "D",
+        "",
+        "",
+        "",
+        "Q",
+    ]
+    assert periods.valid.sum() == 10
+
+
+def test_period_parser_cache() -> None:
+    parser = PeriodParser(max_size=3)
+
+    parser.parse(["2022", "2022-Q1", "2022"])
+    assert set(parser.cache) == {"2022", "2022-Q1"}
+
+    parser.parse(["2022-Q1", "2023-Q1"])
+    assert set(parser.cache) == {"2022", "2022-Q1", "2023-Q1"}
+
+    periods = parser.parse(["2024", "2024-M01"])
+    assert set(parser.cache) == {"2024", "2024-M01"}
+    assert periods.start.tolist() == [datetime(2024, 1, 1)] * 2
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from fennec_api.core.database import engine
+from fennec_api.etl.postgres import try_advisory_lock, upsert
+from fennec_api.etl.metrics import (
+    current_provider,
+    TRANSFORM_DURATION,
+    TRANSFORMED_RECORDS,
+    UPSERT_DURATION,
+    UPSERTED_ROWS,
+)
+from fennec_api.sdmx_v21.models import Codelist
+
+
+@pytest.mark.asyncio
+async def test_try_advisory_lock(connection: AsyncConnection) -> None:
+    async with engine.connect() as other_connection:
+        async with try_advisory_lock(connection, 1, 5) as acquired:
+            assert acquired
+
+            async with try_advisory_lock(other_connection, 1, 5) as acquired:
+                assert not acquired
+
+            async with try_advisory_lock(other_connection, 1, 6) as acquired:
+                assert acquired
+
+        async with try_advisory_lock(other_connection, 1, 5) as acquired:
+            assert acquired
+
+
+@pytest.mark.asyncio
+async def test_upsert_metrics(session: AsyncSession) -> None:
+    async def load(name: str | None = None) -> None:
+        token = current_provider.set("metrics")
+        try:
+            await upsert(
+                session,
+                model=Codelist,
+                records=(
+                    {
+                        "id": f"CL_{i}",
+                        "agency_id": "FR1",
+                        "version": "1.0",
+                        "name": name if i == 0 else None,
+                    }
+                    for i in range(5)
+                ),
+                chunk_size=2,
+            )
+        finally:
+            current_provider.reset(token)
+
+    labels = dict(provider="metrics", artefact="sdmxv21_codelist")
+    await load()
+    assert TRANSFORMED_RECORDS.get(**labels) == 5
+    assert UPSERTED_ROWS.get(**labels) == 5
+    assert UPSERT_DURATION.count(**labels) == 3
+    assert TRANSFORM_DURATION.count(**labels) == 4
+
+    await load()
+    assert TRANSFORMED_RECORDS.get(**labels) == 10
+    assert UPSERTED_ROWS.get(**labels) == 5
+
+    await load("Frequency")
+    assert UPSERTED_ROWS.get(**labels) == 6
@@ -0,0 +1,74 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from fennec_api.etl.periods import PeriodParser
+from fennec_api.etl.rollups import aggregate, period_labels
+
+
+@pytest.mark.parametrize(
+    "frequency,labels,observations,sums,firsts,lasts",
+    [
+        ("A", ["2000", "2001"], [5, 1], [15.0, 7.0], [1.0, 7.0], [5.0, 7.0]),
+        ("S", ["2000-S1", "2001-S1"], [5, 1], [15.0, 7.0], [1.0, 7.0], [5.0, 7.0]),
+        (
+            "Q",
+            ["2000-Q1", "2000-Q2", "2001-Q1"],
+            [3, 2, 1],
+            [6.0, 9.0, 7.0],
+            [1.0, 4.0, 7.0],
+            [3.0, 5.0, 7.0],
+        ),
+        (
+            "M",
+            ["2000-01", "2000-02", "2000-03", "2000-04", "2000-05", "2001-01"],
+            [1, 1, 1, 1, 1, 1],
+            [1.0, 2.0, 3.0, 4.0, 5.0, 7.0],
+            [1.0, 2.0, 3.0, 4.0, 5.0, 7.0],
+            [1.0, 2.0, 3.0, 4.0, 5.0, 7.0],
+        ),
+    ],
+)
+def test_aggregate(
+    frequency: str,
+    labels: list[str],
+    observations: list[int],
+    sums: list[float],
+    firsts: list[float],
+    lasts: list[float],
+) -> None:
+    periods = PeriodParser().parse(
+        ["2000-05", "2000-01", "2000-02", "2000-03", "2000-04", "2000-06", "2001-W01"]
+    )
+    aggregates = aggregate(
+        np.array([1, 1, 1, 1, 1, 1, 2]),
+        periods.start,
+        periods.end,
+        np.array([5.0, 1.0, 2.0, 3.0, 4.0, np.nan, 7.0]),
+        frequency,
+    )
+
+    assert period_labels(aggregates.start, frequency) == labels
+    assert aggregates.series.tolist()[-1] == 2
+    assert aggregates.observations.tolist() == observations
+    assert aggregates.sum.tolist() == sums
+    assert aggregates.first.tolist() == firsts
+    assert aggregates.last.tolist() == lasts
+
+
+def test_aggregate_coarser_periods() -> None:
+    periods = PeriodParser().parse(["2000", "2000-Q1", "2000-01"])
+    aggregates = aggregate(
+        np.array([1, 1, 1]),
+        periods.start,
+        periods.end,
+        np.array([1.0, 2.0, 3.0]),
+        "Q",
+    )
+
+    assert aggregates.start.tolist() == [datetime(2000, 1, 1)]
+    assert aggregates.observations.tolist() == [2]
+
+    empty = aggregate(
+        np.array([1]), periods.start[:1], periods.end[:1], np.array([1.0]), "M"
+    )
+    assert len(empty) == 0
@@ -0,0 +1,70 @@
+import pytest
+from fennec_api.sdmx_v20 import (
+    CompactDataDecoder,
+    Component,
+    GenericDataDecoder,
+    KeyFamily,
+)
+
+
+def open_fixture(name: str) -> bytes:
+    with open(f"data/sdmxml20/{name}.xml", "rb") as f:
+        return f.read()
+
+
+@pytest.fixture()
+def key_family() -> KeyFamily:
+    return KeyFamily(
+        agency_id="OECD",
+        id="QNA",
+        version="1.0",
+        name=None,
+        dimensions=[
+            Component(id=name)
+            for name in ("LOCATION", "SUBJECT", "MEASURE", "FREQUENCY")
+        ],
+        time_dimension=Component(id="TIME"),
+        primary_measure=Component(id="OBS_VALUE"),
+        attributes=[
+            Component(id=name, attachment_level="Series")
+            for name in ("TIME_FORMAT", "UNIT", "POWERCODE", "REFERENCEPERIOD")
+        ]
+        + [Component(id="OBS_STATUS", attachment_level="Observation")],
+    )
+
+
+def test_decode_compact_data(key_family: KeyFamily) -> None:
+    decoder = CompactDataDecoder.from_key_family(key_family)
+
+    [batch] = decoder.decode(open_fixture("compactdata"))
+
+    assert len(batch) == 4
+    assert batch.decode("LOCATION") == ["AUS", "AUS", "AUT", "AUT"]
+    assert list(batch.columns["SUBJECT"]) == [0, 0, 0, 0]
+    assert batch.decode("UNIT") == ["AUD", "AUD", "EUR", "EUR"]
+    assert batch.decode("OBS_STATUS") == [None, None, None, None]
+    assert batch.time_period == ["2009-Q2", "2009-Q3", "2009-Q2", "2009-Q3"]
+    assert list(batch.obs_value) == [1396893, 1401636.8, 318469.1, 319685.5]
+
+
+def test_decode_generic_data(key_family: KeyFamily) -> None:
+    compact = next(
+        CompactDataDecoder.from_key_family(key_family).decode(
+            open_fixture("compactdata")
+        )
+    )
+    decoder = GenericDataDecoder.from_key_family(key_family)
+
+    [batch] = decoder.decode(open_fixture("data"))
+
+    assert list(batch.rows()) == list(compact.rows())
+
+
+def test_decode_generic_data_in_batches(key_family: KeyFamily) -> None:
+    decoder = GenericDataDecoder.from_key_family(key_family)
+
+    batches = list(decoder.decode(open_fixture("data"), batch_size=3))
+
+    assert [len(b) for b in batches] == [3, 1]
+    assert batches[1].decode("LOCATION") == ["AUT"]
+    assert batches[1].time_period == ["2009-Q3"]
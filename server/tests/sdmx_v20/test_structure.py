@@ -0,0 +1,36 @@
+from fennec_api.sdmx_v20 import CodelistRef, read_code_lists, read_key_families
+
+
+def open_fixture(name: str) -> bytes:
+    with open(f"data/sdmxml20/{name}.xml", "rb") as f:
+        return f.read()
+
+
+def test_read_key_families() -> None:
+    [key_family] = read_key_families(open_fixture("keyfamily"))
+
+    assert (key_family.agency_id, key_family.id, key_family.version) == (
+        "IMF",
+        "BOP_2017M06",
+        "1.0",
+    )
+    assert [d.id for d in key_family.dimensions] == ["FREQ", "REF_AREA", "INDICATOR"]
+    assert key_family.dimensions[1].codelist == CodelistRef(
+        agency_id="IMF", id="CL_AREA_BOP_2017M06", version="1.0"
+    )
+    assert key_family.time_dimension.id == "TIME_PERIOD"
+    assert key_family.primary_measure.id == "OBS_VALUE"
+    assert [(a.id, a.attachment_level) for a in key_family.attributes] == [
+        ("UNIT_MULT", "Series"),
+        ("OBS_STATUS", "Observation"),
+        ("OFFICIAL_BPM", "Observation"),
+        ("TIME_FORMAT", "Series"),
+    ]
+
+
+def test_read_code_lists() -> None:
+    code_lists = list(read_code_lists(open_fixture("keyfamily")))
+
+    assert [c.id for c in code_lists][:2] == ["CL_UNIT_MULT", "CL_FREQ"]
+    assert code_lists[1].name == "Frequency"
+    assert [(c.id, c.description) for c in code_lists[1].codes] == [("A", "Annual")]
@@ -0,0 +1,148 @@
+from typing import Any, AsyncGenerator, Iterator, cast
+import pytest
+import pytest_asyncio
+from arq.connections import ArqRedis
+from arq.constants import job_key_prefix
+from arq.jobs import Job
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core import queue
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.sdmx_v21.availability import availability_cache
+from fennec_api.sdmx_v21.etl.decode import decoders
+from fennec_api.sdmx_v21.models import Dataflow, DataStructure
+from fennec_api.sdmx_v21.parser import parse_structure, Structure
+from tools.sdmx_synth import (
+    dataflow_id,
+    generate_codelists,
+    generate_content_constraints,
+    generate_data_structures,
+    generate_dataflows,
+    SCALES,
+)
+
+
+class FakeArqRedis:
+    def __init__(self) -> None:
+        self.jobs: dict[str, tuple[str, tuple[Any, ...]]] = {}
+        self.options: dict[str, dict[str, Any]] = {}
+        self.values: dict[str, bytes] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def enqueue_job(
+        self, function: str, *args: Any, _job_id: str | None = None, **kwargs: Any
+    ) -> Job | None:
+        job_id = _job_id or f"{function}:{len(self.jobs)}"
+        if job_id in self.jobs:
+            return None
+        self.jobs[job_id] = (function, args)
+        self.options[job_id] = kwargs
+        return Job(job_id, cast(ArqRedis, self))
+
+    async def exists(self, *keys: str) -> int:
+        return sum(1 for k in keys if k.removeprefix(job_key_prefix) in self.jobs)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.values.get(k) for k in keys]
+
+    async def incr(self, key: str) -> int:
+        value = int(self.values.get(key, b"0")) + 1
+        self.values[key] = str(value).encode()
+        return value
+
+    async def sadd(self, key: str, *members: str) -> int:
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def smembers(self, key: str) -> set[str]:
+        return set(self.sets.get(key, set()))
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        if key not in self.values and key not in self.sets:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(
+            self.values.pop(k, None) is not None or self.sets.pop(k, None) is not None
+            for k in keys
+        )
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> bool:
+        self.values[key] = value
+        return True
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> Iterator[None]:
+    yield
+    availability_cache.clear()
+    decoders.clear()
+
+
+@pytest_asyncio.fixture()
+async def redis() -> AsyncGenerator[FakeArqRedis, None]:
+    redis = FakeArqRedis()
+    queue.pool = cast(ArqRedis, redis)
+    yield redis
+    queue.pool = None
+
+
+SCALE = SCALES["tiny"]
+
+
+def parse_synth(content: str) -> Structure:
+    msg = parse_structure(content.encode())
+    assert isinstance(msg, Structure) and msg.structures
+    return msg
+
+
+@pytest_asyncio.fixture()
+async def dataflow(session: AsyncSession) -> AsyncGenerator[Dataflow, None]:
+    codelists = parse_synth("".join(generate_codelists(SCALE))).structures
+    data_structures = parse_synth("".join(generate_data_structures(SCALE))).structures
+    dataflows = parse_synth("".join(generate_dataflows(SCALE))).structures
+    assert codelists and codelists.codelists
+    assert data_structures and data_structures.data_structures
+    assert dataflows and dataflows.dataflows
+    await etl.load_codelists(session, codelists.codelists.codelist)
+    await etl.load_data_structures(
+        session, data_structures.data_structures.data_structure
+    )
+    await etl.load_dataflows(session, dataflows.dataflows.dataflow)
+
+    yield (
+        await session.scalars(select(Dataflow).filter(Dataflow.id == dataflow_id(0)))
+    ).one()
+
+
+@pytest_asyncio.fixture()
+async def content_constraints(
+    session: AsyncSession, dataflow: Dataflow
+) -> AsyncGenerator[Dataflow, None]:
+    structures = parse_synth("".join(generate_content_constraints(SCALE))).structures
+    assert structures and structures.constraints
+    await etl.load_content_constraints(
+        session, structures.constraints.content_constraint
+    )
+    yield dataflow
+
+
+async def get_data_structure(
+    session: AsyncSession, dataflow: Dataflow
+) -> DataStructure:
+    data_structure = await session.get(
+        DataStructure,
+        (
+            dataflow.structure_id,
+            dataflow.structure_agency_id,
+            dataflow.structure_version,
+        ),
+    )
+    assert data_structure
+    return data_structure
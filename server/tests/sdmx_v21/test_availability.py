@@ -0,0 +1,209 @@
+from typing import Iterable, Iterator
+from dataclasses import replace
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.etl.batch import DataBatch
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.sdmx_v21 import availability
+from fennec_api.sdmx_v21.availability import (
+    AvailabilityIndex,
+    AvailabilityMode,
+    Bitmap,
+    constrained_codes,
+    extend_availability,
+    pack_container,
+    read_availability,
+    unpack_container,
+)
+from fennec_api.sdmx_v21.constraints import Region
+from fennec_api.sdmx_v21.etl.observations import get_partition
+from fennec_api.sdmx_v21.keys import KeyDictionary, read_key_dictionary
+from fennec_api.sdmx_v21.models import Dataflow, ObservationPartition
+from tools.sdmx_synth import code_id, generate_data
+from tests.sdmx_v21.conftest import get_data_structure, SCALE
+
+KEYS = [(0, 0, 0), (1, 0, 1), (1, 1, 1), (2, 1, 0)]
+
+
+@pytest.fixture()
+def key_dictionary() -> KeyDictionary:
+    return KeyDictionary(
+        dimensions=("FREQ", "INDICATEUR", "COMPTE"),
+        codes=(
+            {"A": 0, "M": 1, "Q": 2},
+            {"I0": 0, "I1": 1, "I2": 2},
+            {"181": 0, "182": 1},
+        ),
+    )
+
+
+@pytest.fixture(params=[16, 1])
+def chunk_bits(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> int:
+    monkeypatch.setattr(availability, "CHUNK_BITS", request.param)
+    return int(request.param)
+
+
+def chunked(slots: Iterable[int]) -> Bitmap:
+    bitmap: Bitmap = {}
+    for slot in slots:
+        chunk = slot >> availability.CHUNK_BITS
+        offset = slot & ((1 << availability.CHUNK_BITS) - 1)
+        bitmap[chunk] = bitmap.get(chunk, 0) | 1 << offset
+    return bitmap
+
+
+@pytest.fixture()
+def index(chunk_bits: int) -> AvailabilityIndex:
+    index = AvailabilityIndex(series=len(KEYS), bitmaps=({}, {}, {}))
+    for position in range(3):
+        for ordinal in {key[position] for key in KEYS}:
+            slots = (s for s, key in enumerate(KEYS) if key[position] == ordinal)
+            for chunk, bits in chunked(slots).items():
+                index.add(position, ordinal, chunk, bits)
+    return index
+
+
+@pytest.mark.parametrize(
+    "pattern,mode,series,expected",
+    [
+        ("all", AvailabilityMode.EXACT, 4, ({0, 1, 2}, {0, 1}, {0, 1})),
+        ("M..", AvailabilityMode.EXACT, 2, ({1}, {0, 1}, {1})),
+        ("M..", AvailabilityMode.AVAILABLE, 2, ({0, 1, 2}, {0, 1}, {1})),
+        ("M+Q.I1.", AvailabilityMode.EXACT, 2, ({1, 2}, {1}, {0, 1})),
+        ("M+Q.I1.", AvailabilityMode.AVAILABLE, 2, ({1, 2}, {0, 1}, {0, 1})),
+        ("A.I1.", AvailabilityMode.EXACT, 0, (set(), set(), set())),
+        ("A.I1.", AvailabilityMode.AVAILABLE, 0, ({1, 2}, {0}, set())),
+    ],
+)
+def test_availability_index(
+    key_dictionary: KeyDictionary,
+    index: AvailabilityIndex,
+    pattern: str,
+    mode: AvailabilityMode,
+    series: int,
+    expected: tuple[set[int], ...],
+) -> None:
+    matcher = key_dictionary.matcher(pattern)
+    assert index.count(matcher) == series
+    assert index.codes(matcher, mode) == expected
+
+
+@pytest.mark.parametrize("slots", [[0, 7, 4095], list(range(0, 65536, 8))])
+def test_pack_container(slots: list[int]) -> None:
+    bits = sum(1 << slot for slot in slots)
+    data = pack_container(bits)
+    assert len(data) == min(2 * len(slots), (slots[-1] + 8) // 8)
+    assert unpack_container(data, len(slots)) == bits
+
+
+def test_constrained_codes(key_dictionary: KeyDictionary) -> None:
+    constraints = [
+        [
+            Region(include=True, bitmaps={0: 0b001, 1: 0b011}),
+            Region(include=True, bitmaps={0: 0b010, 2: 0b10}),
+        ]
+    ]
+
+    assert constrained_codes(
+        key_dictionary, key_dictionary.matcher("M.."), constraints
+    ) == (frozenset({1}), frozenset({0, 1, 2}), frozenset({1}))
+    assert constrained_codes(
+        key_dictionary,
+        key_dictionary.matcher("M.."),
+        constraints,
+        AvailabilityMode.AVAILABLE,
+    ) == (frozenset({0, 1}), frozenset({0, 1, 2}), frozenset({1}))
+    assert constrained_codes(
+        key_dictionary, key_dictionary.matcher("Q.."), constraints
+    ) == (frozenset(), frozenset(), frozenset())
+
+
+@pytest.mark.asyncio
+async def test_maintain_availability(
+    session: AsyncSession, dataflow: Dataflow, chunk_bits: int
+) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(
+        await get_data_structure(session, dataflow)
+    )
+    larger = replace(SCALE, series_per_dataflow=SCALE.series_per_dataflow + 2)
+    await etl.load_observations(
+        session, dataflow, decoder.decode("".join(generate_data(SCALE, 0)).encode())
+    )
+    await etl.load_observations(
+        session, dataflow, decoder.decode("".join(generate_data(larger, 0)).encode())
+    )
+    partition_id = await get_partition(session, dataflow)
+    assert partition_id is not None
+
+    data_structure = await get_data_structure(session, dataflow)
+    key_dictionary = await read_key_dictionary(session, data_structure)
+    matcher = key_dictionary.matcher("all")
+    series = larger.series_per_dataflow
+    index = await read_availability(session, partition_id, SCALE.dimensions, matcher)
+    assert index
+    assert index.series == series
+    assert index.bitmaps == (
+        {i: chunked([i]) for i in range(series)},
+        {0: chunked(range(series))},
+        {0: chunked(range(series))},
+    )
+
+    selected = await read_availability(
+        session,
+        partition_id,
+        SCALE.dimensions,
+        key_dictionary.matcher(f"{code_id(5)}.."),
+    )
+    assert selected and selected.count(key_dictionary.matcher(f"{code_id(5)}..")) == 1
+    assert {
+        chunk
+        for bitmaps in selected.bitmaps
+        for bitmap in bitmaps.values()
+        for chunk in bitmap
+    } == {5 >> availability.CHUNK_BITS}
+
+    await session.execute(
+        update(ObservationPartition)
+        .where(ObservationPartition.id == partition_id)
+        .values(series_count=None)
+    )
+    assert (
+        await read_availability(session, partition_id, SCALE.dimensions, matcher)
+        is None
+    )
+    assert await extend_availability(session, partition_id, []) == series
+    assert (
+        await read_availability(session, partition_id, SCALE.dimensions, matcher)
+        == index
+    )
+
+
+@pytest.mark.asyncio
+async def test_availability_survives_failed_load(
+    session: AsyncSession, dataflow: Dataflow
+) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(
+        await get_data_structure(session, dataflow)
+    )
+    content = "".join(generate_data(SCALE, 0)).encode()
+    batch_size = SCALE.observations_per_series * 2
+
+    def batches() -> Iterator[DataBatch]:
+        yield next(decoder.decode(content, batch_size=batch_size))
+        raise RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        await etl.load_observations(session, dataflow, batches())
+    await etl.load_observations(session, dataflow, decoder.decode(content))
+
+    partition_id = await get_partition(session, dataflow)
+    assert partition_id is not None
+    key_dictionary = await read_key_dictionary(
+        session, await get_data_structure(session, dataflow)
+    )
+    matcher = key_dictionary.matcher("all")
+    index = await read_availability(session, partition_id, SCALE.dimensions, matcher)
+    assert index
+    assert index.series == SCALE.series_per_dataflow
+    assert index.count(matcher) == SCALE.series_per_dataflow
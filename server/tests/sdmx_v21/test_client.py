@@ -7,6 +7,7 @@ from fennec_api.sdmx_v21.client import (
     build_root_url,
     ReferencesType,
     DetailType,
+    WireFormat,
 )
 
 
@@ -57,6 +58,9 @@ def test_default_structure_headers_builder() -> None:
     assert build_default_structure_headers() == {
         "Accept": "application/vnd.sdmx.structure+xml;version=2.1"
     }
+    assert build_default_structure_headers(WireFormat.JSON) == {
+        "Accept": "application/vnd.sdmx.structure+json;version=1.0"
+    }
 
 
 def test_build_root_url() -> None:
@@ -0,0 +1,176 @@
+from pathlib import Path
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.sdmx_v21.constraints import (
+    from_bitmap,
+    pack_bitmap,
+    plan_data_keys,
+    prune,
+    read_constraints,
+    Region,
+    to_bitmap,
+    unpack_bitmap,
+)
+from fennec_api.sdmx_v21.keys import KeyDictionary, load_key_dictionary
+from fennec_api.sdmx_v21.models import CubeRegion, Dataflow
+from fennec_api.sdmx_v21.parser import parse_structure, Structure
+from tools.sdmx_synth import generate_content_constraints
+from tests.sdmx_v21.conftest import get_data_structure, parse_synth, SCALE
+
+
+@pytest.fixture()
+def key_dictionary() -> KeyDictionary:
+    return KeyDictionary(
+        dimensions=("FREQ", "INDICATEUR", "COMPTE"),
+        codes=(
+            {"A": 0, "M": 1, "Q": 2},
+            {f"I{i}": i for i in range(20)},
+            {"181": 0, "182": 1},
+        ),
+    )
+
+
+def test_bitmaps() -> None:
+    bitmap = to_bitmap([0, 3, 70])
+    assert from_bitmap(bitmap) == {0, 3, 70}
+    assert len(pack_bitmap(bitmap)) == 9
+    assert unpack_bitmap(pack_bitmap(bitmap)) == bitmap
+    assert from_bitmap(unpack_bitmap(pack_bitmap(0))) == frozenset()
+
+
+def test_extract_regions() -> None:
+    content = (Path("data/sdmxml21/contentconstraint.xml")).read_bytes()
+    message = parse_structure(content)
+    assert isinstance(message, Structure)
+    assert message.structures and message.structures.constraints
+    constraint = message.structures.constraints.content_constraint[0]
+    key_dictionary = KeyDictionary(
+        dimensions=("FREQ", "AME_REF_AREA", "AME_UNIT"),
+        codes=(
+            {"A": 0, "Q": 1},
+            {"DNK": 0, "FRA": 1, "IRL": 2},
+            {"0": 0, "319": 1, "320": 2},
+        ),
+    )
+
+    assert etl.extract_regions(constraint, key_dictionary) == [
+        Region(include=True, bitmaps={0: 0b1, 1: 0b101, 2: 0b11})
+    ]
+
+    constraint.cube_region[0].include = False
+    assert etl.extract_regions(constraint, key_dictionary) == []
+
+    constraint.cube_region[0].include = True
+    for key_value in constraint.cube_region[0].key_value:
+        if key_value.id == "AME_REF_AREA":
+            key_value.include = False
+    assert etl.extract_regions(constraint, key_dictionary) == [
+        Region(include=True, bitmaps={0: 0b1, 1: 0b010, 2: 0b11})
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern,constraints,expected",
+    [
+        ("all", [], "all"),
+        ("all", [[Region(include=True, bitmaps={0: 0b110})]], "M+Q.."),
+        ("all", [[Region(include=True, bitmaps={0: 0b111})]], "all"),
+        ("A..", [[Region(include=True, bitmaps={0: 0b110})]], None),
+        (
+            "M+Q..181",
+            [
+                [
+                    Region(include=True, bitmaps={0: 0b010, 1: 0b11}),
+                    Region(include=True, bitmaps={0: 0b100, 2: 0b10}),
+                ]
+            ],
+            "M.I0+I1.181",
+        ),
+        (
+            "M..",
+            [
+                [
+                    Region(include=True, bitmaps={0: 0b010, 1: 0b11}),
+                    Region(include=True, bitmaps={0: 0b110, 1: 0b100}),
+                ]
+            ],
+            "M.I0+I1+I2.",
+        ),
+        ("M..181", [[Region(include=False, bitmaps={0: 0b010})]], None),
+        ("M+Q..181", [[Region(include=False, bitmaps={0: 0b010})]], "M+Q..181"),
+        (
+            "Q..",
+            [
+                [Region(include=True, bitmaps={1: 0b11})],
+                [Region(include=False, bitmaps={0: 0b100, 2: 0b11})],
+            ],
+            None,
+        ),
+    ],
+)
+def test_prune(
+    key_dictionary: KeyDictionary,
+    pattern: str,
+    constraints: list[list[Region]],
+    expected: str | None,
+) -> None:
+    matcher = prune(key_dictionary, key_dictionary.matcher(pattern), constraints)
+    if expected is None:
+        assert matcher.empty
+    else:
+        assert key_dictionary.pattern(matcher) == expected
+
+
+def test_plan_data_keys(key_dictionary: KeyDictionary) -> None:
+    constraints = [
+        [
+            Region(include=True, bitmaps={0: 0b001, 1: 0b11}),
+            Region(include=True, bitmaps={0: 0b010, 2: 0b01}),
+            Region(include=True, bitmaps={0: 0b100, 1: 0b0}),
+        ]
+    ]
+
+    assert plan_data_keys(key_dictionary, []) == ["all"]
+    assert plan_data_keys(key_dictionary, constraints) == ["A.I0+I1.", "M..181"]
+    assert plan_data_keys(key_dictionary, constraints, pattern="M..") == ["M..181"]
+    assert plan_data_keys(key_dictionary, constraints, pattern="Q..") == []
+    assert plan_data_keys(key_dictionary, constraints, max_keys=1) == ["A+M.."]
+
+
+@pytest.mark.asyncio
+async def test_load_content_constraints(
+    session: AsyncSession, content_constraints: Dataflow
+) -> None:
+    data_structure = await get_data_structure(session, content_constraints)
+    key_dictionary = await load_key_dictionary(session, data_structure)
+    constraints = await read_constraints(session, content_constraints, key_dictionary)
+
+    assert constraints == [
+        [
+            Region(
+                include=True,
+                bitmaps={
+                    0: to_bitmap(range(SCALE.series_per_dataflow)),
+                    1: 0b1,
+                    2: 0b1,
+                },
+            )
+        ]
+    ]
+    assert await session.scalar(select(func.count()).select_from(CubeRegion)) == (
+        SCALE.dimensions
+    )
+    structures = parse_synth("".join(generate_content_constraints(SCALE))).structures
+    assert structures and structures.constraints
+    await etl.load_content_constraints(
+        session, structures.constraints.content_constraint
+    )
+    assert await session.scalar(select(func.count()).select_from(CubeRegion)) == (
+        SCALE.dimensions
+    )
+    assert plan_data_keys(key_dictionary, constraints) == [
+        "+".join(key_dictionary.values[0][i] for i in range(SCALE.series_per_dataflow))
+        + f".{key_dictionary.values[1][0]}.{key_dictionary.values[2][0]}"
+    ]
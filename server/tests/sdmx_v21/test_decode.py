@@ -0,0 +1,148 @@
+from typing import AsyncGenerator
+import pytest
+import pytest_asyncio
+from lxml import etree
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.sdmx_v21.keys import load_key_dictionary
+from fennec_api.sdmx_v21.models import Dataflow, DataStructure
+from fennec_api.sdmx_v21.parser import parse_structure, Structure
+from tools.sdmx_synth import dimension_id
+from tests.sdmx_v21.conftest import get_data_structure
+
+
+def open_fixture(name: str) -> bytes:
+    with open(f"data/sdmxml21/{name}.xml", "rb") as f:
+        return f.read()
+
+
+@pytest_asyncio.fixture()
+async def data_structure(session: AsyncSession) -> AsyncGenerator[DataStructure, None]:
+    msg = parse_structure(open_fixture("datastructure"))
+    assert isinstance(msg, Structure)
+    assert msg.structures and msg.structures.data_structures
+    await etl.load_data_structures(
+        session, msg.structures.data_structures.data_structure
+    )
+
+    yield (
+        await session.scalars(
+            select(DataStructure).filter(DataStructure.id == "BALANCE-PAIEMENTS")
+        )
+    ).one()
+
+
+@pytest.mark.asyncio
+async def test_compile_decoder(data_structure: DataStructure) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+
+    assert decoder.dimensions == (
+        "FREQ",
+        "INDICATEUR",
+        "COMPTE",
+        "INSTRUMENTS_BALANCE_PAIEMENTS",
+        "NATURE",
+        "REF_AREA",
+        "UNIT_MEASURE",
+        "CORRECTION",
+        "BASIND",
+    )
+    assert "OBS_STATUS" in decoder.attributes
+    assert decoder.time_dimension == "TIME_PERIOD"
+    assert decoder.primary_measure == "OBS_VALUE"
+    assert "OBS_STATUS" in decoder.mandatory_attributes
+    assert "OBS_CONF" not in decoder.mandatory_attributes
+
+
+@pytest.mark.asyncio
+async def test_get_decoder(session: AsyncSession, dataflow: Dataflow) -> None:
+    data_structure = await get_data_structure(session, dataflow)
+    key_dictionary = await load_key_dictionary(session, data_structure)
+
+    decoder = await etl.get_decoder(session, data_structure)
+    assert decoder is await etl.get_decoder(session, data_structure)
+    assert decoder.new_dictionaries()[dimension_id(0)].values == sorted(
+        key_dictionary.codes[0], key=key_dictionary.codes[0].__getitem__
+    )
+
+    attribute = data_structure.attributes[0]
+    attribute.assignment_status = (
+        "Conditional" if attribute.assignment_status == "Mandatory" else "Mandatory"
+    )
+    assert decoder is not await etl.get_decoder(session, data_structure)
+
+
+@pytest.mark.asyncio
+async def test_decode_structure_specific_data(data_structure: DataStructure) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+
+    [batch] = decoder.decode(open_fixture("structurespecificdata"))
+
+    assert len(batch) == 4
+    assert list(batch.columns["FREQ"]) == [0, 0, 0, 0]
+    assert batch.decode("CORRECTION") == ["BRUT", "BRUT", "CVS", "CVS"]
+    assert batch.decode("UNIT_MULT") == ["6", "6", "6", "6"]
+    assert batch.decode("OBS_REV") == [None, None, None, "1"]
+    assert batch.decode("OBS_CONF") == [None, None, None, None]
+    assert batch.time_period == ["2022-11", "2022-10", "2022-11", "2022-10"]
+    assert list(batch.obs_value) == [203, 183, 215, 188]
+
+    row = next(batch.rows())
+    assert row["REF_AREA"] == "FE"
+    assert row["OBS_STATUS"] == "A"
+    assert row["time_period"] == "2022-11"
+    assert row["obs_value"] == 203
+
+
+@pytest.mark.asyncio
+async def test_decode_flat_data(data_structure: DataStructure) -> None:
+    root = etree.fromstring(open_fixture("structurespecificdata"))
+    for series in root.iter("Series"):
+        dataset = series.getparent()
+        assert dataset is not None
+        for obs in series.iter("Obs"):
+            obs.attrib.update({**series.attrib, **obs.attrib})
+            dataset.append(obs)
+        dataset.remove(series)
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+
+    [flat] = decoder.decode(etree.tostring(root))
+    [batch] = decoder.decode(open_fixture("structurespecificdata"))
+
+    assert list(flat.rows()) == list(batch.rows())
+
+
+@pytest.mark.asyncio
+async def test_decode_missing_mandatory_attribute(
+    data_structure: DataStructure, caplog: pytest.LogCaptureFixture
+) -> None:
+    compiled = etl.StructureSpecificDecoder.compile(data_structure)
+    decoder = etl.StructureSpecificDecoder(
+        dimensions=compiled.dimensions,
+        attributes=compiled.attributes,
+        time_dimension=compiled.time_dimension,
+        primary_measure=compiled.primary_measure,
+        mandatory_attributes=("OBS_STATUS", "OBS_CONF"),
+    )
+
+    list(decoder.decode(open_fixture("structurespecificdata")))
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "Mandatory attribute OBS_CONF is missing on 4 observations"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_decode_in_batches(data_structure: DataStructure) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+
+    batches = list(decoder.decode(open_fixture("structurespecificdata"), batch_size=3))
+
+    assert [len(b) for b in batches] == [3, 1]
+    assert batches[0].dictionaries is batches[1].dictionaries
+    [batch] = decoder.decode(open_fixture("structurespecificdata"))
+    assert batch.dictionaries is not batches[0].dictionaries
+    assert batch.dictionaries["CORRECTION"].values == ["BRUT", "CVS"]
+    assert batches[1].decode("CORRECTION") == ["CVS"]
+    assert list(batches[1].columns["CORRECTION"]) == [1]
@@ -2,7 +2,7 @@ from typing import AsyncGenerator, Sequence
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.orm import selectinload
 import aiofiles
 import httpx
@@ -26,9 +26,11 @@ from fennec_api.sdmx_v21.models import (
     CategoryScheme,
     Category,
     Codelist,
+    Code,
     ConceptScheme,
     Categorisation,
 )
+from fennec_api.sdmx_v21.service import search_query
 
 
 async def open_fixture(path: str) -> bytes:
@@ -389,11 +391,13 @@ async def test_load_codelists(
     await etl.load_codelists(session, codelists)
 
     inserted_result = await session.execute(
-        select(Codelist).filter(
+        select(Codelist)
+        .filter(
             Codelist.id == "CL_PERIODICITE",
             Codelist.agency_id == "FR1",
             Codelist.version == "1.0",
         )
+        .options(selectinload(Codelist.codes))
     )
     inserted_codelists = inserted_result.scalars().all()
     assert len(inserted_codelists) == 1
@@ -414,6 +418,17 @@ async def test_load_codelists(
     assert codes[0].name == "Monthly"
     assert codes[0].description is None
 
+    assert (
+        await session.scalars(
+            select(Code.id).where(
+                Code.search_vector.bool_op("@@")(search_query("months"))
+            )
+        )
+    ).all() == ["M"]
+    ctid = await session.scalar(text("SELECT ctid::text FROM sdmxv21_code"))
+    await etl.load_codelists(session, codelists)
+    assert await session.scalar(text("SELECT ctid::text FROM sdmxv21_code")) == ctid
+
 
 @pytest.mark.asyncio
 async def test_load_concept_schemes(
@@ -422,11 +437,13 @@ async def test_load_concept_schemes(
     await etl.load_concept_schemes(session, concept_schemes)
 
     inserted_result = await session.execute(
-        select(ConceptScheme).filter(
+        select(ConceptScheme)
+        .filter(
             ConceptScheme.id == "CONCEPTS_INSEE",
             ConceptScheme.agency_id == "FR1",
             ConceptScheme.version == "1.0",
         )
+        .options(selectinload(ConceptScheme.concepts))
     )
     inserted_concept_schemes = inserted_result.scalars().all()
     assert len(inserted_concept_schemes) == 1
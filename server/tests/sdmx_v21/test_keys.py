@@ -0,0 +1,195 @@
+from itertools import product
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.sdmx_v21.keys import KeyDictionary, load_key_dictionary
+from fennec_api.sdmx_v21.models import Code, Dataflow, Series
+from tools.sdmx_synth import generate_data
+from tests.sdmx_v21.conftest import get_data_structure, SCALE
+
+
+@pytest.fixture()
+def key_dictionary() -> KeyDictionary:
+    return KeyDictionary(
+        dimensions=("FREQ", "INDICATEUR", "COMPTE"),
+        codes=(
+            {"A": 0, "M": 1, "Q": 2},
+            {f"I{i}": i for i in range(20)},
+            {"181": 0, "182": 1},
+        ),
+    )
+
+
+def test_pack_keys(key_dictionary: KeyDictionary) -> None:
+    assert key_dictionary.widths == (2, 5, 1)
+    assert key_dictionary.shifts == (6, 1, 0)
+
+    key = key_dictionary.encode("M.I17.182")
+    assert key == (1, 17, 1)
+    assert key_dictionary.pack(key) == 0b01_10001_1
+    assert key_dictionary.unpack(0b01_10001_1) == key
+    assert key_dictionary.decode(key) == "M.I17.182"
+    assert key_dictionary.encode("M.I17.183") is None
+    with pytest.raises(ValueError):
+        key_dictionary.encode("M.I17")
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("M..181", 20),
+        ("M+Q..181", 40),
+        ("M.I3.", 2),
+        ("..", 120),
+        ("all", 120),
+        ("M.I3+I99.182", 1),
+        ("X..", 0),
+    ],
+)
+def test_match_keys(key_dictionary: KeyDictionary, pattern: str, expected: int) -> None:
+    matcher = key_dictionary.matcher(pattern)
+    keys = list(product(*(sorted(codes.values()) for codes in key_dictionary.codes)))
+
+    matched = [k for k in keys if matcher.matches(k)]
+    assert len(matched) == expected
+    assert [k for k in keys if matcher.matches_packed(key_dictionary.pack(k))] == (
+        matched
+    )
+
+
+def test_match_keys_wrong_length(key_dictionary: KeyDictionary) -> None:
+    with pytest.raises(ValueError):
+        key_dictionary.matcher("M.181")
+
+
+@pytest.mark.asyncio
+async def test_load_key_dictionary(session: AsyncSession, dataflow: Dataflow) -> None:
+    data_structure = await get_data_structure(session, dataflow)
+    key_dictionary = await load_key_dictionary(session, data_structure)
+    dimension = sorted(data_structure.dimensions, key=lambda d: d.position)[0]
+
+    assert len(key_dictionary.dimensions) == SCALE.dimensions
+    assert key_dictionary.widths == (4,) * SCALE.dimensions
+    assert list(key_dictionary.codes[0].values()) == list(
+        range(SCALE.codes_per_codelist)
+    )
+
+    session.add_all(
+        Code(
+            id=code_id,
+            codelist_id=dimension.codelist_id,
+            codelist_agency_id=dimension.codelist_agency_id,
+            codelist_version=dimension.codelist_version,
+        )
+        for code_id in ("A_NEW", *(f"Z{i:02d}" for i in range(6)))
+    )
+    await session.commit()
+    reloaded = await load_key_dictionary(session, data_structure)
+
+    assert {
+        k: v for k, v in reloaded.codes[0].items() if k in key_dictionary.codes[0]
+    } == (key_dictionary.codes[0])
+    assert reloaded.codes[0]["A_NEW"] == SCALE.codes_per_codelist
+    assert reloaded.widths[0] == 5
+
+
+@pytest.mark.asyncio
+async def test_filter_series(session: AsyncSession, dataflow: Dataflow) -> None:
+    data_structure = await get_data_structure(session, dataflow)
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+    await etl.load_observations(
+        session, dataflow, decoder.decode("".join(generate_data(SCALE, 0)).encode())
+    )
+    key_dictionary = await load_key_dictionary(session, data_structure)
+    codes = key_dictionary.codes[0]
+    [first, second, *_] = sorted(codes, key=lambda c: codes[c])
+
+    for pattern, expected in [
+        ("..", SCALE.series_per_dataflow),
+        (f"{second}..", 1),
+        (f"{first}+{second}..", 2),
+        (f".{first}.", SCALE.series_per_dataflow),
+        (f".{second}.", 0),
+    ]:
+        series = (
+            await session.scalars(
+                select(Series).where(key_dictionary.matcher(pattern).clause())
+            )
+        ).all()
+        assert len(series) == expected, pattern
+        assert all(s.packed_key == key_dictionary.pack(s.key) for s in series)
+
+
+@pytest.mark.asyncio
+async def test_repack_series(session: AsyncSession, dataflow: Dataflow) -> None:
+    data_structure = await get_data_structure(session, dataflow)
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+    content = "".join(generate_data(SCALE, 0)).encode()
+    await etl.load_observations(session, dataflow, decoder.decode(content))
+
+    dimension = sorted(data_structure.dimensions, key=lambda d: d.position)[-1]
+    session.add_all(
+        Code(
+            id=f"Z{i:02d}",
+            codelist_id=dimension.codelist_id,
+            codelist_agency_id=dimension.codelist_agency_id,
+            codelist_version=dimension.codelist_version,
+        )
+        for i in range(10)
+    )
+    await session.commit()
+    await etl.load_observations(session, dataflow, [])
+
+    key_dictionary = await load_key_dictionary(session, data_structure)
+    series = (await session.scalars(select(Series))).all()
+    assert key_dictionary.widths[-1] == 5
+    assert len(series) == SCALE.series_per_dataflow
+    assert all(s.packed_key == key_dictionary.pack(s.key) for s in series)
+
+
+@pytest.mark.asyncio
+async def test_load_non_coded_dimension(
+    session: AsyncSession, dataflow: Dataflow
+) -> None:
+    data_structure = await get_data_structure(session, dataflow)
+    dimension = sorted(data_structure.dimensions, key=lambda d: d.position)[-1]
+    codes = (
+        await session.scalars(
+            select(Code.id).where(
+                Code.codelist_id == dimension.codelist_id,
+                Code.codelist_agency_id == dimension.codelist_agency_id,
+                Code.codelist_version == dimension.codelist_version,
+            )
+        )
+    ).all()
+    dimension.codelist_id = None
+    dimension.codelist_agency_id = None
+    dimension.codelist_version = None
+    await session.commit()
+
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+    content = "".join(generate_data(SCALE, 0)).encode()
+    loaded = await etl.load_observations(session, dataflow, decoder.decode(content))
+
+    key_dictionary = await load_key_dictionary(session, data_structure)
+    assert loaded == SCALE.series_per_dataflow * SCALE.observations_per_series
+    assert set(key_dictionary.codes[-1]) <= set(codes)
+    assert key_dictionary.codes[-1]
+    series = (await session.scalars(select(Series))).all()
+    assert len(series) == SCALE.series_per_dataflow
+    assert all(s.packed_key == key_dictionary.pack(s.key) for s in series)
+
+
+@pytest.mark.asyncio
+async def test_load_skipped_observations(
+    session: AsyncSession, dataflow: Dataflow
+) -> None:
+    data_structure = await get_data_structure(session, dataflow)
+    decoder = etl.StructureSpecificDecoder.compile(data_structure)
+    batches = list(decoder.decode("".join(generate_data(SCALE, 0)).encode()))
+    for batch in batches:
+        batch.time_period[:] = ["not a period"] * len(batch)
+
+    with pytest.raises(ValueError, match="were skipped"):
+        await etl.load_observations(session, dataflow, batches)
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.sdmx_v21.etl.observations import partition_table
+from fennec_api.sdmx_v21.models import Dataflow, Observation, Rollup, Series
+from tools.sdmx_synth import generate_data
+from tests.sdmx_v21.conftest import get_data_structure, SCALE
+
+
+async def count(
+    session: AsyncSession, model: type[Series | Observation | Rollup]
+) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_load_observations(session: AsyncSession, dataflow: Dataflow) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(
+        await get_data_structure(session, dataflow)
+    )
+    content = "".join(generate_data(SCALE, 0)).encode()
+
+    loaded = await etl.load_observations(
+        session, dataflow, decoder.decode(content, batch_size=10)
+    )
+    reloaded = await etl.load_observations(
+        session,
+        dataflow,
+        decoder.decode(content),
+        series_attributes=("OBS_STATUS",),
+    )
+
+    assert (
+        loaded == reloaded == SCALE.series_per_dataflow * SCALE.observations_per_series
+    )
+    assert await count(session, Series) == SCALE.series_per_dataflow
+    assert await count(session, Observation) == loaded
+    series = (await session.scalars(select(Series).order_by(Series.id))).all()
+    assert [s.key for s in series] == [[0, 0, 0], [1, 0, 0], [2, 0, 0], [3, 0, 0]]
+    assert {s.attributes["OBS_STATUS"] for s in series if s.attributes} == {"A"}
+
+    observation = (
+        await session.scalars(
+            select(Observation)
+            .filter(Observation.series_id == series[1].id)
+            .order_by(Observation.period_start)
+        )
+    ).first()
+    assert observation
+    assert observation.time_period == "2000-01"
+    assert observation.period_start.isoformat() == "2000-01-01T00:00:00"
+    assert observation.attributes is None
+
+    partitions = (
+        await session.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": partition_table(observation.partition_id)},
+        )
+    ).scalars()
+    assert list(partitions) == [f"{partition_table(observation.partition_id)}_2000"]
+
+
+@pytest.mark.asyncio
+async def test_drop_partition(session: AsyncSession, dataflow: Dataflow) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(
+        await get_data_structure(session, dataflow)
+    )
+    await etl.load_observations(
+        session, dataflow, decoder.decode("".join(generate_data(SCALE, 0)).encode())
+    )
+
+    assert await etl.drop_partition(session, dataflow)
+    assert not await etl.drop_partition(session, dataflow)
+    assert await count(session, Series) == 0
+    assert await count(session, Observation) == 0
+    assert await count(session, Rollup) == 0
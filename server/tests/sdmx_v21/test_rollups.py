@@ -0,0 +1,117 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.etl.batch import DataBatch
+from fennec_api.sdmx_v21.models import Dataflow, Observation, Rollup, Series
+from tools.sdmx_synth import generate_data
+from tests.sdmx_v21.conftest import get_data_structure, SCALE
+
+
+def shift_batch(batch: DataBatch, rows: range, year: int) -> DataBatch:
+    shifted = DataBatch(batch.dimensions, batch.attributes, batch.dictionaries)
+    for i in rows:
+        for name, column in batch.columns.items():
+            shifted.columns[name].append(column[i])
+        shifted.time_period.append(f"{year}{batch.time_period[i][4:]}")
+        shifted.obs_value.append(batch.obs_value[i])
+    return shifted
+
+
+async def rollups(session: AsyncSession, series_id: int) -> dict[tuple[str, str], int]:
+    return {
+        (r.frequency, r.time_period): r.observations
+        for r in await session.scalars(
+            select(Rollup).where(Rollup.series_id == series_id)
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups(session: AsyncSession, dataflow: Dataflow) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(
+        await get_data_structure(session, dataflow)
+    )
+    [batch] = decoder.decode("".join(generate_data(SCALE, 0)).encode())
+    await etl.load_observations(session, dataflow, [batch])
+
+    series = (await session.scalars(select(Series).order_by(Series.id))).all()
+    assert all(s.rollup_from is None for s in series)
+    assert (
+        await session.execute(select(func.count()).select_from(Rollup))
+    ).scalar_one() == SCALE.series_per_dataflow * 10
+    assert await rollups(session, series[0].id) == {
+        ("A", "2000"): 6,
+        ("S", "2000-S1"): 6,
+        ("Q", "2000-Q1"): 3,
+        ("Q", "2000-Q2"): 3,
+        **{("M", f"2000-{m:02d}"): 1 for m in range(1, 7)},
+    }
+
+    values = (
+        await session.scalars(
+            select(Observation.obs_value)
+            .where(Observation.series_id == series[1].id)
+            .order_by(Observation.period_start)
+        )
+    ).all()
+    quarter = (
+        await session.scalars(
+            select(Rollup).where(
+                Rollup.series_id == series[1].id, Rollup.time_period == "2000-Q2"
+            )
+        )
+    ).one()
+    assert quarter.obs_sum == pytest.approx(sum(v for v in values[3:6] if v))
+    assert (quarter.obs_first, quarter.obs_last) == (values[3], values[5])
+
+    await etl.load_observations(
+        session,
+        dataflow,
+        [shift_batch(batch, range(SCALE.observations_per_series), 2001)],
+    )
+    assert await rollups(session, series[0].id) == {
+        ("A", "2000"): 6,
+        ("S", "2000-S1"): 6,
+        ("Q", "2000-Q1"): 3,
+        ("Q", "2000-Q2"): 3,
+        **{("M", f"2000-{m:02d}"): 1 for m in range(1, 7)},
+        ("A", "2001"): 6,
+        ("S", "2001-S1"): 6,
+        ("Q", "2001-Q1"): 3,
+        ("Q", "2001-Q2"): 3,
+        **{("M", f"2001-{m:02d}"): 1 for m in range(1, 7)},
+    }
+    assert len(await rollups(session, series[1].id)) == 10
+
+    assert await etl.refresh_rollups(session, series[0].partition_id) == 0
+    await session.execute(
+        update(Series)
+        .where(Series.id == series[1].id)
+        .values(rollup_from=datetime(2000, 3, 1))
+    )
+    assert await etl.refresh_rollups(session, series[0].partition_id) == 1
+    assert len(await rollups(session, series[1].id)) == 10
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_in_batches(
+    session: AsyncSession, dataflow: Dataflow
+) -> None:
+    decoder = etl.StructureSpecificDecoder.compile(
+        await get_data_structure(session, dataflow)
+    )
+    [batch] = decoder.decode("".join(generate_data(SCALE, 0)).encode())
+    await etl.load_observations(session, dataflow, [batch])
+    series = (await session.scalars(select(Series).order_by(Series.id))).all()
+    expected = [await rollups(session, s.id) for s in series]
+
+    await session.execute(update(Series).values(rollup_from=datetime(2000, 1, 1)))
+    assert (
+        await etl.refresh_rollups(
+            session, series[0].partition_id, chunk_size=3, batch_size=4
+        )
+        == SCALE.series_per_dataflow
+    )
+    assert [await rollups(session, s.id) for s in series] == expected
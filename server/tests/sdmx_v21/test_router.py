@@ -1,11 +1,32 @@
 from typing import Any
+import io
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from httpx import AsyncClient
-from fennec_api.sdmx_v21.models import Provider
+import fennec_api.sdmx_v21.etl as etl
+from fennec_api.sdmx_v21.etl.observations import create_partition
+from fennec_api.sdmx_v21.models import Dataflow, Provider
 from fennec_api.sdmx_v21.schemas import ProviderCreate
 from fennec_api.sdmx_v21.service import create_provider
+from tools.sdmx_synth import (
+    code_id,
+    codelist_id,
+    dataflow_id,
+    dimension_id,
+    generate_codelists,
+    generate_concept_schemes,
+    generate_data,
+)
+from tests.sdmx_v21.conftest import (
+    FakeArqRedis,
+    get_data_structure,
+    parse_synth,
+    SCALE,
+)
 
 
 @pytest.fixture()
@@ -56,6 +77,43 @@ async def test_list_providers(
     assert len(r.json()) == 1
 
 
+@pytest.mark.asyncio
+async def test_list_providers_cursor(
+    test_client: AsyncClient,
+    session: AsyncSession,
+    provider_data: dict[str, Any],
+    existing_admin_token: str,
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_admin_token}"}
+    ids = [
+        (
+            await create_provider(
+                session, obj_in=ProviderCreate.model_validate(provider_data)
+            )
+        ).id
+        for _ in range(3)
+    ]
+
+    r = await test_client.get(
+        "/api/v1/sdmx/providers", headers=headers, params={"limit": 2}
+    )
+    assert r.status_code == 200
+    assert [p["id"] for p in r.json()] == ids[:2]
+    r = await test_client.get(
+        "/api/v1/sdmx/providers",
+        headers=headers,
+        params={"limit": 2, "cursor": r.headers["X-Next-Cursor"]},
+    )
+    assert r.status_code == 200
+    assert [p["id"] for p in r.json()] == ids[2:]
+    assert "X-Next-Cursor" not in r.headers
+
+    r = await test_client.get(
+        "/api/v1/sdmx/providers", headers=headers, params={"cursor": "invalid"}
+    )
+    assert r.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_provider(
     test_client: AsyncClient,
@@ -112,3 +170,583 @@ async def test_update_not_existing_provider(
         json=provider_data,
     )
     assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_collect_provider(
+    test_client: AsyncClient,
+    session: AsyncSession,
+    provider: Provider,
+    redis: FakeArqRedis,
+    existing_admin_token: str,
+) -> None:
+    for _ in range(2):
+        r = await test_client.post(
+            f"/api/v1/sdmx/providers/{provider.id}/collect",
+            headers={"Authorization": f"Bearer {existing_admin_token}"},
+        )
+        assert r.status_code == 202
+        assert r.json() == {"job_id": f"collect_provider:{provider.id}"}
+    assert len(redis.jobs) == 1
+
+
+@pytest.mark.asyncio
+async def test_collect_not_existing_provider(
+    test_client: AsyncClient,
+    session: AsyncSession,
+    redis: FakeArqRedis,
+    existing_admin_token: str,
+) -> None:
+    r = await test_client.post(
+        "/api/v1/sdmx/providers/0/collect",
+        headers={"Authorization": f"Bearer {existing_admin_token}"},
+    )
+    assert r.status_code == 404
+
+
+@pytest_asyncio.fixture()
+async def observations(session: AsyncSession, dataflow: Dataflow) -> Dataflow:
+    decoder = etl.StructureSpecificDecoder.compile(
+        await get_data_structure(session, dataflow)
+    )
+    await etl.load_observations(
+        session, dataflow, decoder.decode("".join(generate_data(SCALE, 0)).encode())
+    )
+    return dataflow
+
+
+def flow_ref(dataflow: Dataflow) -> str:
+    return f"{dataflow.agency_id},{dataflow.id},{dataflow.version}"
+
+
+@pytest.mark.asyncio
+async def test_get_data_arrow(
+    test_client: AsyncClient, observations: Dataflow, existing_user_token: str
+) -> None:
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers={"Authorization": f"Bearer {existing_user_token}"},
+        params={"batch_size": 5},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    table = pa.ipc.open_stream(r.content).read_all()
+    assert table.num_rows == SCALE.series_per_dataflow * SCALE.observations_per_series
+    assert table.column_names[-3:] == ["TIME_PERIOD", "OBS_VALUE", "OBS_STATUS"]
+    assert set(table.column("OBS_STATUS").to_pylist()) == {"A"}
+
+
+@pytest.mark.asyncio
+async def test_get_data_parquet(
+    test_client: AsyncClient, observations: Dataflow, existing_user_token: str
+) -> None:
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{observations.id}/all",
+        headers={"Authorization": f"Bearer {existing_user_token}"},
+        params={
+            "format": "parquet",
+            "startPeriod": "2000-02",
+            "endPeriod": "2000-Q1",
+            "batch_size": 3,
+        },
+    )
+    assert r.status_code == 200
+
+    table = pq.read_table(io.BytesIO(r.content))
+    assert table.num_rows == SCALE.series_per_dataflow * 2
+    assert set(table.column("TIME_PERIOD").to_pylist()) == {"2000-02", "2000-03"}
+
+
+@pytest.mark.asyncio
+async def test_get_data_ndjson(
+    test_client: AsyncClient, observations: Dataflow, existing_user_token: str
+) -> None:
+    unfiltered = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers={"Authorization": f"Bearer {existing_user_token}"},
+        params={"format": "ndjson"},
+    )
+    records = [orjson.loads(line) for line in unfiltered.content.splitlines()]
+    key = ".".join(v for k, v in records[-1].items() if k.startswith("DIM_"))
+
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/{key}",
+        headers={"Authorization": f"Bearer {existing_user_token}"},
+        params={"format": "ndjson"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line) for line in r.content.splitlines()] == (
+        records[-SCALE.observations_per_series :]
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_data_errors(
+    test_client: AsyncClient, observations: Dataflow, existing_user_token: str
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+
+    r = await test_client.get("/api/v1/sdmx/data/UNKNOWN/all", headers=headers)
+    assert r.status_code == 404
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/A.B", headers=headers
+    )
+    assert r.status_code == 400
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers=headers,
+        params={"startPeriod": "yesterday"},
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_data_rollups(
+    test_client: AsyncClient, observations: Dataflow, existing_user_token: str
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    monthly = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers=headers,
+        params={"format": "ndjson"},
+    )
+    values = [orjson.loads(line)["OBS_VALUE"] for line in monthly.content.splitlines()]
+
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers=headers,
+        params={"format": "ndjson", "frequency": "Q", "aggregation": "sum"},
+    )
+    assert r.status_code == 200
+    records = [orjson.loads(line) for line in r.content.splitlines()]
+    assert [record["TIME_PERIOD"] for record in records[:2]] == ["2000-Q1", "2000-Q2"]
+    assert [record["OBS_VALUE"] for record in records] == pytest.approx(
+        [sum(values[i : i + 3]) for i in range(0, len(values), 3)]
+    )
+
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers=headers,
+        params={"format": "ndjson", "frequency": "A", "startPeriod": "2001"},
+    )
+    assert r.status_code == 200
+    assert r.content == b""
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers=headers,
+        params={"frequency": "W"},
+    )
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_data_content_constraints(
+    test_client: AsyncClient,
+    observations: Dataflow,
+    content_constraints: Dataflow,
+    existing_user_token: str,
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/all",
+        headers=headers,
+        params={"format": "ndjson"},
+    )
+    assert r.status_code == 200
+    assert len(r.content.splitlines()) == (
+        SCALE.series_per_dataflow * SCALE.observations_per_series
+    )
+
+    key = f"{code_id(SCALE.series_per_dataflow)}.."
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/{key}",
+        headers=headers,
+        params={"format": "ndjson"},
+    )
+    assert r.status_code == 200
+    assert r.content == b""
+    r = await test_client.get(
+        f"/api/v1/sdmx/data/{flow_ref(observations)}/{key}", headers=headers
+    )
+    assert r.status_code == 200
+    assert pa.ipc.open_stream(r.content).read_all().num_rows == 0
+
+
+@pytest.mark.asyncio
+async def test_get_available_constraint(
+    test_client: AsyncClient, observations: Dataflow, existing_user_token: str
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    url = f"/api/v1/sdmx/availableconstraint/{flow_ref(observations)}"
+    codes = sorted(code_id(s) for s in range(SCALE.series_per_dataflow))
+
+    r = await test_client.get(f"{url}/all", headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {
+        "series": SCALE.series_per_dataflow,
+        "key_values": {
+            dimension_id(0): codes,
+            dimension_id(1): [code_id(0)],
+            dimension_id(2): [code_id(0)],
+        },
+    }
+
+    r = await test_client.get(f"{url}/{code_id(1)}..", headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {
+        "series": 1,
+        "key_values": {
+            dimension_id(0): [code_id(1)],
+            dimension_id(1): [code_id(0)],
+            dimension_id(2): [code_id(0)],
+        },
+    }
+
+    r = await test_client.get(
+        f"{url}/{code_id(1)}.{code_id(1)}.",
+        headers=headers,
+        params={"mode": "available"},
+    )
+    assert r.status_code == 200
+    assert r.json() == {
+        "series": 0,
+        "key_values": {
+            dimension_id(0): [],
+            dimension_id(1): [code_id(0)],
+            dimension_id(2): [],
+        },
+    }
+
+    r = await test_client.get(f"{url}/A.B", headers=headers)
+    assert r.status_code == 400
+    r = await test_client.get(
+        "/api/v1/sdmx/availableconstraint/UNKNOWN/all", headers=headers
+    )
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_available_constraint_fallback(
+    test_client: AsyncClient,
+    session: AsyncSession,
+    content_constraints: Dataflow,
+    existing_user_token: str,
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    url = f"/api/v1/sdmx/availableconstraint/{flow_ref(content_constraints)}"
+    expected = {
+        "series": None,
+        "key_values": {
+            dimension_id(0): sorted(
+                code_id(s) for s in range(SCALE.series_per_dataflow)
+            ),
+            dimension_id(1): [code_id(0)],
+            dimension_id(2): [code_id(0)],
+        },
+    }
+
+    r = await test_client.get(
+        f"{url}/{code_id(1)}..", headers=headers, params={"mode": "available"}
+    )
+    assert r.status_code == 200
+    assert r.json() == expected
+
+    await create_partition(session, content_constraints)
+    await session.commit()
+    r = await test_client.get(
+        f"{url}/{code_id(1)}..", headers=headers, params={"mode": "available"}
+    )
+    assert r.status_code == 200
+    assert r.json() == expected
+
+
+@pytest.mark.asyncio
+async def test_list_metadata(
+    test_client: AsyncClient, dataflow: Dataflow, existing_user_token: str
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+
+    r = await test_client.get("/api/v1/sdmx/dataflows", headers=headers)
+    assert r.status_code == 200
+    assert len(r.json()) == SCALE.dataflows
+    assert r.json()[0]["id"] == dataflow.id
+    assert r.json()[0]["structure_id"] == dataflow.structure_id
+    assert r.json()[0]["description"] is None
+
+    r = await test_client.get(
+        "/api/v1/sdmx/codelists", headers=headers, params={"limit": 3}
+    )
+    assert r.status_code == 200
+    assert len(r.json()) == 3
+    assert all(c["codes"] is None for c in r.json())
+    r = await test_client.get(
+        "/api/v1/sdmx/codelists",
+        headers=headers,
+        params={"limit": 3, "cursor": r.headers["X-Next-Cursor"]},
+    )
+    assert r.status_code == 200
+    assert len(r.json()) == SCALE.codelists - 3
+
+    r = await test_client.get(
+        "/api/v1/sdmx/datastructures",
+        headers=headers,
+        params={"agency_id": "UNKNOWN"},
+    )
+    assert r.status_code == 200
+    assert r.json() == []
+    r = await test_client.get(
+        "/api/v1/sdmx/datastructures", headers=headers, params={"cursor": "invalid"}
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_metadata(
+    test_client: AsyncClient, dataflow: Dataflow, existing_user_token: str
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    url = (
+        f"/api/v1/sdmx/datastructures/{dataflow.structure_agency_id}"
+        f"/{dataflow.structure_id}/{dataflow.structure_version}"
+    )
+
+    r = await test_client.get(
+        f"/api/v1/sdmx/dataflows/{dataflow.agency_id}/{dataflow.id}/{dataflow.version}",
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["name"] == dataflow.name
+
+    r = await test_client.get(url, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["dimensions"] is None
+    assert r.json()["attributes"] is None
+
+    r = await test_client.get(
+        url, headers=headers, params={"include": ["dimensions", "primary_measures"]}
+    )
+    assert r.status_code == 200
+    assert [d["id"] for d in r.json()["dimensions"]] == [
+        dimension_id(k) for k in range(SCALE.dimensions)
+    ]
+    assert len(r.json()["primary_measures"]) == 1
+    assert r.json()["attributes"] is None
+
+    r = await test_client.get(url, headers=headers, params={"include": "codes"})
+    assert r.status_code == 422
+    r = await test_client.get(
+        "/api/v1/sdmx/codelists/SYNTH/UNKNOWN/1.0", headers=headers
+    )
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_items(
+    test_client: AsyncClient,
+    session: AsyncSession,
+    dataflow: Dataflow,
+    existing_user_token: str,
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    structures = parse_synth("".join(generate_concept_schemes(SCALE))).structures
+    assert structures and structures.concepts
+    await etl.load_concept_schemes(session, structures.concepts.concept_scheme)
+
+    url = "/api/v1/sdmx/codelists/SYNTH/CL_00000/1.0"
+    r = await test_client.get(url, headers=headers, params={"include": "codes"})
+    assert r.status_code == 200
+    assert sorted(c["id"] for c in r.json()["codes"]) == [
+        code_id(i) for i in range(SCALE.codes_per_codelist)
+    ]
+
+    codes: list[str] = []
+    params: dict[str, Any] = {"limit": 4}
+    while True:
+        r = await test_client.get(f"{url}/codes", headers=headers, params=params)
+        assert r.status_code == 200
+        codes.extend(c["id"] for c in r.json())
+        if "X-Next-Cursor" not in r.headers:
+            break
+        params["cursor"] = r.headers["X-Next-Cursor"]
+    assert codes == [code_id(i) for i in range(SCALE.codes_per_codelist)]
+
+    r = await test_client.get(
+        "/api/v1/sdmx/codelists/SYNTH/UNKNOWN/1.0/codes", headers=headers
+    )
+    assert r.status_code == 404
+
+    r = await test_client.get("/api/v1/sdmx/conceptschemes", headers=headers)
+    assert r.status_code == 200
+    assert [c["id"] for c in r.json()] == ["CS_SYNTH"]
+    r = await test_client.get(
+        "/api/v1/sdmx/conceptschemes/SYNTH/CS_SYNTH/1.0/concepts", headers=headers
+    )
+    assert r.status_code == 200
+    assert len(r.json()) == SCALE.dimensions + 3
+    r = await test_client.get(
+        "/api/v1/sdmx/conceptschemes/SYNTH/CS_SYNTH/1.0",
+        headers=headers,
+        params={"include": "concepts"},
+    )
+    assert r.status_code == 200
+    assert len(r.json()["concepts"]) == SCALE.dimensions + 3
+
+
+@pytest.mark.asyncio
+async def test_list_ndjson(
+    test_client: AsyncClient,
+    dataflow: Dataflow,
+    existing_user_token: str,
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    url = "/api/v1/sdmx/codelists/SYNTH/CL_00000/1.0/codes"
+    r = await test_client.get(url, headers=headers, params={"format": "ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    lines = [orjson.loads(line) for line in r.content.splitlines()]
+    assert [c["id"] for c in lines] == [
+        code_id(i) for i in range(SCALE.codes_per_codelist)
+    ]
+    r = await test_client.get(url, headers=headers, params={"limit": 2})
+    assert r.json() == lines[:2]
+
+    r = await test_client.get(
+        url,
+        headers=headers,
+        params={"format": "ndjson", "cursor": r.headers["X-Next-Cursor"]},
+    )
+    assert [orjson.loads(line) for line in r.content.splitlines()] == lines[2:]
+
+    r = await test_client.get(
+        "/api/v1/sdmx/codelists", headers=headers, params={"format": "ndjson"}
+    )
+    assert r.status_code == 200
+    assert len(r.content.splitlines()) == SCALE.codelists
+
+    r = await test_client.get(
+        url, headers=headers, params={"format": "ndjson", "cursor": "!!"}
+    )
+    assert r.status_code == 400
+    r = await test_client.get(
+        "/api/v1/sdmx/codelists/SYNTH/UNKNOWN/1.0/codes",
+        headers=headers,
+        params={"format": "ndjson"},
+    )
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_search(
+    test_client: AsyncClient,
+    session: AsyncSession,
+    dataflow: Dataflow,
+    existing_user_token: str,
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    structures = parse_synth("".join(generate_concept_schemes(SCALE))).structures
+    assert structures and structures.concepts
+    await etl.load_concept_schemes(session, structures.concepts.concept_scheme)
+
+    url = "/api/v1/sdmx/search/codes"
+    r = await test_client.get(
+        url, headers=headers, params={"q": '"code 3" codelists 1'}
+    )
+    assert r.status_code == 200
+    assert [(c["id"], c["codelist_id"]) for c in r.json()] == [
+        (code_id(3), codelist_id(1))
+    ]
+
+    r = await test_client.get(url, headers=headers, params={"q": code_id(3).lower()})
+    assert [(c["id"], c["codelist_id"]) for c in r.json()] == [
+        (code_id(3), codelist_id(i)) for i in range(SCALE.codelists)
+    ]
+
+    pages = [
+        [
+            (c["id"], c["codelist_id"])
+            for c in (
+                await test_client.get(
+                    url,
+                    headers=headers,
+                    params={"q": '"codelist 0"', "limit": 4, "offset": offset},
+                )
+            ).json()
+        ]
+        for offset in (0, 4, 8)
+    ]
+    assert [len(p) for p in pages] == [4, 4, 2]
+    assert sorted(sum(pages, [])) == [
+        (code_id(i), codelist_id(0)) for i in range(SCALE.codes_per_codelist)
+    ]
+
+    r = await test_client.get(url, headers=headers, params={"q": "C%3"})
+    assert r.json() == []
+    r = await test_client.get(url, headers=headers, params={"q": "C"})
+    assert r.status_code == 422
+
+    r = await test_client.get(
+        "/api/v1/sdmx/search/dataflows", headers=headers, params={"q": "DF_0"}
+    )
+    assert [d["id"] for d in r.json()] == [
+        dataflow_id(i) for i in range(SCALE.dataflows)
+    ]
+    r = await test_client.get(
+        "/api/v1/sdmx/search/dataflows", headers=headers, params={"q": "dataflows 2"}
+    )
+    assert [d["id"] for d in r.json()] == [dataflow_id(2)]
+
+    r = await test_client.get(
+        "/api/v1/sdmx/search/concepts", headers=headers, params={"q": "concepts"}
+    )
+    assert len(r.json()) == SCALE.dimensions + 3
+    assert {c["concept_scheme_id"] for c in r.json()} == {"CS_SYNTH"}
+
+
+@pytest.mark.asyncio
+async def test_metadata_cache(
+    test_client: AsyncClient,
+    session: AsyncSession,
+    dataflow: Dataflow,
+    redis: FakeArqRedis,
+    existing_user_token: str,
+) -> None:
+    headers = {"Authorization": f"Bearer {existing_user_token}"}
+    codelist_url = "/api/v1/sdmx/codelists/SYNTH/CL_00000/1.0"
+    dataflow_url = (
+        f"/api/v1/sdmx/dataflows/{dataflow.agency_id}/{dataflow.id}/{dataflow.version}"
+    )
+
+    r = await test_client.get(codelist_url, headers=headers)
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "gzip"
+    etag = r.headers["ETag"]
+    r = await test_client.get(
+        codelist_url, headers={**headers, "Accept-Encoding": "identity"}
+    )
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+    assert r.headers["ETag"] == etag
+    assert orjson.loads(r.content)["name"] == "Codelist 0"
+    r = await test_client.get(codelist_url, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+
+    r = await test_client.get(dataflow_url, headers=headers)
+    assert r.status_code == 200
+    r = await test_client.get("/api/v1/sdmx/codelists", headers=headers)
+    assert r.status_code == 200
+    assert len([k for k in redis.values if ":response:" in k]) == 3
+
+    structures = parse_synth("".join(generate_codelists(SCALE, [0]))).structures
+    assert structures and structures.codelists
+    codelist = structures.codelists.codelist[0]
+    codelist.name[0].value = "Renamed"
+    await etl.load_codelists(session, [codelist])
+    assert len([k for k in redis.values if ":response:" in k]) == 1
+
+    r = await test_client.get(codelist_url, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["name"] == "Renamed"
+    assert r.headers["ETag"] != etag
@@ -0,0 +1,190 @@
+import random
+from datetime import datetime, timedelta
+from fennec_api.sdmx_v21.models import Provider
+from fennec_api.sdmx_v21.scheduler import (
+    is_due,
+    is_overdue,
+    provider_host,
+    minutes_until_window_end,
+    bulk_quota,
+    plan_harvests,
+)
+
+NOW = datetime(2024, 9, 1, 12, 0)
+
+
+def make_provider(
+    id: int,
+    root_url: str = "https://www.bdm.insee.fr/series/sdmx",
+    *,
+    bulk_download: bool = False,
+    priority: int = 0,
+    last_collected_at: datetime | None = None,
+    last_attempted_at: datetime | None = None,
+    failure_count: int = 0,
+) -> Provider:
+    return Provider(
+        id=id,
+        agency_id="FR1",
+        root_url=root_url,
+        bulk_download=bulk_download,
+        skip_categories=False,
+        process_all_agencies=False,
+        harvest_interval=24,
+        priority=priority,
+        last_collected_at=last_collected_at,
+        last_attempted_at=last_attempted_at,
+        failure_count=failure_count,
+    )
+
+
+def test_is_due() -> None:
+    assert is_due(make_provider(1), NOW)
+    assert is_due(make_provider(1, last_collected_at=NOW - timedelta(days=1)), NOW)
+    assert not is_due(make_provider(1, last_collected_at=NOW - timedelta(hours=1)), NOW)
+
+
+def test_is_due_backs_off_after_failures() -> None:
+    def failed(failure_count: int, minutes: int) -> Provider:
+        return make_provider(
+            1,
+            last_collected_at=NOW - timedelta(days=2),
+            last_attempted_at=NOW - timedelta(minutes=minutes),
+            failure_count=failure_count,
+        )
+
+    assert not is_due(failed(1, 5), NOW)
+    assert is_due(failed(1, 15), NOW)
+    assert not is_due(failed(3, 45), NOW)
+    assert is_due(failed(3, 60), NOW)
+    assert is_due(failed(3, 10), NOW, retry_delay=timedelta(minutes=2))
+    assert not is_due(failed(20, 23 * 60), NOW)
+    assert is_due(failed(20, 24 * 60), NOW)
+
+
+def test_is_overdue() -> None:
+    assert not is_overdue(make_provider(1), NOW)
+    assert not is_overdue(
+        make_provider(1, last_collected_at=NOW - timedelta(days=1)), NOW
+    )
+    assert is_overdue(make_provider(1, last_collected_at=NOW - timedelta(days=2)), NOW)
+
+
+def test_provider_host() -> None:
+    assert provider_host(make_provider(1)) == "www.bdm.insee.fr"
+
+
+def test_minutes_until_window_end() -> None:
+    assert minutes_until_window_end(NOW, start_hour=0, end_hour=6) is None
+    assert minutes_until_window_end(NOW.replace(hour=5), start_hour=0, end_hour=6) == 60
+    assert (
+        minutes_until_window_end(NOW.replace(hour=23), start_hour=22, end_hour=2) == 180
+    )
+    assert (
+        minutes_until_window_end(NOW.replace(hour=1), start_hour=22, end_hour=2) == 60
+    )
+    assert minutes_until_window_end(NOW, start_hour=22, end_hour=2) is None
+
+
+def test_bulk_quota() -> None:
+    assert bulk_quota(10, NOW, start_hour=0, end_hour=6, schedule_interval=5) == 0
+    assert (
+        bulk_quota(
+            10, NOW.replace(hour=5), start_hour=0, end_hour=6, schedule_interval=5
+        )
+        == 1
+    )
+    assert (
+        bulk_quota(
+            10,
+            NOW.replace(hour=5, minute=55),
+            start_hour=0,
+            end_hour=6,
+            schedule_interval=5,
+        )
+        == 10
+    )
+    assert bulk_quota(10, NOW, start_hour=0, end_hour=0, schedule_interval=5) == 10
+
+
+def test_plan_harvests_orders_by_priority_and_caps_concurrency() -> None:
+    providers = [
+        make_provider(1, "https://a.org/sdmx"),
+        make_provider(2, "https://b.org/sdmx", priority=10),
+        make_provider(3, "https://c.org/sdmx", last_collected_at=NOW),
+        make_provider(4, "https://d.org/sdmx"),
+        make_provider(5, "https://e.org/sdmx"),
+    ]
+    plans = plan_harvests(
+        providers,
+        now=NOW,
+        in_flight={5},
+        max_concurrency=3,
+        max_per_host=1,
+        jitter=60,
+        night_start_hour=0,
+        night_end_hour=6,
+        schedule_interval=5,
+        rng=random.Random(0),
+    )
+    assert [p.provider_id for p in plans] == [2, 1]
+    assert all(timedelta(0) <= p.defer_by <= timedelta(seconds=60) for p in plans)
+
+
+def test_plan_harvests_caps_per_host() -> None:
+    providers = [make_provider(id) for id in range(1, 5)]
+    plans = plan_harvests(
+        providers,
+        now=NOW,
+        in_flight={1},
+        max_concurrency=10,
+        max_per_host=2,
+        jitter=0,
+        night_start_hour=0,
+        night_end_hour=6,
+        schedule_interval=5,
+    )
+    assert [p.provider_id for p in plans] == [2]
+
+
+def test_plan_harvests_spreads_bulk_providers_over_night() -> None:
+    providers = [
+        make_provider(id, f"https://{id}.org/sdmx", bulk_download=True)
+        for id in range(1, 11)
+    ]
+    kwargs = dict(
+        in_flight=set(),
+        max_concurrency=10,
+        max_per_host=1,
+        jitter=0,
+        night_start_hour=0,
+        night_end_hour=6,
+        schedule_interval=30,
+    )
+    assert plan_harvests(providers, now=NOW, **kwargs) == []  # type: ignore[arg-type]
+    plans = plan_harvests(providers, now=NOW.replace(hour=1), **kwargs)  # type: ignore[arg-type]
+    assert len(plans) == 1
+
+
+def test_plan_harvests_does_not_hold_back_overdue_bulk_providers() -> None:
+    providers = [
+        make_provider(1, "https://a.org/sdmx", bulk_download=True),
+        make_provider(
+            2,
+            "https://b.org/sdmx",
+            bulk_download=True,
+            last_collected_at=NOW - timedelta(days=2),
+        ),
+    ]
+    plans = plan_harvests(
+        providers,
+        now=NOW,
+        in_flight=set(),
+        max_concurrency=10,
+        max_per_host=1,
+        jitter=0,
+        night_start_hour=0,
+        night_end_hour=6,
+        schedule_interval=30,
+    )
+    assert [p.provider_id for p in plans] == [2]
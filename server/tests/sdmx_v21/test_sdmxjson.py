@@ -0,0 +1,133 @@
+from typing import Any, Callable, Iterator
+import dataclasses
+import pytest
+from fennec_api.sdmx_v21.etl import JsonDataDecoder, StructureSpecificDecoder
+from fennec_api.sdmx_v21.parser import (
+    is_json,
+    parse_json_structure,
+    parse_structure,
+    Error,
+    ObjectTypeCodelistType,
+    PackageTypeCodelistType,
+    RefBaseType,
+    Structure,
+)
+from fennec_api.sdmx_v21.parser.sdmxjson import parse_urn
+from tools.sdmx_synth import (
+    dimension_id,
+    generate_categorisations,
+    generate_category_schemes,
+    generate_codelists,
+    generate_concept_schemes,
+    generate_data,
+    generate_dataflows,
+    generate_json_categorisations,
+    generate_json_category_schemes,
+    generate_json_codelists,
+    generate_json_concept_schemes,
+    generate_json_data,
+    generate_json_data_structures,
+    generate_json_dataflows,
+    generate_data_structures,
+    Scale,
+    SCALES,
+)
+
+SCALE = SCALES["tiny"]
+
+Generator = Callable[[Scale], Iterator[str]]
+
+
+def test_parse_urn() -> None:
+    assert parse_urn(
+        "urn:sdmx:org.sdmx.infomodel.codelist.Codelist=FR1:CL_FREQ(1.0)"
+    ) == RefBaseType(
+        id="CL_FREQ",
+        agency_id="FR1",
+        version="1.0",
+        package=PackageTypeCodelistType.CODELIST,
+        class_value=ObjectTypeCodelistType.CODELIST,
+    )
+    assert parse_urn(
+        "urn:sdmx:org.sdmx.infomodel.conceptscheme.Concept=FR1:CONCEPTS(1.0).FREQ"
+    ) == RefBaseType(
+        id="FREQ",
+        agency_id="FR1",
+        maintainable_parent_id="CONCEPTS",
+        maintainable_parent_version="1.0",
+        package=PackageTypeCodelistType.CONCEPTSCHEME,
+        class_value=ObjectTypeCodelistType.CONCEPT,
+    )
+    with pytest.raises(ValueError):
+        parse_urn("FR1:CL_FREQ(1.0)")
+
+
+def test_is_json() -> None:
+    assert is_json(b'  {"data": {}}')
+    assert not is_json(b'<?xml version="1.0"?><Structure/>')
+
+
+def as_dict(obj: Any) -> Any:
+    if dataclasses.is_dataclass(obj):
+        return {
+            f.name: as_dict(getattr(obj, f.name, None))
+            for f in dataclasses.fields(obj)
+            if f.name != "attribute_relationship"
+        }
+    if isinstance(obj, list):
+        return [as_dict(o) for o in obj]
+    return obj
+
+
+@pytest.mark.parametrize(
+    "xml,json",
+    [
+        (generate_dataflows, generate_json_dataflows),
+        (generate_data_structures, generate_json_data_structures),
+        (generate_codelists, generate_json_codelists),
+        (generate_concept_schemes, generate_json_concept_schemes),
+        (generate_category_schemes, generate_json_category_schemes),
+        (generate_categorisations, generate_json_categorisations),
+    ],
+)
+def test_parse_json_structure(xml: Generator, json: Generator) -> None:
+    xml_message = parse_structure("".join(xml(SCALE)).encode())
+    json_message = parse_json_structure("".join(json(SCALE)).encode())
+
+    assert isinstance(xml_message, Structure)
+    assert isinstance(json_message, Structure)
+    assert as_dict(json_message.structures) == as_dict(xml_message.structures)
+
+
+def test_parse_json_errors() -> None:
+    message = parse_json_structure(
+        b'{"errors": [{"code": 100, "title": "No Results Found"}]}'
+    )
+
+    assert isinstance(message, Error)
+    assert message.error_message[0].code == "100"
+    assert message.error_message[0].text[0].value == "No Results Found"
+
+
+def build_decoder(cls: type[StructureSpecificDecoder]) -> StructureSpecificDecoder:
+    return cls(
+        dimensions=tuple(dimension_id(k) for k in range(SCALE.dimensions)),
+        attributes=("OBS_STATUS",),
+        time_dimension="TIME_PERIOD",
+        primary_measure="OBS_VALUE",
+    )
+
+
+def test_decode_json_data() -> None:
+    xml_decoder = build_decoder(StructureSpecificDecoder)
+    json_decoder = build_decoder(JsonDataDecoder)
+
+    [xml_batch] = xml_decoder.decode("".join(generate_data(SCALE, 0)).encode())
+    json_batches = list(
+        json_decoder.decode(
+            "".join(generate_json_data(SCALE, 0)).encode(), batch_size=10
+        )
+    )
+
+    assert [len(b) for b in json_batches] == [10, 10, 4]
+    assert [row for b in json_batches for row in b.rows()] == list(xml_batch.rows())
@@ -42,3 +42,25 @@ async def test_manage_provider(
     )
     assert updated_provider
     assert updated_provider.root_url == "https://www.bdm.insee.fr/series/sdmx2"
+
+
+@pytest.mark.asyncio
+async def test_track_provider_attempts(
+    session: AsyncSession, provider_data: dict[str, Any]
+) -> None:
+    provider = await service.create_provider(
+        session, obj_in=ProviderCreate.model_validate(provider_data)
+    )
+    assert provider.failure_count == 0
+
+    await service.mark_provider_attempted(session, db_obj=provider)
+    await service.mark_provider_failed(session, id=provider.id)
+    await service.mark_provider_failed(session, id=provider.id)
+    await session.refresh(provider)
+    assert provider.last_attempted_at
+    assert provider.last_collected_at is None
+    assert provider.failure_count == 2
+
+    await service.mark_provider_collected(session, db_obj=provider)
+    assert provider.last_collected_at
+    assert provider.failure_count == 0
@@ -0,0 +1,63 @@
+from typing import cast
+import pytest
+from pydantic import HttpUrl
+from sqlalchemy.ext.asyncio import AsyncSession
+from arq.connections import ArqRedis
+from fennec_api.sdmx_v21.schemas import ProviderCreate
+from fennec_api.sdmx_v21.service import create_provider
+from fennec_api.sdmx_v21.tasks import (
+    enqueue_collect_provider,
+    collect_provider_job_id,
+    schedule_harvests,
+)
+from tests.sdmx_v21.conftest import FakeArqRedis
+
+
+def test_collect_provider_job_id() -> None:
+    assert collect_provider_job_id(5) == "collect_provider:5"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_collect_provider_coalesces(redis: FakeArqRedis) -> None:
+    first = await enqueue_collect_provider(cast(ArqRedis, redis), 5)
+    second = await enqueue_collect_provider(cast(ArqRedis, redis), 5)
+    other = await enqueue_collect_provider(cast(ArqRedis, redis), 6)
+
+    assert first.job_id == second.job_id == "collect_provider:5"
+    assert other.job_id == "collect_provider:6"
+    assert list(redis.jobs) == ["collect_provider:5", "collect_provider:6"]
+
+
+@pytest.mark.asyncio
+async def test_schedule_harvests(session: AsyncSession, redis: FakeArqRedis) -> None:
+    providers = [
+        await create_provider(
+            session,
+            obj_in=ProviderCreate(
+                agency_id="FR1",
+                root_url=HttpUrl(f"https://{host}/sdmx"),
+                bulk_download=False,
+                skip_categories=False,
+                process_all_agencies=False,
+            ),
+        )
+        for host in ("a.org", "b.org")
+    ]
+    await enqueue_collect_provider(cast(ArqRedis, redis), providers[0].id)
+
+    await schedule_harvests({"session": session, "redis": redis})
+
+    assert list(redis.jobs) == [
+        collect_provider_job_id(providers[0].id),
+        collect_provider_job_id(providers[1].id),
+    ]
+    assert redis.options[collect_provider_job_id(providers[1].id)]["_defer_by"]
+
+
+@pytest.mark.asyncio
+async def test_enqueue_collect_provider_profile_memory(redis: FakeArqRedis) -> None:
+    await enqueue_collect_provider(cast(ArqRedis, redis), 5)
+    await enqueue_collect_provider(cast(ArqRedis, redis), 6, profile_memory=True)
+
+    assert "profile_memory" not in redis.options["collect_provider:5"]
+    assert redis.options["collect_provider:6"]["profile_memory"] is True
@@ -0,0 +1,97 @@
+import time
+from fennec_api.supervisor import Supervisor, build_health_check_key
+
+
+def sleep_forever(index: int, max_jobs: int, job_timeout: int) -> None:
+    time.sleep(60)
+
+
+def exit_immediately(index: int, max_jobs: int, job_timeout: int) -> None:
+    pass
+
+
+def test_build_health_check_key() -> None:
+    assert build_health_check_key(0) == "arq:queue:health-check:0"
+    assert build_health_check_key(3) == "arq:queue:health-check:3"
+
+
+def test_supervisor_start_and_shutdown() -> None:
+    supervisor = Supervisor(
+        processes=2,
+        max_jobs=5,
+        job_timeout=60,
+        shutdown_timeout=5,
+        target=sleep_forever,
+    )
+    supervisor.start()
+    assert sorted(supervisor.workers) == [0, 1]
+    assert all(p.is_alive() for p in supervisor.workers.values())
+
+    supervisor.shutdown()
+    assert not any(p.is_alive() for p in supervisor.workers.values())
+
+
+def test_supervisor_restarts_dead_workers() -> None:
+    supervisor = Supervisor(
+        processes=1,
+        max_jobs=5,
+        job_timeout=60,
+        shutdown_timeout=5,
+        target=exit_immediately,
+        min_uptime=0,
+    )
+    supervisor.start()
+    first = supervisor.workers[0]
+    first.join()
+
+    supervisor.restart_dead_workers()
+    assert supervisor.workers[0] is not first
+
+    supervisor.shutdown()
+
+
+def test_supervisor_backs_off_fast_failures() -> None:
+    supervisor = Supervisor(
+        processes=1,
+        max_jobs=5,
+        job_timeout=60,
+        shutdown_timeout=5,
+        target=exit_immediately,
+        restart_backoff=10,
+        max_fast_failures=3,
+    )
+    supervisor.start()
+    first = supervisor.workers[0]
+    first.join()
+
+    now = supervisor.started_at[0]
+    supervisor.restart_dead_workers(now)
+    assert supervisor.workers[0] is first
+    supervisor.restart_dead_workers(now + 10)
+    second = supervisor.workers[0]
+    assert second is not first
+    second.join()
+
+    now = supervisor.started_at[0]
+    supervisor.restart_dead_workers(now + 1)
+    assert supervisor.restart_at[0] == now + 21
+    supervisor.restart_dead_workers(now + 21)
+    supervisor.workers[0].join()
+
+    supervisor.restart_dead_workers(supervisor.started_at[0] + 1)
+    assert supervisor.exit_code == 1
+    supervisor.shutdown()
+
+
+def test_supervise_exits_after_repeated_fast_failures() -> None:
+    supervisor = Supervisor(
+        processes=1,
+        max_jobs=5,
+        job_timeout=60,
+        shutdown_timeout=5,
+        target=exit_immediately,
+        poll_interval=0.01,
+        restart_backoff=0.01,
+        max_fast_failures=2,
+    )
+    assert supervisor.supervise() == 1
@@ -0,0 +1,19 @@
+from typing import Any
+import pytest
+from fennec_api.worker import on_job_start, on_job_end
+
+
+@pytest.mark.asyncio
+async def test_job_sessions() -> None:
+    base_ctx: dict[str, Any] = {"redis": None}
+    first_ctx = {**base_ctx, "job_id": "first"}
+    second_ctx = {**base_ctx, "job_id": "second"}
+
+    await on_job_start(first_ctx)
+    await on_job_start(second_ctx)
+
+    assert "session" not in base_ctx
+    assert first_ctx["session"] is not second_ctx["session"]
+
+    await on_job_end(first_ctx)
+    await on_job_end(second_ctx)
@@ -0,0 +1,199 @@
+import gzip
+import time
+from pathlib import Path
+import httpx
+import pytest
+from fennec_api.sdmx_v21.client import SDMX21RestClient
+import fennec_api.sdmx_v21.etl as etl
+from tools.sdmx_standin import (
+    build_key,
+    create_app,
+    Cassette,
+    RecordingTransport,
+    StandinOptions,
+)
+
+STRUCTURE_XML = "application/vnd.sdmx.structure+xml;version=2.1"
+STRUCTURE_JSON = "application/vnd.sdmx.structure+json;version=1.0"
+
+
+def standin_client(
+    cassette: Cassette,
+    options: StandinOptions | None = None,
+    record_from: str | None = None,
+) -> httpx.AsyncClient:
+    app = create_app(cassette, options, record_from=record_from)
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://standin"
+    )
+
+
+@pytest.fixture()
+def cassette(tmp_path: Path) -> Cassette:
+    cassette = Cassette(tmp_path / "cassette")
+    cassette.add(
+        build_key("dataflow"),
+        status_code=200,
+        content_type=STRUCTURE_XML,
+        body=Path("data/sdmxml21/dataflow.xml").read_bytes(),
+    )
+    cassette.save()
+    return cassette
+
+
+def test_build_key() -> None:
+    assert build_key("/codelist/ECB/CL_FREQ/") == "codelist/ECB/CL_FREQ"
+    assert (
+        build_key("codelist", [("references", "none"), ("detail", "full")])
+        == "codelist?detail=full&references=none"
+    )
+    assert build_key("dataflow", media_type="*/*") == "dataflow"
+    assert (
+        build_key("dataflow", [("detail", "full")], STRUCTURE_XML)
+        == f"dataflow?detail=full#{STRUCTURE_XML}"
+    )
+
+
+def test_cassette_save_and_load(cassette: Cassette) -> None:
+    loaded = Cassette.load(cassette.root)
+    interaction = loaded.get("dataflow")
+
+    assert interaction
+    assert interaction.content_type == STRUCTURE_XML
+    assert loaded.read(interaction) == Path("data/sdmxml21/dataflow.xml").read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_replay(cassette: Cassette) -> None:
+    async with standin_client(cassette) as client:
+        sdmx_client = SDMX21RestClient(http_client=client, root_url="http://standin")
+        dataflows = await etl.fetch_all_dataflows(sdmx_client)
+        missing = await client.get("/codelist/ECB/CL_FREQ")
+
+    assert dataflows[0].id == "BALANCE-PAIEMENTS"
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_record(tmp_path: Path) -> None:
+    upstream_requests: list[httpx.Request] = []
+
+    async def upstream(req: httpx.Request) -> httpx.Response:
+        upstream_requests.append(req)
+        return httpx.Response(
+            200,
+            headers={"Content-Type": STRUCTURE_XML},
+            content=Path("data/sdmxml21/dataflow.xml").read_bytes(),
+        )
+
+    cassette = Cassette(tmp_path / "cassette")
+    async with httpx.AsyncClient(
+        transport=RecordingTransport(
+            cassette, "http://provider/sdmx", httpx.MockTransport(upstream)
+        ),
+        base_url="http://provider/sdmx",
+    ) as client:
+        r = await client.get("dataflow", params={"detail": "full"})
+    cassette.save()
+
+    assert r.status_code == 200
+    assert len(upstream_requests) == 1
+
+    async with standin_client(Cassette.load(cassette.root)) as client:
+        r = await client.get("/dataflow", params={"detail": "full"})
+
+    assert r.status_code == 200
+    assert r.headers["content-type"] == STRUCTURE_XML
+    assert r.content == Path("data/sdmxml21/dataflow.xml").read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_record_per_media_type(tmp_path: Path) -> None:
+    async def upstream(req: httpx.Request) -> httpx.Response:
+        content_type = req.headers["accept"]
+        return httpx.Response(
+            200, headers={"Content-Type": content_type}, content=content_type.encode()
+        )
+
+    cassette = Cassette(tmp_path / "cassette")
+    async with httpx.AsyncClient(
+        transport=RecordingTransport(
+            cassette, "http://provider/sdmx", httpx.MockTransport(upstream)
+        ),
+        base_url="http://provider/sdmx",
+    ) as client:
+        for media_type in (STRUCTURE_XML, STRUCTURE_JSON):
+            await client.get("dataflow", headers={"Accept": media_type})
+    cassette.save()
+
+    async with standin_client(Cassette.load(cassette.root)) as client:
+        xml = await client.get("/dataflow", headers={"Accept": STRUCTURE_XML})
+        json = await client.get("/dataflow", headers={"Accept": STRUCTURE_JSON})
+
+    assert xml.content == STRUCTURE_XML.encode()
+    assert json.content == STRUCTURE_JSON.encode()
+    assert json.headers["content-type"] == STRUCTURE_JSON
+
+
+@pytest.mark.asyncio
+async def test_record_passes_upstream_errors_through(tmp_path: Path) -> None:
+    async def upstream(req: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            429, headers={"Retry-After": "30"}, text="Too Many Requests"
+        )
+
+    cassette = Cassette(tmp_path / "cassette")
+    app = create_app(
+        cassette,
+        record_from="http://provider/sdmx",
+        transport=httpx.MockTransport(upstream),
+    )
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://standin"
+    ) as client:
+        r = await client.get("/dataflow")
+
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "30"
+    assert r.text == "Too Many Requests"
+    assert not cassette.interactions
+
+
+@pytest.mark.asyncio
+async def test_throttle_every(cassette: Cassette) -> None:
+    options = StandinOptions(throttle_every=2, retry_after=3)
+    async with standin_client(cassette, options) as client:
+        statuses = [(await client.get("/dataflow")).status_code for _ in range(4)]
+        r = await client.get("/dataflow")
+        throttled = await client.get("/dataflow")
+
+    assert statuses == [200, 429, 200, 429]
+    assert r.status_code == 200
+    assert throttled.headers["retry-after"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_gzip(cassette: Cassette) -> None:
+    async with standin_client(cassette, StandinOptions(gzip=True)) as client:
+        r = await client.get("/dataflow", headers={"Accept-Encoding": "gzip"})
+        raw = await client.get("/dataflow", headers={"Accept-Encoding": "identity"})
+
+    body = Path("data/sdmxml21/dataflow.xml").read_bytes()
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.content == body
+    assert "content-encoding" not in raw.headers
+    assert raw.content == body
+    assert int(r.headers["content-length"]) == len(gzip.compress(body))
+
+
+@pytest.mark.asyncio
+async def test_latency_and_bandwidth(cassette: Cassette) -> None:
+    body = Path("data/sdmxml21/dataflow.xml").read_bytes()
+    options = StandinOptions(latency=0.05, bandwidth=len(body) * 10, chunk_size=1024)
+    async with standin_client(cassette, options) as client:
+        start = time.perf_counter()
+        r = await client.get("/dataflow")
+        elapsed = time.perf_counter() - start
+
+    assert r.content == body
+    assert elapsed >= 0.05 + 0.1
@@ -0,0 +1,124 @@
+from pathlib import Path
+import httpx
+import pytest
+from lxml import etree
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fennec_api.core.database import Base
+from fennec_api.sdmx_v21.client import SDMX21RestClient, WireFormat
+from fennec_api.sdmx_v21.models import (
+    Categorisation,
+    Category,
+    Code,
+    Codelist,
+    Concept,
+    ContentConstraint,
+    Dataflow,
+    DataStructure,
+    Dimension,
+    Provider,
+)
+from fennec_api.sdmx_v21.parser import (
+    GenericData,
+    parse_data,
+    parse_structure,
+    Structure,
+)
+from fennec_api.sdmx_v21.tasks import harvest_provider
+from tools.sdmx_standin import create_app
+from tools.sdmx_synth import (
+    build_cassette,
+    generate_codelists,
+    generate_data,
+    generate_data_structures,
+    generate_generic_data,
+    Scale,
+    SCALES,
+)
+
+SCALE = SCALES["tiny"]
+
+
+def test_generate_structures() -> None:
+    codelists = parse_structure("".join(generate_codelists(SCALE)).encode())
+    data_structures = parse_structure(
+        "".join(generate_data_structures(SCALE, [1])).encode()
+    )
+
+    assert isinstance(codelists, Structure)
+    assert codelists.structures and codelists.structures.codelists
+    assert len(codelists.structures.codelists.codelist) == SCALE.codelists
+    assert sum(len(cl.code) for cl in codelists.structures.codelists.codelist) == (
+        SCALE.codes
+    )
+
+    assert isinstance(data_structures, Structure)
+    assert data_structures.structures and data_structures.structures.data_structures
+    [dsd] = data_structures.structures.data_structures.data_structure
+    assert dsd.id == "DSD_00001"
+    assert dsd.data_structure_components
+    assert dsd.data_structure_components.dimension_list
+    assert (
+        len(dsd.data_structure_components.dimension_list.dimension) == SCALE.dimensions
+    )
+
+
+def test_generate_data() -> None:
+    scale = Scale(series_per_dataflow=7, observations_per_series=5)
+    root = etree.fromstring("".join(generate_data(scale, 0)).encode())
+
+    assert len(root.findall(".//Series")) == 7
+    assert len(root.findall(".//Obs")) == 35
+    assert "".join(generate_data(scale, 0)) == "".join(generate_data(scale, 0))
+
+
+def test_generate_generic_data() -> None:
+    scale = Scale(series_per_dataflow=7, observations_per_series=5)
+    message = parse_data("".join(generate_generic_data(scale, 0)).encode())
+
+    assert isinstance(message, GenericData)
+    [dataset] = message.data_set
+    assert len(dataset.series) == 7
+    assert sum(len(s.obs) for s in dataset.series) == 35
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bulk_download", [True, False])
+@pytest.mark.parametrize("wire_format", list(WireFormat))
+async def test_harvest_synthetic_provider(
+    session: AsyncSession, tmp_path: Path, bulk_download: bool, wire_format: WireFormat
+) -> None:
+    cassette = build_cassette(SCALE, tmp_path / "cassette", wire_format=wire_format)
+    provider = Provider(
+        agency_id=SCALE.agency_id,
+        root_url="http://standin",
+        bulk_download=bulk_download,
+        skip_categories=False,
+        process_all_agencies=False,
+    )
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(cassette))
+    ) as client:
+        sdmx_client = SDMX21RestClient(
+            http_client=client, root_url="http://standin", wire_format=wire_format
+        )
+        await harvest_provider(session, sdmx_client, provider)
+
+    async def count(model: type[Base]) -> int | None:
+        result: int | None = await session.scalar(
+            select(func.count()).select_from(model)
+        )
+        return result
+
+    assert await count(Dataflow) == SCALE.dataflows
+    assert await count(DataStructure) == SCALE.dataflows
+    assert await count(Dimension) == SCALE.dataflows * SCALE.dimensions
+    assert await count(Codelist) == SCALE.codelists
+    assert await count(Code) == SCALE.codes
+    assert await count(Concept) == SCALE.dimensions + 3
+    assert await count(Category) == SCALE.categories
+    assert await count(Categorisation) == SCALE.dataflows
+    assert await count(ContentConstraint) == (
+        SCALE.data_dataflows if wire_format == WireFormat.XML else 0
+    )
@@ -0,0 +1,12 @@
+from tools.sdmx_standin.app import create_app, StandinOptions
+from tools.sdmx_standin.cassette import build_key, Cassette, Interaction
+from tools.sdmx_standin.recorder import RecordingTransport
+
+__all__ = [
+    "build_key",
+    "create_app",
+    "Cassette",
+    "Interaction",
+    "RecordingTransport",
+    "StandinOptions",
+]
@@ -0,0 +1,38 @@
+import argparse
+from pathlib import Path
+import uvicorn
+from tools.sdmx_standin.app import create_app, StandinOptions
+from tools.sdmx_standin.cassette import Cassette
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve recorded SDMX 2.1 REST responses from a cassette"
+    )
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=int, default=None)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--record-from", default=None)
+    args = parser.parse_args()
+
+    app = create_app(
+        Cassette.load(args.cassette),
+        StandinOptions(
+            latency=args.latency,
+            bandwidth=args.bandwidth,
+            throttle_every=args.throttle_every,
+            retry_after=args.retry_after,
+            gzip=args.gzip,
+        ),
+        record_from=args.record_from,
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
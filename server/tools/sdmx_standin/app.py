@@ -0,0 +1,127 @@
+from typing import AsyncGenerator, AsyncIterator
+import asyncio
+import gzip
+import itertools
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from tools.sdmx_standin.cassette import build_key, Cassette
+from tools.sdmx_standin.recorder import RecordingTransport
+
+
+@dataclass
+class StandinOptions:
+    latency: float = 0.0
+    bandwidth: int | None = None
+    throttle_every: int = 0
+    retry_after: int = 1
+    gzip: bool = False
+    chunk_size: int = 64 * 1024
+
+
+async def throttle(
+    body: bytes, *, bandwidth: int, chunk_size: int
+) -> AsyncIterator[bytes]:
+    for i in range(0, len(body), chunk_size):
+        chunk = body[i : i + chunk_size]
+        await asyncio.sleep(len(chunk) / bandwidth)
+        yield chunk
+
+
+def create_app(
+    cassette: Cassette,
+    options: StandinOptions | None = None,
+    *,
+    record_from: str | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> FastAPI:
+    options = options or StandinOptions()
+    upstream = (
+        httpx.AsyncClient(
+            base_url=record_from,
+            transport=RecordingTransport(cassette, record_from, transport),
+            timeout=None,
+        )
+        if record_from
+        else None
+    )
+    requests_count = itertools.count(1)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+        yield
+        if upstream:
+            await upstream.aclose()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/{path:path}")
+    async def serve(request: Request, path: str) -> Response:
+        if options.latency:
+            await asyncio.sleep(options.latency)
+
+        if (
+            options.throttle_every
+            and next(requests_count) % options.throttle_every == 0
+        ):
+            return Response(
+                "Too Many Requests",
+                status_code=429,
+                media_type="text/plain",
+                headers={"Retry-After": str(options.retry_after)},
+            )
+
+        params = request.query_params.multi_items()
+        key = build_key(path, params, request.headers.get("accept"))
+        # Cassettes recorded for a single wire format are keyed without media type
+        interaction = cassette.get(key) or cassette.get(build_key(path, params))
+        if interaction is None and upstream:
+            response = await upstream.get(
+                path,
+                params=str(request.query_params),
+                headers={"Accept": request.headers.get("accept", "*/*")},
+            )
+            # Throttled or failing upstream answers are not recorded, so pass
+            # them through rather than answering "No Results Found"
+            if response.status_code == 429 or response.status_code >= 500:
+                return Response(
+                    response.content,
+                    status_code=response.status_code,
+                    headers={
+                        k: v
+                        for k, v in response.headers.items()
+                        if k in ("content-type", "retry-after")
+                    },
+                )
+            cassette.save()
+            interaction = cassette.get(key)
+        if interaction is None:
+            return Response(
+                "No Results Found", status_code=404, media_type="text/plain"
+            )
+
+        body = cassette.read(interaction)
+        headers = {}
+        if options.gzip and "gzip" in request.headers.get("accept-encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        if options.bandwidth:
+            return StreamingResponse(
+                throttle(
+                    body, bandwidth=options.bandwidth, chunk_size=options.chunk_size
+                ),
+                status_code=interaction.status_code,
+                media_type=interaction.content_type,
+                headers=headers | {"Content-Length": str(len(body))},
+            )
+        return Response(
+            body,
+            status_code=interaction.status_code,
+            media_type=interaction.content_type,
+            headers=headers,
+        )
+
+    return app
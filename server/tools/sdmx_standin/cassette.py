@@ -0,0 +1,107 @@
+from typing import Iterable
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlencode
+
+INDEX_FILE = "cassette.json"
+
+
+def build_key(
+    path: str,
+    params: Iterable[tuple[str, str]] = (),
+    media_type: str | None = None,
+) -> str:
+    path = path.strip("/")
+    query = urlencode(sorted(params))
+    key = f"{path}?{query}" if query else path
+    media_type = ",".join(t.strip() for t in (media_type or "").split(","))
+    if media_type and media_type != "*/*":
+        key = f"{key}#{media_type}"
+    return key
+
+
+def _body_suffix(content_type: str) -> str:
+    if "xml" in content_type:
+        return ".xml"
+    if "json" in content_type:
+        return ".json"
+    return ".bin"
+
+
+@dataclass
+class Interaction:
+    key: str
+    status_code: int
+    content_type: str
+    body_file: str
+
+
+class Cassette:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.interactions: dict[str, Interaction] = {}
+        self._bodies: dict[str, bytes] = {}
+
+    @classmethod
+    def load(cls, root: Path) -> "Cassette":
+        cassette = cls(root)
+        index = root / INDEX_FILE
+        if index.exists():
+            for item in json.loads(index.read_text()):
+                interaction = Interaction(**item)
+                cassette.interactions[interaction.key] = interaction
+        return cassette
+
+    def get(self, key: str) -> Interaction | None:
+        return self.interactions.get(key)
+
+    def read(self, interaction: Interaction) -> bytes:
+        if interaction.body_file not in self._bodies:
+            self._bodies[interaction.body_file] = (
+                self.root / interaction.body_file
+            ).read_bytes()
+        return self._bodies[interaction.body_file]
+
+    def add(
+        self, key: str, *, status_code: int, content_type: str, body: bytes
+    ) -> Interaction:
+        interaction = self.write(
+            key, status_code=status_code, content_type=content_type, chunks=[body]
+        )
+        self._bodies[interaction.body_file] = body
+        return interaction
+
+    def write(
+        self,
+        key: str,
+        *,
+        status_code: int,
+        content_type: str,
+        chunks: Iterable[bytes],
+    ) -> Interaction:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        body_file = f"{digest}{_body_suffix(content_type)}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / body_file, "wb") as f:
+            f.writelines(chunks)
+        self._bodies.pop(body_file, None)
+
+        interaction = Interaction(
+            key=key,
+            status_code=status_code,
+            content_type=content_type,
+            body_file=body_file,
+        )
+        self.interactions[key] = interaction
+        return interaction
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / INDEX_FILE).write_text(
+            json.dumps(
+                [asdict(self.interactions[k]) for k in sorted(self.interactions)],
+                indent=2,
+            )
+        )
@@ -0,0 +1,45 @@
+import httpx
+from tools.sdmx_standin.cassette import build_key, Cassette
+
+HOP_BY_HOP_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        cassette: Cassette,
+        root_url: str,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.cassette = cassette
+        self.root_path = httpx.URL(root_url).path.rstrip("/")
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        body = await response.aread()
+        await response.aclose()
+
+        if response.status_code != 429 and response.status_code < 500:
+            self.cassette.add(
+                build_key(
+                    request.url.path.removeprefix(self.root_path),
+                    request.url.params.multi_items(),
+                    request.headers.get("accept"),
+                ),
+                status_code=response.status_code,
+                content_type=response.headers.get("content-type", ""),
+                body=body,
+            )
+
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        return httpx.Response(
+            response.status_code, headers=headers, content=body, request=request
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,51 @@
+from tools.sdmx_synth.cassette import build_cassette
+from tools.sdmx_synth.generator import (
+    code_id,
+    codelist_id,
+    dataflow_id,
+    dimension_id,
+    generate_categorisations,
+    generate_category_schemes,
+    generate_codelists,
+    generate_concept_schemes,
+    generate_content_constraints,
+    generate_data,
+    generate_data_structures,
+    generate_dataflows,
+    generate_generic_data,
+    generate_json_categorisations,
+    generate_json_category_schemes,
+    generate_json_codelists,
+    generate_json_concept_schemes,
+    generate_json_data,
+    generate_json_data_structures,
+    generate_json_dataflows,
+    Scale,
+    SCALES,
+)
+
+__all__ = [
+    "build_cassette",
+    "code_id",
+    "codelist_id",
+    "dataflow_id",
+    "dimension_id",
+    "generate_categorisations",
+    "generate_category_schemes",
+    "generate_codelists",
+    "generate_concept_schemes",
+    "generate_content_constraints",
+    "generate_data",
+    "generate_data_structures",
+    "generate_dataflows",
+    "generate_generic_data",
+    "generate_json_categorisations",
+    "generate_json_category_schemes",
+    "generate_json_codelists",
+    "generate_json_concept_schemes",
+    "generate_json_data",
+    "generate_json_data_structures",
+    "generate_json_dataflows",
+    "Scale",
+    "SCALES",
+]
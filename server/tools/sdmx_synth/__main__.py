@@ -0,0 +1,31 @@
+import argparse
+import dataclasses
+from pathlib import Path
+from fennec_api.sdmx_v21.client import WireFormat
+from tools.sdmx_synth.cassette import build_cassette
+from tools.sdmx_synth.generator import SCALES
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic SDMX 2.1 provider cassette"
+    )
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--scale", choices=SCALES, default="tiny")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--wire-format", type=WireFormat, choices=list(WireFormat), default="xml"
+    )
+    args = parser.parse_args()
+
+    scale = dataclasses.replace(SCALES[args.scale], seed=args.seed)
+    cassette = build_cassette(scale, args.cassette, wire_format=args.wire_format)
+    print(
+        f"Wrote {len(cassette.interactions)} responses to {args.cassette}: "
+        f"{scale.dataflows} dataflows, {scale.codes} codes, "
+        f"{scale.observations} observations"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from typing import Callable, Iterable, Iterator
+from pathlib import Path
+from fennec_api.sdmx_v21.client import (
+    JSON_STRUCTURE_CONTENT_TYPE,
+    STRUCTURE_CONTENT_TYPE,
+    WireFormat,
+)
+from tools.sdmx_standin.cassette import build_key, Cassette
+from tools.sdmx_synth.generator import (
+    generate_categorisations,
+    generate_category_schemes,
+    generate_codelists,
+    generate_concept_schemes,
+    generate_content_constraints,
+    generate_data,
+    generate_data_structures,
+    generate_dataflows,
+    generate_json_categorisations,
+    generate_json_category_schemes,
+    generate_json_codelists,
+    generate_json_concept_schemes,
+    generate_json_data,
+    generate_json_data_structures,
+    generate_json_dataflows,
+    codelist_id,
+    data_structure_id,
+    dataflow_id,
+    Scale,
+    CONCEPT_SCHEME_ID,
+    VERSION,
+)
+
+DATA_CONTENT_TYPE = "application/vnd.sdmx.structurespecificdata+xml;version=2.1"
+JSON_DATA_CONTENT_TYPE = "application/vnd.sdmx.data+json;version=1.0"
+
+Generator = Callable[..., Iterator[str]]
+
+GENERATORS: dict[WireFormat, dict[str, Generator]] = {
+    WireFormat.XML: {
+        "dataflow": generate_dataflows,
+        "datastructure": generate_data_structures,
+        "codelist": generate_codelists,
+        "conceptscheme": generate_concept_schemes,
+        "categorisation": generate_categorisations,
+        "categoryscheme": generate_category_schemes,
+        "contentconstraint": generate_content_constraints,
+        "data": generate_data,
+    },
+    WireFormat.JSON: {
+        "dataflow": generate_json_dataflows,
+        "datastructure": generate_json_data_structures,
+        "codelist": generate_json_codelists,
+        "conceptscheme": generate_json_concept_schemes,
+        "categorisation": generate_json_categorisations,
+        "categoryscheme": generate_json_category_schemes,
+        "data": generate_json_data,
+    },
+}
+
+
+def _encode(chunks: Iterable[str]) -> Iterator[bytes]:
+    return (chunk.encode() for chunk in chunks)
+
+
+def build_cassette(
+    scale: Scale, root: Path, *, wire_format: WireFormat = WireFormat.XML
+) -> Cassette:
+    cassette = Cassette(root)
+    agency_id = scale.agency_id
+    generators = GENERATORS[wire_format]
+    structure_content_type, data_content_type = (
+        (STRUCTURE_CONTENT_TYPE, DATA_CONTENT_TYPE)
+        if wire_format == WireFormat.XML
+        else (JSON_STRUCTURE_CONTENT_TYPE, JSON_DATA_CONTENT_TYPE)
+    )
+
+    def write(
+        path: str, chunks: Iterable[str], content_type: str = structure_content_type
+    ) -> None:
+        cassette.write(
+            build_key(path),
+            status_code=200,
+            content_type=content_type,
+            chunks=_encode(chunks),
+        )
+
+    for resource in (
+        "dataflow",
+        "datastructure",
+        "codelist",
+        "conceptscheme",
+        "categorisation",
+        "categoryscheme",
+        "contentconstraint",
+    ):
+        if resource in generators:
+            write(f"{resource}/{agency_id}", generators[resource](scale))
+
+    for i in range(scale.dataflows):
+        write(
+            f"datastructure/{agency_id}/{data_structure_id(i)}/{VERSION}",
+            generators["datastructure"](scale, [i]),
+        )
+    for i in range(scale.codelists):
+        write(
+            f"codelist/{agency_id}/{codelist_id(i)}/{VERSION}",
+            generators["codelist"](scale, [i]),
+        )
+    write(
+        f"conceptscheme/{agency_id}/{CONCEPT_SCHEME_ID}/{VERSION}",
+        generators["conceptscheme"](scale),
+    )
+    for i in range(min(scale.data_dataflows, scale.dataflows)):
+        write(f"data/{dataflow_id(i)}", generators["data"](scale, i), data_content_type)
+
+    cassette.save()
+    return cassette
@@ -0,0 +1,859 @@
+from typing import Any, Iterable, Iterator
+import json
+import random
+from dataclasses import dataclass
+from xml.sax.saxutils import quoteattr
+
+MESSAGE_NS = "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/message"
+COMMON_NS = "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/common"
+STRUCTURE_NS = "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/structure"
+STRUCTURE_SPECIFIC_NS = (
+    "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/data/structurespecific"
+)
+GENERIC_NS = "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/data/generic"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+
+VERSION = "1.0"
+CONCEPT_SCHEME_ID = "CS_SYNTH"
+CATEGORY_SCHEME_ID = "CAT_SYNTH"
+PREPARED = "2024-01-01T00:00:00"
+
+
+@dataclass(frozen=True)
+class Scale:
+    agency_id: str = "SYNTH"
+    dataflows: int = 10
+    dimensions: int = 5
+    codelists: int = 20
+    codes_per_codelist: int = 50
+    categories: int = 5
+    data_dataflows: int = 1
+    series_per_dataflow: int = 10
+    observations_per_series: int = 12
+    seed: int = 0
+
+    @property
+    def codes(self) -> int:
+        return self.codelists * self.codes_per_codelist
+
+    @property
+    def observations(self) -> int:
+        return (
+            self.data_dataflows
+            * self.series_per_dataflow
+            * self.observations_per_series
+        )
+
+
+SCALES = {
+    "tiny": Scale(
+        dataflows=3,
+        dimensions=3,
+        codelists=4,
+        codes_per_codelist=10,
+        categories=2,
+        series_per_dataflow=4,
+        observations_per_series=6,
+    ),
+    "10k": Scale(
+        dataflows=100,
+        dimensions=6,
+        codelists=100,
+        codes_per_codelist=100,
+        categories=20,
+        series_per_dataflow=1_000,
+        observations_per_series=120,
+    ),
+    "100k": Scale(
+        dataflows=1_000,
+        dimensions=8,
+        codelists=500,
+        codes_per_codelist=200,
+        categories=100,
+        series_per_dataflow=10_000,
+        observations_per_series=240,
+    ),
+    "1m": Scale(
+        dataflows=5_000,
+        dimensions=10,
+        codelists=1_000,
+        codes_per_codelist=1_000,
+        categories=500,
+        series_per_dataflow=20_000,
+        observations_per_series=240,
+    ),
+}
+
+
+def dataflow_id(i: int) -> str:
+    return f"DF_{i:05d}"
+
+
+def data_structure_id(i: int) -> str:
+    return f"DSD_{i:05d}"
+
+
+def codelist_id(i: int) -> str:
+    return f"CL_{i:05d}"
+
+
+def code_id(i: int) -> str:
+    return f"C{i:07d}"
+
+
+def dimension_id(k: int) -> str:
+    return f"DIM_{k:02d}"
+
+
+def constraint_id(i: int) -> str:
+    return f"CC_{i:05d}"
+
+
+def category_id(i: int) -> str:
+    return f"CAT_{i:05d}"
+
+
+def dimension_codelist(scale: Scale, dsd: int, k: int) -> int:
+    return (dsd * scale.dimensions + k) % scale.codelists
+
+
+def _urn(package: str, cls: str, agency_id: str, id: str, item: str = "") -> str:
+    urn = f"urn:sdmx:org.sdmx.infomodel.{package}.{cls}={agency_id}:{id}({VERSION})"
+    return f"{urn}.{item}" if item else urn
+
+
+def _name(name: str) -> str:
+    return f'<com:Name xml:lang="en">{name}</com:Name>'
+
+
+def _ref(**attrs: str) -> str:
+    return "<Ref " + " ".join(f"{k}={quoteattr(v)}" for k, v in attrs.items()) + "/>"
+
+
+def _structure_message(
+    scale: Scale, message_id: str, body: Iterable[str]
+) -> Iterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<mes:Structure xmlns:mes="{MESSAGE_NS}" xmlns:com="{COMMON_NS}" '
+        f'xmlns:str="{STRUCTURE_NS}">'
+        "<mes:Header>"
+        f"<mes:ID>{message_id}</mes:ID>"
+        "<mes:Test>true</mes:Test>"
+        f"<mes:Prepared>{PREPARED}</mes:Prepared>"
+        f'<mes:Sender id="{scale.agency_id}"/>'
+        "</mes:Header>"
+        "<mes:Structures>"
+    )
+    yield from body
+    yield "</mes:Structures></mes:Structure>\n"
+
+
+def _concept_ref(scale: Scale, concept_id: str) -> str:
+    return (
+        "<str:ConceptIdentity>"
+        + _ref(
+            id=concept_id,
+            maintainableParentID=CONCEPT_SCHEME_ID,
+            maintainableParentVersion=VERSION,
+            agencyID=scale.agency_id,
+            package="conceptscheme",
+            **{"class": "Concept"},
+        )
+        + "</str:ConceptIdentity>"
+    )
+
+
+def _data_structure(scale: Scale, i: int) -> str:
+    agency_id, id = scale.agency_id, data_structure_id(i)
+    urn = _urn("datastructure", "DataStructure", agency_id, id)
+
+    def component_urn(cls: str, component_id: str) -> str:
+        return _urn("datastructure", cls, agency_id, id, component_id)
+
+    dimensions = "".join(
+        f'<str:Dimension id="{dimension_id(k)}" '
+        f'urn="{component_urn("Dimension", dimension_id(k))}" position="{k + 1}">'
+        + _concept_ref(scale, dimension_id(k))
+        + "<str:LocalRepresentation><str:Enumeration>"
+        + _ref(
+            id=codelist_id(dimension_codelist(scale, i, k)),
+            version=VERSION,
+            agencyID=agency_id,
+            package="codelist",
+            **{"class": "Codelist"},
+        )
+        + "</str:Enumeration></str:LocalRepresentation></str:Dimension>"
+        for k in range(scale.dimensions)
+    )
+    return (
+        f'<str:DataStructure id="{id}" urn="{urn}" agencyID="{agency_id}" '
+        f'version="{VERSION}">'
+        + _name(f"Data structure {i}")
+        + "<str:DataStructureComponents>"
+        + '<str:DimensionList id="DimensionDescriptor">'
+        + dimensions
+        + '<str:TimeDimension id="TIME_PERIOD" '
+        f'urn="{component_urn("TimeDimension", "TIME_PERIOD")}" '
+        f'position="{scale.dimensions + 1}">'
+        + _concept_ref(scale, "TIME_PERIOD")
+        + "<str:LocalRepresentation>"
+        '<str:TextFormat textType="ObservationalTimePeriod"/>'
+        "</str:LocalRepresentation></str:TimeDimension></str:DimensionList>"
+        '<str:AttributeList id="AttributeDescriptor">'
+        f'<str:Attribute id="OBS_STATUS" '
+        f'urn="{component_urn("DataAttribute", "OBS_STATUS")}" '
+        'assignmentStatus="Conditional">'
+        + _concept_ref(scale, "OBS_STATUS")
+        + '<str:LocalRepresentation><str:TextFormat textType="String"/>'
+        "</str:LocalRepresentation>"
+        '<str:AttributeRelationship><str:PrimaryMeasure><Ref id="OBS_VALUE"/>'
+        "</str:PrimaryMeasure></str:AttributeRelationship></str:Attribute>"
+        "</str:AttributeList>"
+        '<str:MeasureList id="MeasureDescriptor">'
+        f'<str:PrimaryMeasure id="OBS_VALUE" '
+        f'urn="{component_urn("PrimaryMeasure", "OBS_VALUE")}">'
+        + _concept_ref(scale, "OBS_VALUE")
+        + "</str:PrimaryMeasure></str:MeasureList>"
+        "</str:DataStructureComponents></str:DataStructure>"
+    )
+
+
+def _codelist(scale: Scale, i: int) -> Iterator[str]:
+    agency_id, id = scale.agency_id, codelist_id(i)
+    yield (
+        f'<str:Codelist id="{id}" '
+        f'urn="{_urn("codelist", "Codelist", agency_id, id)}" '
+        f'agencyID="{agency_id}" version="{VERSION}">' + _name(f"Codelist {i}")
+    )
+    for j in range(scale.codes_per_codelist):
+        code = code_id(j)
+        yield (
+            f'<str:Code id="{code}" '
+            f'urn="{_urn("codelist", "Code", agency_id, id, code)}">'
+            + _name(f"Code {j} of codelist {i}")
+            + "</str:Code>"
+        )
+    yield "</str:Codelist>"
+
+
+def generate_dataflows(scale: Scale) -> Iterator[str]:
+    agency_id = scale.agency_id
+
+    def dataflow(i: int) -> str:
+        id = dataflow_id(i)
+        return (
+            f'<str:Dataflow id="{id}" '
+            f'urn="{_urn("datastructure", "Dataflow", agency_id, id)}" '
+            f'agencyID="{agency_id}" version="{VERSION}">'
+            + _name(f"Dataflow {i}")
+            + "<str:Structure>"
+            + _ref(
+                id=data_structure_id(i),
+                version=VERSION,
+                agencyID=agency_id,
+                package="datastructure",
+                **{"class": "DataStructure"},
+            )
+            + "</str:Structure></str:Dataflow>"
+        )
+
+    yield from _structure_message(
+        scale,
+        "dataflows",
+        [
+            "<str:Dataflows>",
+            *(dataflow(i) for i in range(scale.dataflows)),
+            "</str:Dataflows>",
+        ],
+    )
+
+
+def generate_data_structures(
+    scale: Scale, ids: Iterable[int] | None = None
+) -> Iterator[str]:
+    indices = range(scale.dataflows) if ids is None else ids
+    yield from _structure_message(
+        scale,
+        "datastructures",
+        [
+            "<str:DataStructures>",
+            *(_data_structure(scale, i) for i in indices),
+            "</str:DataStructures>",
+        ],
+    )
+
+
+def generate_codelists(scale: Scale, ids: Iterable[int] | None = None) -> Iterator[str]:
+    indices = range(scale.codelists) if ids is None else ids
+
+    def body() -> Iterator[str]:
+        yield "<str:Codelists>"
+        for i in indices:
+            yield from _codelist(scale, i)
+        yield "</str:Codelists>"
+
+    yield from _structure_message(scale, "codelists", body())
+
+
+def generate_concept_schemes(scale: Scale) -> Iterator[str]:
+    agency_id = scale.agency_id
+    concept_ids = [dimension_id(k) for k in range(scale.dimensions)] + [
+        "TIME_PERIOD",
+        "OBS_VALUE",
+        "OBS_STATUS",
+    ]
+    concepts = "".join(
+        f'<str:Concept id="{c}" urn="'
+        f'{_urn("conceptscheme", "Concept", agency_id, CONCEPT_SCHEME_ID, c)}">'
+        + _name(f"Concept {c}")
+        + "</str:Concept>"
+        for c in concept_ids
+    )
+    urn = _urn("conceptscheme", "ConceptScheme", agency_id, CONCEPT_SCHEME_ID)
+    yield from _structure_message(
+        scale,
+        "conceptschemes",
+        [
+            "<str:Concepts>"
+            f'<str:ConceptScheme id="{CONCEPT_SCHEME_ID}" urn="{urn}" '
+            f'agencyID="{agency_id}" version="{VERSION}">'
+            + _name("Synthetic concepts")
+            + concepts
+            + "</str:ConceptScheme></str:Concepts>"
+        ],
+    )
+
+
+def generate_category_schemes(scale: Scale) -> Iterator[str]:
+    agency_id = scale.agency_id
+    categories = "".join(
+        f'<str:Category id="{category_id(i)}" urn="'
+        f'{_urn("categoryscheme", "Category", agency_id, CATEGORY_SCHEME_ID, category_id(i))}">'
+        + _name(f"Category {i}")
+        + "</str:Category>"
+        for i in range(scale.categories)
+    )
+    urn = _urn("categoryscheme", "CategoryScheme", agency_id, CATEGORY_SCHEME_ID)
+    yield from _structure_message(
+        scale,
+        "categoryschemes",
+        [
+            "<str:CategorySchemes>"
+            f'<str:CategoryScheme id="{CATEGORY_SCHEME_ID}" urn="{urn}" '
+            f'agencyID="{agency_id}" version="{VERSION}">'
+            + _name("Synthetic categories")
+            + categories
+            + "</str:CategoryScheme></str:CategorySchemes>"
+        ],
+    )
+
+
+def generate_categorisations(scale: Scale) -> Iterator[str]:
+    agency_id = scale.agency_id
+
+    def categorisation(i: int) -> str:
+        id = f"{category_id(i % scale.categories)}_{dataflow_id(i)}"
+        return (
+            f'<str:Categorisation id="{id}" '
+            f'urn="{_urn("categoryscheme", "Categorisation", agency_id, id)}" '
+            f'agencyID="{agency_id}" version="{VERSION}">'
+            + _name(f"Categorisation of dataflow {i}")
+            + "<str:Source>"
+            + _ref(
+                id=dataflow_id(i),
+                version=VERSION,
+                agencyID=agency_id,
+                package="datastructure",
+                **{"class": "Dataflow"},
+            )
+            + "</str:Source><str:Target>"
+            + _ref(
+                id=category_id(i % scale.categories),
+                maintainableParentID=CATEGORY_SCHEME_ID,
+                maintainableParentVersion=VERSION,
+                agencyID=agency_id,
+                package="categoryscheme",
+                **{"class": "Category"},
+            )
+            + "</str:Target></str:Categorisation>"
+        )
+
+    yield from _structure_message(
+        scale,
+        "categorisations",
+        [
+            "<str:Categorisations>",
+            *(categorisation(i) for i in range(scale.dataflows)),
+            "</str:Categorisations>",
+        ],
+    )
+
+
+def series_key(scale: Scale, s: int) -> list[str]:
+    key = []
+    for _ in range(scale.dimensions):
+        s, code = divmod(s, scale.codes_per_codelist)
+        key.append(code_id(code))
+    return key
+
+
+def time_period(t: int) -> str:
+    return f"{2000 + t // 12}-{t % 12 + 1:02d}"
+
+
+def generate_content_constraints(scale: Scale) -> Iterator[str]:
+    agency_id = scale.agency_id
+    keys = [series_key(scale, s) for s in range(scale.series_per_dataflow)]
+
+    def content_constraint(i: int) -> str:
+        id = constraint_id(i)
+        key_values = "".join(
+            f'<com:KeyValue id="{dimension_id(k)}">'
+            + "".join(
+                f"<com:Value>{code}</com:Value>"
+                for code in sorted({key[k] for key in keys})
+            )
+            + "</com:KeyValue>"
+            for k in range(scale.dimensions)
+        )
+        return (
+            f'<str:ContentConstraint id="{id}" '
+            f'urn="{_urn("registry", "ContentConstraint", agency_id, id)}" '
+            f'agencyID="{agency_id}" version="{VERSION}" type="Actual">'
+            + _name(f"Content constraint {i}")
+            + "<str:ConstraintAttachment><str:Dataflow>"
+            + _ref(
+                id=dataflow_id(i),
+                version=VERSION,
+                agencyID=agency_id,
+                package="datastructure",
+                **{"class": "Dataflow"},
+            )
+            + "</str:Dataflow></str:ConstraintAttachment>"
+            + f'<str:CubeRegion include="true">{key_values}</str:CubeRegion>'
+            + "</str:ContentConstraint>"
+        )
+
+    yield from _structure_message(
+        scale,
+        "contentconstraints",
+        [
+            "<str:Constraints>",
+            *(
+                content_constraint(i)
+                for i in range(min(scale.data_dataflows, scale.dataflows))
+            ),
+            "</str:Constraints>",
+        ],
+    )
+
+
+def _data_header(scale: Scale, i: int, root: str, namespaces: str) -> str:
+    agency_id, id = scale.agency_id, dataflow_id(i)
+    structure_id = f"{agency_id}_{id}_{VERSION.replace('.', '_')}"
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<message:{root} xmlns:message="{MESSAGE_NS}" '
+        f'xmlns:common="{COMMON_NS}" {namespaces}>'
+        "<message:Header>"
+        f"<message:ID>{id}</message:ID>"
+        "<message:Test>true</message:Test>"
+        f"<message:Prepared>{PREPARED}</message:Prepared>"
+        f'<message:Sender id="{agency_id}"/>'
+        f'<message:Structure structureID="{structure_id}" '
+        f'namespace="{_data_namespace(scale, i)}" dimensionAtObservation="TIME_PERIOD">'
+        "<common:StructureUsage>"
+        f'<Ref agencyID="{agency_id}" id="{id}" version="{VERSION}"/>'
+        "</common:StructureUsage></message:Structure>"
+        "</message:Header>"
+    )
+
+
+def _data_namespace(scale: Scale, i: int) -> str:
+    return (
+        f"urn:sdmx:org.sdmx.infomodel.datastructure.Dataflow="
+        f"{scale.agency_id}:{dataflow_id(i)}({VERSION}):ObsLevelDim:TIME_PERIOD"
+    )
+
+
+def _series(
+    scale: Scale, i: int
+) -> Iterator[tuple[list[str], list[tuple[str, float]]]]:
+    rng = random.Random(scale.seed * 1_000_003 + i)
+    for s in range(scale.series_per_dataflow):
+        value = rng.uniform(50, 150)
+        obs = []
+        for t in range(scale.observations_per_series):
+            value += rng.gauss(0, 1)
+            obs.append((time_period(t), value))
+        yield series_key(scale, s), obs
+
+
+def generate_data(scale: Scale, i: int) -> Iterator[str]:
+    structure_id = f"{scale.agency_id}_{dataflow_id(i)}_{VERSION.replace('.', '_')}"
+    yield _data_header(
+        scale,
+        i,
+        "StructureSpecificData",
+        f'xmlns:ss="{STRUCTURE_SPECIFIC_NS}" xmlns:xsi="{XSI_NS}" '
+        f'xmlns:ns1="{_data_namespace(scale, i)}"',
+    )
+    yield (
+        f'<message:DataSet ss:dataScope="DataStructure" xsi:type="ns1:DataSetType" '
+        f'ss:structureRef="{structure_id}">'
+    )
+    for key, obs in _series(scale, i):
+        attributes = " ".join(
+            f'{dimension_id(k)}="{code}"' for k, code in enumerate(key)
+        )
+        yield (
+            f"<Series {attributes}>"
+            + "".join(
+                f'<Obs TIME_PERIOD="{period}" OBS_VALUE="{value:.4f}" OBS_STATUS="A"/>'
+                for period, value in obs
+            )
+            + "</Series>"
+        )
+    yield "</message:DataSet></message:StructureSpecificData>\n"
+
+
+def generate_generic_data(scale: Scale, i: int) -> Iterator[str]:
+    structure_id = f"{scale.agency_id}_{dataflow_id(i)}_{VERSION.replace('.', '_')}"
+    yield _data_header(scale, i, "GenericData", f'xmlns:generic="{GENERIC_NS}"')
+    yield f'<message:DataSet structureRef="{structure_id}">'
+    for key, obs in _series(scale, i):
+        values = "".join(
+            f'<generic:Value id="{dimension_id(k)}" value="{code}"/>'
+            for k, code in enumerate(key)
+        )
+        yield (
+            f"<generic:Series><generic:SeriesKey>{values}</generic:SeriesKey>"
+            + "".join(
+                f'<generic:Obs><generic:ObsDimension value="{period}"/>'
+                f'<generic:ObsValue value="{value:.4f}"/>'
+                "<generic:Attributes>"
+                '<generic:Value id="OBS_STATUS" value="A"/>'
+                "</generic:Attributes></generic:Obs>"
+                for period, value in obs
+            )
+            + "</generic:Series>"
+        )
+    yield "</message:DataSet></message:GenericData>\n"
+
+
+def _json_message(scale: Scale, message_id: str, data: dict[str, Any]) -> Iterator[str]:
+    yield json.dumps(
+        {
+            "meta": {
+                "id": message_id,
+                "test": True,
+                "prepared": PREPARED,
+                "sender": {"id": scale.agency_id},
+            },
+            "data": data,
+        }
+    )
+
+
+def _json_maintainable(
+    scale: Scale, package: str, cls: str, id: str, name: str
+) -> dict[str, Any]:
+    return {
+        "id": id,
+        "urn": _urn(package, cls, scale.agency_id, id),
+        "agencyID": scale.agency_id,
+        "version": VERSION,
+        "name": name,
+        "names": {"en": name},
+    }
+
+
+def _json_item(
+    scale: Scale, package: str, cls: str, parent_id: str, id: str, name: str
+) -> dict[str, Any]:
+    return {
+        "id": id,
+        "urn": _urn(package, cls, scale.agency_id, parent_id, id),
+        "name": name,
+        "names": {"en": name},
+    }
+
+
+def _json_concept_urn(scale: Scale, concept_id: str) -> str:
+    return _urn(
+        "conceptscheme", "Concept", scale.agency_id, CONCEPT_SCHEME_ID, concept_id
+    )
+
+
+def _json_data_structure(scale: Scale, i: int) -> dict[str, Any]:
+    agency_id, id = scale.agency_id, data_structure_id(i)
+
+    def component(cls: str, component_id: str) -> dict[str, Any]:
+        return {
+            "id": component_id,
+            "urn": _urn("datastructure", cls, agency_id, id, component_id),
+            "conceptIdentity": _json_concept_urn(scale, component_id),
+        }
+
+    return {
+        **_json_maintainable(
+            scale, "datastructure", "DataStructure", id, f"Data structure {i}"
+        ),
+        "dataStructureComponents": {
+            "dimensionList": {
+                "id": "DimensionDescriptor",
+                "dimensions": [
+                    {
+                        **component("Dimension", dimension_id(k)),
+                        "position": k + 1,
+                        "localRepresentation": {
+                            "enumeration": _urn(
+                                "codelist",
+                                "Codelist",
+                                agency_id,
+                                codelist_id(dimension_codelist(scale, i, k)),
+                            )
+                        },
+                    }
+                    for k in range(scale.dimensions)
+                ],
+                "timeDimensions": [
+                    {
+                        **component("TimeDimension", "TIME_PERIOD"),
+                        "position": scale.dimensions + 1,
+                        "localRepresentation": {
+                            "textFormat": {"textType": "ObservationalTimePeriod"}
+                        },
+                    }
+                ],
+            },
+            "attributeList": {
+                "id": "AttributeDescriptor",
+                "attributes": [
+                    {
+                        **component("DataAttribute", "OBS_STATUS"),
+                        "assignmentStatus": "Conditional",
+                        "localRepresentation": {"textFormat": {"textType": "String"}},
+                        "attributeRelationship": {"primaryMeasure": "OBS_VALUE"},
+                    }
+                ],
+            },
+            "measureList": {
+                "id": "MeasureDescriptor",
+                "primaryMeasure": component("PrimaryMeasure", "OBS_VALUE"),
+            },
+        },
+    }
+
+
+def _json_codelist(scale: Scale, i: int) -> dict[str, Any]:
+    id = codelist_id(i)
+    return {
+        **_json_maintainable(scale, "codelist", "Codelist", id, f"Codelist {i}"),
+        "codes": [
+            _json_item(
+                scale, "codelist", "Code", id, code_id(j), f"Code {j} of codelist {i}"
+            )
+            for j in range(scale.codes_per_codelist)
+        ],
+    }
+
+
+def generate_json_dataflows(scale: Scale) -> Iterator[str]:
+    agency_id = scale.agency_id
+    yield from _json_message(
+        scale,
+        "dataflows",
+        {
+            "dataflows": [
+                {
+                    **_json_maintainable(
+                        scale,
+                        "datastructure",
+                        "Dataflow",
+                        dataflow_id(i),
+                        f"Dataflow {i}",
+                    ),
+                    "structure": _urn(
+                        "datastructure",
+                        "DataStructure",
+                        agency_id,
+                        data_structure_id(i),
+                    ),
+                }
+                for i in range(scale.dataflows)
+            ]
+        },
+    )
+
+
+def generate_json_data_structures(
+    scale: Scale, ids: Iterable[int] | None = None
+) -> Iterator[str]:
+    indices = range(scale.dataflows) if ids is None else ids
+    yield from _json_message(
+        scale,
+        "datastructures",
+        {"dataStructures": [_json_data_structure(scale, i) for i in indices]},
+    )
+
+
+def generate_json_codelists(
+    scale: Scale, ids: Iterable[int] | None = None
+) -> Iterator[str]:
+    indices = range(scale.codelists) if ids is None else ids
+    yield from _json_message(
+        scale, "codelists", {"codelists": [_json_codelist(scale, i) for i in indices]}
+    )
+
+
+def generate_json_concept_schemes(scale: Scale) -> Iterator[str]:
+    concept_ids = [dimension_id(k) for k in range(scale.dimensions)] + [
+        "TIME_PERIOD",
+        "OBS_VALUE",
+        "OBS_STATUS",
+    ]
+    yield from _json_message(
+        scale,
+        "conceptschemes",
+        {
+            "conceptSchemes": [
+                {
+                    **_json_maintainable(
+                        scale,
+                        "conceptscheme",
+                        "ConceptScheme",
+                        CONCEPT_SCHEME_ID,
+                        "Synthetic concepts",
+                    ),
+                    "concepts": [
+                        _json_item(
+                            scale,
+                            "conceptscheme",
+                            "Concept",
+                            CONCEPT_SCHEME_ID,
+                            c,
+                            f"Concept {c}",
+                        )
+                        for c in concept_ids
+                    ],
+                }
+            ]
+        },
+    )
+
+
+def generate_json_category_schemes(scale: Scale) -> Iterator[str]:
+    yield from _json_message(
+        scale,
+        "categoryschemes",
+        {
+            "categorySchemes": [
+                {
+                    **_json_maintainable(
+                        scale,
+                        "categoryscheme",
+                        "CategoryScheme",
+                        CATEGORY_SCHEME_ID,
+                        "Synthetic categories",
+                    ),
+                    "categories": [
+                        _json_item(
+                            scale,
+                            "categoryscheme",
+                            "Category",
+                            CATEGORY_SCHEME_ID,
+                            category_id(i),
+                            f"Category {i}",
+                        )
+                        for i in range(scale.categories)
+                    ],
+                }
+            ]
+        },
+    )
+
+
+def generate_json_categorisations(scale: Scale) -> Iterator[str]:
+    agency_id = scale.agency_id
+
+    def categorisation(i: int) -> dict[str, Any]:
+        return {
+            **_json_maintainable(
+                scale,
+                "categoryscheme",
+                "Categorisation",
+                f"{category_id(i % scale.categories)}_{dataflow_id(i)}",
+                f"Categorisation of dataflow {i}",
+            ),
+            "source": _urn("datastructure", "Dataflow", agency_id, dataflow_id(i)),
+            "target": _urn(
+                "categoryscheme",
+                "Category",
+                agency_id,
+                CATEGORY_SCHEME_ID,
+                category_id(i % scale.categories),
+            ),
+        }
+
+    yield from _json_message(
+        scale,
+        "categorisations",
+        {"categorisations": [categorisation(i) for i in range(scale.dataflows)]},
+    )
+
+
+def generate_json_data(scale: Scale, i: int) -> Iterator[str]:
+    rng = random.Random(scale.seed * 1_000_003 + i)
+    codes = [code_id(j) for j in range(scale.codes_per_codelist)]
+    series = {}
+    for s in range(scale.series_per_dataflow):
+        key = []
+        for _ in range(scale.dimensions):
+            s, code = divmod(s, scale.codes_per_codelist)
+            key.append(str(code))
+        value = rng.uniform(50, 150)
+        observations = {}
+        for t in range(scale.observations_per_series):
+            value += rng.gauss(0, 1)
+            observations[str(t)] = [round(value, 4), 0]
+        series[":".join(key)] = {"attributes": [], "observations": observations}
+
+    yield json.dumps(
+        {
+            "header": {
+                "id": dataflow_id(i),
+                "test": True,
+                "prepared": PREPARED,
+                "sender": {"id": scale.agency_id},
+            },
+            "dataSets": [{"action": "Information", "series": series}],
+            "structure": {
+                "dimensions": {
+                    "series": [
+                        {
+                            "id": dimension_id(k),
+                            "keyPosition": k,
+                            "values": [{"id": c} for c in codes],
+                        }
+                        for k in range(scale.dimensions)
+                    ],
+                    "observation": [
+                        {
+                            "id": "TIME_PERIOD",
+                            "values": [
+                                {"id": time_period(t)}
+                                for t in range(scale.observations_per_series)
+                            ],
+                        }
+                    ],
+                },
+                "attributes": {
+                    "dataSet": [],
+                    "series": [],
+                    "observation": [{"id": "OBS_STATUS", "values": [{"id": "A"}]}],
+                },
+            },
+        }
+    )